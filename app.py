@@ -1,9 +1,20 @@
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import Flask, Response, g, render_template, request, jsonify, flash, redirect, url_for, stream_with_context
 from config import Config
-from profile_helper.github_fetcher import GitHubFetcher
-from profile_helper.profile_generator import ProfileGenerator
+from profile_helper.profile_generator import get_profile_generator
+from profile_helper.profile_service import NO_REPOS_ERROR, generate_cached_profile, iter_profile_events, profile_response
+from profile_helper.batch import batch_summary, iter_batch_profiles, normalize_usernames
+from profile_helper.jobs import RETRY_AFTER_SECONDS, JobQueueFull, get_job_queue
+from profile_helper.http_session import get_github_session, get_github_timeout
+from profile_helper.response_cache import get_response_cache
+from profile_helper.repo_store import get_repo_store
+from profile_helper.completion_cache import get_completion_cache
+from profile_helper import metrics
+from profile_helper.rate_limiter import GitHubRateLimitError, get_rate_limiter
+from profile_helper.token_pool import get_token_pool
+import asyncio
+import json
 import os
-import requests
+import time
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -15,6 +26,36 @@ try:
 except OSError:
     pass
 
+@app.before_request
+def start_request_timing():
+    """Collect per-stage timings for API calls (Server-Timing header and /metrics)"""
+    if Config.METRICS_ENABLED and request.path.startswith('/api/'):
+        g.request_started = time.perf_counter()
+        g.timing_token = metrics.start_request()
+
+@app.after_request
+def add_server_timing(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        timings = metrics.current_request_timings()
+        if timings is not None:
+            # Streamed responses only report what ran before the first chunk
+            response.headers['Server-Timing'] = timings.header()
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.record_http_request(route, request.method, response.status_code, time.perf_counter() - started)
+    return response
+
+@app.teardown_request
+def finish_request_timing(error=None):
+    metrics.finish_request(g.pop('timing_token', None))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    if not Config.METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
     """Main landing page"""
@@ -32,48 +73,187 @@ def proposal_assistant():
 
 @app.route('/api/profile/generate', methods=['POST'])
 def generate_profile():
-    """API endpoint for profile generation"""
+    """API endpoint for profile generation
+    
+    With "async": true the build is queued and 202 is returned with a job id
+    to poll at /api/jobs/<job_id>.
+    """
+    try:
+        data = request.get_json()
+        github_username = data.get('github_username')
+        github_token = data.get('github_token')
+        max_repos = int(data.get('max_repos', 10))
+        include_readme = bool(data.get('include_readme', True))
+        force_refresh = bool(data.get('force_refresh', False))
+        
+        if not github_username:
+            return jsonify({'error': 'GitHub username is required'}), 400
+        
+        if data.get('async'):
+            try:
+                job = get_job_queue().submit(github_username, github_token, max_repos, include_readme, force_refresh)
+            except JobQueueFull as e:
+                response = jsonify({'error': str(e)})
+                response.headers['Retry-After'] = str(RETRY_AFTER_SECONDS)
+                return response, 503
+            
+            status_url = url_for('get_job', job_id=job['job_id'])
+            response = jsonify({'job_id': job['job_id'], 'status': job['status'], 'status_url': status_url})
+            response.headers['Location'] = status_url
+            return response, 202
+        
+        body, cache_info = generate_cached_profile(
+            github_username, github_token, max_repos, include_readme, force_refresh
+        )
+        
+        if body is None:
+            return jsonify({'error': NO_REPOS_ERROR}), 404
+        
+        return jsonify({**body, 'cache': cache_info})
+    
+    except GitHubRateLimitError as e:
+        return jsonify({'error': str(e), 'reset_time': int(e.reset_time)}), 429
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/profile/generate-async', methods=['POST'])
+async def generate_profile_async():
+    """Async API endpoint for profile generation
+    
+    GitHub I/O runs on the shared event loop with one pooled client, so
+    concurrent builds wait on the network instead of each holding a thread.
+    """
+    # httpx is only needed here, so it is not imported at startup
+    from profile_helper.async_fetcher import AsyncGitHubFetcher, await_on_shared_loop
+    
     try:
         data = request.get_json()
         github_username = data.get('github_username')
         github_token = data.get('github_token')
         max_repos = int(data.get('max_repos', 10))
+        include_readme = bool(data.get('include_readme', True))
         
         if not github_username:
             return jsonify({'error': 'GitHub username is required'}), 400
         
-        # Initialize GitHub fetcher and profile generator
-        github_fetcher = GitHubFetcher(github_token)
-        profile_generator = ProfileGenerator()
+        github_fetcher = AsyncGitHubFetcher(github_token)
+        profile_generator = get_profile_generator()
         
-        # Fetch user information and repositories
-        user_info = github_fetcher.get_user_info(github_username)
-        repos = github_fetcher.get_user_repos(github_username, max_repos)
+        # User info and repositories are fetched concurrently
+        user_info, repos = await await_on_shared_loop(
+            github_fetcher.get_user_info_and_repos(github_username, max_repos, include_readme)
+        )
         
         if not repos:
-            return jsonify({'error': 'No repositories found or unable to access repositories'}), 404
+            return jsonify({'error': NO_REPOS_ERROR}), 404
         
-        # Analyze repositories
         analysis = github_fetcher.analyze_repos(repos)
         
-        # Generate profile content
-        profile_content = profile_generator.generate_profile(user_info, repos, analysis)
-        
-        return jsonify({
-            'success': True,
-            'profile': profile_content,
-            'user_info': user_info,
-            'analysis': {
-                'total_repos': len(repos),
-                'languages': analysis.get('languages', {}),
-                'technologies': analysis.get('technologies', []),
-                'project_types': analysis.get('project_types', [])
-            }
-        })
+        # The OpenAI client is blocking, so keep it off the event loop
+        profile_content = await asyncio.to_thread(profile_generator.generate_profile, user_info, repos, analysis)
         
+        return jsonify(profile_response(user_info, repos, analysis, profile_content, github_fetcher.last_selection))
+    
+    except GitHubRateLimitError as e:
+        return jsonify({'error': str(e), 'reset_time': int(e.reset_time)}), 429
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/profile/stream', methods=['POST'])
+def generate_profile_stream():
+    """Profile generation streamed as NDJSON events
+    
+    Sends 'analysis', then each profile 'section' as soon as it is built,
+    then the transcription as 'transcription' text deltas, then 'done'.
+    Failures after the stream has started arrive as an 'error' event with
+    the status code the non-streaming endpoint would use.
+    """
+    data = request.get_json() or {}
+    github_username = data.get('github_username')
+    if not github_username:
+        return jsonify({'error': 'GitHub username is required'}), 400
+    
+    try:
+        max_repos = int(data.get('max_repos', 10))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'max_repos must be an integer'}), 400
+    
+    events = iter_profile_events(
+        github_username,
+        data.get('github_token'),
+        max_repos,
+        include_readme=bool(data.get('include_readme', True)),
+        force_refresh=bool(data.get('force_refresh', False))
+    )
+    
+    def stream():
+        try:
+            for event in events:
+                yield json.dumps(event, default=str) + '\n'
+        except GitHubRateLimitError as e:
+            yield json.dumps({'event': 'error', 'status': 429, 'error': str(e), 'reset_time': int(e.reset_time)}) + '\n'
+        except Exception as e:
+            yield json.dumps({'event': 'error', 'status': 500, 'error': str(e)}) + '\n'
+    
+    response = Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+    # Keep reverse proxies from buffering the stream
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Status, stage-level progress and (once finished) result of a background profile job"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/profile/batch', methods=['POST'])
+def generate_profile_batch():
+    """Generate profiles for several users, streaming one JSON line per user as each completes
+    
+    The last line is {"summary": {...}}. Per-user failures are reported in
+    their own line with the status code the single-user endpoint would use.
+    """
+    data = request.get_json() or {}
+    usernames = data.get('github_usernames')
+    if not isinstance(usernames, list) or not all(isinstance(name, str) for name in usernames):
+        return jsonify({'error': 'github_usernames must be a list of GitHub usernames'}), 400
+    
+    usernames = normalize_usernames(usernames)
+    if not usernames:
+        return jsonify({'error': 'At least one GitHub username is required'}), 400
+    if len(usernames) > Config.BATCH_MAX_USERS:
+        return jsonify({'error': f'At most {Config.BATCH_MAX_USERS} usernames per batch'}), 400
+    if data.get('github_token'):
+        # A caller token only lists its owner's repositories (see iter_batch_profiles)
+        return jsonify({'error': 'github_token is not supported for batches; generate private profiles one at a time'}), 400
+    
+    try:
+        max_repos = int(data.get('max_repos', 10))
+        max_workers = int(data.get('max_workers', Config.BATCH_MAX_WORKERS))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'max_repos and max_workers must be integers'}), 400
+    
+    results = iter_batch_profiles(
+        usernames,
+        max_repos=max_repos,
+        include_readme=bool(data.get('include_readme', True)),
+        force_refresh=bool(data.get('force_refresh', False)),
+        # Callers may lower parallelism, never raise it past the configured limit
+        max_workers=max(1, min(max_workers, Config.BATCH_MAX_WORKERS))
+    )
+    
+    def stream():
+        finished = []
+        for result in results:
+            finished.append(result)
+            yield json.dumps(result, default=str) + '\n'
+        yield json.dumps(batch_summary(finished)) + '\n'
+    
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
 @app.route('/api/proposal/generate', methods=['POST'])
 def generate_proposal():
     """API endpoint for proposal generation"""
@@ -93,7 +273,7 @@ def generate_proposal():
             'tone': tone,
             'job_description_length': len(job_description)
         })
-        
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -109,9 +289,30 @@ def health_check():
 
 @app.route('/api/github/rate-limit')
 def check_rate_limit():
-    """Check GitHub API rate limit status"""
+    """Check GitHub API rate limit status
+    
+    Answers from the budget the rate limiter learned from recent GitHub
+    responses; /rate_limit is only called when that snapshot is older than
+    GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE or its reset time has passed.
+    """
     try:
-        github_token = app.config.get('GITHUB_TOKEN')
+        token_pool = get_token_pool()
+        github_token = token_pool.choose()
+        snapshot = get_rate_limiter().snapshot(github_token)
+        now = time.time()
+        
+        if (snapshot['updated_at'] and now - snapshot['updated_at'] <= Config.GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE
+                and snapshot['reset_time'] > now):
+            return jsonify({
+                'limit': snapshot['limit'] or 0,
+                'remaining': snapshot['remaining'],
+                'reset_time': snapshot['reset_time'],
+                'authenticated': bool(github_token),
+                'tokens': token_pool.status(),
+                'source': 'snapshot',
+                'age': round(now - snapshot['updated_at'], 3)
+            })
+        
         headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'Upwork-Assistant/1.0'
@@ -120,9 +321,12 @@ def check_rate_limit():
         if github_token:
             headers['Authorization'] = f'token {github_token}'
         
-        response = requests.get('https://api.github.com/rate_limit', headers=headers)
+        response = get_github_session().get(
+            f"{Config.GITHUB_API_BASE_URL}/rate_limit", headers=headers, timeout=get_github_timeout()
+        )
         
         if response.status_code == 200:
+            get_rate_limiter().update(github_token, response.headers, response.status_code, reserved=False)
             data = response.json()
             core_limit = data.get('resources', {}).get('core', {})
             
@@ -130,13 +334,32 @@ def check_rate_limit():
                 'limit': core_limit.get('limit', 0),
                 'remaining': core_limit.get('remaining', 0),
                 'reset_time': core_limit.get('reset', 0),
-                'authenticated': bool(github_token)
+                'authenticated': bool(github_token),
+                'tokens': token_pool.status(),
+                'source': 'live',
+                'age': 0
             })
         else:
             return jsonify({'error': 'Could not check rate limit'}), 500
-            
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/github/cache-stats')
+def github_cache_stats():
+    """Report GitHub response cache and repository store counters"""
+    cache = get_response_cache()
+    store = get_repo_store()
+    
+    stats = {'enabled': False} if cache is None else {'enabled': True, **cache.get_stats()}
+    stats['repo_store'] = {'enabled': False} if store is None else {'enabled': True, **store.get_stats()}
+    return jsonify(stats)
+
+@app.route('/api/openai/cache-stats')
+def openai_cache_stats():
+    """Report transcription cache hits, tokens spent and tokens/seconds saved"""
+    cache = get_completion_cache()
+    return jsonify({'enabled': False} if cache is None else {'enabled': True, **cache.get_stats()})
+
 if __name__ == '__main__':
     app.run(debug=app.config['DEBUG'], host='0.0.0.0', port=5001) 
\ No newline at end of file
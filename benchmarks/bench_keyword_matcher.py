@@ -0,0 +1,132 @@
+"""Microbenchmark: compiled KeywordMatcher vs the old per-keyword substring loops
+
+Run from the project root:
+    python -m benchmarks.bench_keyword_matcher
+"""
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profile_helper.keyword_matcher import DEFAULT_KEYWORDS_FILE, KEYWORDS, KeywordMatcher
+
+LEGACY_TECHS = [
+    'react', 'vue', 'angular', 'node.js', 'express', 'django', 'flask',
+    'python', 'javascript', 'typescript', 'java', 'c#', 'php', 'ruby',
+    'mongodb', 'postgresql', 'mysql', 'redis', 'docker', 'kubernetes',
+    'aws', 'azure', 'gcp', 'firebase', 'heroku', 'netlify'
+]
+
+
+def legacy_extract_technologies(repo, technologies):
+    """The substring loop GitHubFetcher._extract_technologies used before KeywordMatcher"""
+    for topic in repo['topics']:
+        technologies.add(topic.lower())
+    description = repo['description'].lower() if repo['description'] else ''
+    for tech in LEGACY_TECHS:
+        if tech in description:
+            technologies.add(tech)
+
+
+def legacy_categorize_project(repo):
+    """The keyword chain GitHubFetcher._categorize_project used before KeywordMatcher"""
+    name = repo['name'].lower()
+    description = repo['description'].lower() if repo['description'] else ''
+    topics = [topic.lower() for topic in repo['topics']]
+    if any(word in name or word in description for word in ['web', 'app', 'website', 'dashboard']):
+        return 'Web Application'
+    if any(word in name or word in description for word in ['api', 'backend', 'server']):
+        return 'API/Backend'
+    if any(word in name or word in description for word in ['mobile', 'android', 'ios', 'react-native']):
+        return 'Mobile Application'
+    if any(word in name or word in description for word in ['ml', 'ai', 'data', 'analysis', 'jupyter']):
+        return 'Data Science'
+    if any(word in name or word in description for word in ['tool', 'utility', 'cli', 'script']):
+        return 'Tool/Utility'
+    return 'Other'
+
+
+WORDS = ('a simple fast small project for managing your tasks notes and files with a clean '
+         'interface and tests maintained by the community built using modern tooling with a '
+         'deployment pipeline and documentation examples configuration plugins support').split()
+TECHS = LEGACY_TECHS + ['graphql', 'tailwind', 'fastapi']
+
+
+def make_text(rng, length, tech_ratio=0.1):
+    """Prose of the given word count where roughly tech_ratio of the words are technologies"""
+    return ' '.join(rng.choice(TECHS) if rng.random() < tech_ratio else rng.choice(WORDS) for _ in range(length))
+
+
+def make_repos(count, seed=0, readme_words=0):
+    """Synthetic repositories with realistic-length descriptions (and READMEs if requested)"""
+    rng = random.Random(seed)
+    repos = []
+    for i in range(count):
+        repos.append({
+            'name': f"{rng.choice(['awesome', 'my', 'team'])}-{rng.choice(['tool', 'service', 'site', 'lib'])}-{i}",
+            'description': make_text(rng, rng.randint(5, 30)),
+            'topics': rng.sample(TECHS, rng.randint(0, 4)),
+            'readme_content': make_text(rng, readme_words, tech_ratio=0.02) if readme_words else ''
+        })
+    return repos
+
+
+def legacy(repos, use_readme=False, techs=None):
+    technologies = set()
+    for repo in repos:
+        if techs is not None:
+            # Same substring loop over a larger keyword list
+            description = repo['description'].lower()
+            technologies.update(tech for tech in techs if tech in description)
+        legacy_extract_technologies(repo, technologies)
+        legacy_categorize_project(repo)
+        if use_readme:
+            # What the old loops would cost if they also scanned the README
+            legacy_extract_technologies({'topics': [], 'description': repo['readme_content']}, technologies)
+    return technologies
+
+
+def compiled(repos, use_readme=False, matcher=KEYWORDS):
+    technologies = set()
+    for repo in repos:
+        readme = repo['readme_content'] if use_readme else None
+        found, _ = matcher.match(repo['name'], repo['description'], repo['topics'], readme)
+        technologies.update(found)
+    return technologies
+
+
+def run(label, repos, use_readme, extra_techs=None):
+    number = 10
+    timings = {}
+    matcher = KEYWORDS
+    if extra_techs:
+        matcher = KeywordMatcher({**_keyword_data(), 'technologies': LEGACY_TECHS + extra_techs})
+    runners = (
+        ('legacy loops', lambda: legacy(repos, use_readme, extra_techs)),
+        ('compiled matcher', lambda: compiled(repos, use_readme, matcher))
+    )
+    for name, fn in runners:
+        seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        timings[name] = seconds
+        print(f"{label:22s} {name:18s} {seconds * 1e6 / len(repos):9.2f} us/repo")
+    print(f"{label:22s} {'speedup':18s} {timings['legacy loops'] / timings['compiled matcher']:9.2f}x")
+
+
+def _keyword_data():
+    with open(DEFAULT_KEYWORDS_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    # The substring loops cost O(keywords x text); the matcher is O(text)
+    extra_techs = [f"{tech}-{suffix}" for tech in LEGACY_TECHS for suffix in ('cli', 'sdk', 'orm', 'ui', 'kit', 'js', 'db', 'api', 'lab', 'hub')]
+    run('name+description', make_repos(1000), use_readme=False)
+    run('with 800-word README', make_repos(200, readme_words=800), use_readme=True)
+    run(f'{len(LEGACY_TECHS) + len(extra_techs)} keywords', make_repos(1000), use_readme=False, extra_techs=extra_techs)
+
+
+if __name__ == '__main__':
+    main()
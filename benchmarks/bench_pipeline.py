@@ -0,0 +1,276 @@
+"""Benchmark the fetch -> analyze -> generate pipeline against a local GitHub stub
+
+GitHub responses are replayed by benchmarks.github_stub (synthetic accounts
+or a recorded fixture) with injected latency, and OpenAI is replaced by
+benchmarks.openai_stub. For each account size this measures end-to-end
+latency of POST /api/profile/generate and per-stage latency of the same
+pipeline, then microbenchmarks analyze_repos, _extract_technologies,
+_categorize_project and _generate_skills. Caches are cold unless --warm.
+
+Run from the project root:
+    python -m benchmarks.bench_pipeline --output before.json
+    python -m benchmarks.bench_pipeline --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from benchmarks import openai_stub
+from benchmarks.github_stub import GitHubStubServer, make_fixture
+
+DEFAULT_SIZES = [5, 50, 200, 1000]
+
+
+def configure(base_url: str, database_url: str, warm: bool):
+    """Point the app at the stub and make caches opt-in (must run before the pipeline is used)"""
+    Config.GITHUB_API_BASE_URL = base_url
+    Config.GITHUB_GRAPHQL_URL = f'{base_url}/graphql'
+    Config.GITHUB_FETCH_BACKEND = 'rest'
+    Config.GITHUB_TOKEN = None
+    Config.GITHUB_TOKENS = []
+    Config.DATABASE_URL = database_url
+    Config.GITHUB_CACHE_ENABLED = warm
+    Config.REPO_STORE_ENABLED = warm
+    Config.OPENAI_CACHE_ENABLED = warm
+    Config.OPENAI_CACHE_ONLY = False
+    if not warm:
+        Config.PROFILE_CACHE_TTL = 0
+
+
+class StageTimer:
+    """Progress callback recording when each pipeline stage starts"""
+    
+    def __init__(self):
+        self.marks: List = []
+    
+    def __call__(self, stage: str, done: Optional[int] = None, total: Optional[int] = None):
+        if not self.marks or self.marks[-1][0] != stage:
+            self.marks.append((stage, time.perf_counter()))
+    
+    def durations(self, finished: float) -> Dict[str, float]:
+        ends = [moment for _, moment in self.marks[1:]] + [finished]
+        return {stage: end - start for (stage, start), end in zip(self.marks, ends)}
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Milliseconds: min / median / mean / max of the samples"""
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        'min_ms': round(ms[0], 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'mean_ms': round(statistics.mean(ms), 3),
+        'max_ms': round(ms[-1], 3)
+    }
+
+
+def bench_pipeline(client, server: GitHubStubServer, username: str, repo_count: int, max_repos: int,
+                   repeat: int) -> Dict:
+    from profile_helper.profile_service import build_profile
+    
+    end_to_end = []
+    requests_per_run = []
+    for _ in range(repeat):
+        before = server.request_count
+        started = time.perf_counter()
+        response = client.post('/api/profile/generate', json={'github_username': username, 'max_repos': max_repos})
+        end_to_end.append(time.perf_counter() - started)
+        requests_per_run.append(server.request_count - before)
+        if response.status_code != 200:
+            raise RuntimeError(f"{username}: HTTP {response.status_code} {response.get_json()}")
+    
+    stages: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        timer = StageTimer()
+        build_profile(username, None, max_repos, progress=timer)
+        for stage, seconds in timer.durations(time.perf_counter()).items():
+            stages.setdefault(stage, []).append(seconds)
+    
+    return {
+        'repos': repo_count,
+        'max_repos': max_repos,
+        'github_requests': max(requests_per_run),
+        'end_to_end': summarize(end_to_end),
+        'stages': {stage: summarize(samples) for stage, samples in stages.items()}
+    }
+
+
+def time_per_call(fn: Callable[[], object], operations: int, number: int = 5) -> float:
+    """Best-of-5 microseconds per operation"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number / operations * 1e6
+
+
+def bench_micro(sizes: List[int]) -> List[Dict]:
+    from profile_helper.github_fetcher import GitHubFetcher
+    from profile_helper.profile_generator import ProfileGenerator
+    from profile_helper.records import RepoRecord
+    
+    fetcher = GitHubFetcher()
+    generator = ProfileGenerator()
+    results = []
+    for size in sizes:
+        fixture = make_fixture('micro', size)
+        listing = [repo for key, value in fixture.items() if key.startswith('GET /users/micro/repos')
+                   for repo in value['body']]
+        records = [
+            RepoRecord.from_github(
+                repo,
+                fixture[f"GET /repos/{repo['full_name']}/languages"]['body'],
+                fixture[f"GET /repos/{repo['full_name']}/readme"]['body']
+            )
+            for repo in listing
+        ]
+        analysis = fetcher.analyze_repos(records)
+        
+        def extract():
+            for record in records:
+                fetcher._extract_technologies(record, set())
+        
+        def categorize():
+            for record in records:
+                fetcher._categorize_project(record)
+        
+        results.append({
+            'repos': size,
+            'analyze_repos_us': round(time_per_call(lambda: fetcher.analyze_repos(records), 1), 3),
+            'extract_technologies_us_per_repo': round(time_per_call(extract, len(records)), 3),
+            'categorize_project_us_per_repo': round(time_per_call(categorize, len(records)), 3),
+            'generate_skills_us': round(time_per_call(lambda: generator._generate_skills(analysis), 1, number=50), 3)
+        })
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def flatten(results: Dict) -> Dict[str, float]:
+    """Comparable metrics keyed like 'pipeline.50.end_to_end.median_ms'"""
+    metrics = {}
+    for run in results.get('pipeline', []):
+        prefix = f"pipeline.{run['repos']}"
+        metrics[f'{prefix}.end_to_end.median_ms'] = run['end_to_end']['median_ms']
+        metrics[f'{prefix}.github_requests'] = run['github_requests']
+        for stage, summary in run['stages'].items():
+            metrics[f'{prefix}.{stage}.median_ms'] = summary['median_ms']
+    for run in results.get('micro', []):
+        for name, value in run.items():
+            if name != 'repos':
+                metrics[f"micro.{run['repos']}.{name}"] = value
+    return metrics
+
+
+def compare(previous: Dict, current: Dict):
+    """Print each metric present in both runs with its relative change"""
+    old, new = flatten(previous), flatten(current)
+    print(f"\n{'metric':55s} {'before':>12s} {'after':>12s} {'change':>8s}")
+    for name in sorted(old.keys() & new.keys()):
+        change = (new[name] - old[name]) / old[name] * 100 if old[name] else 0.0
+        print(f"{name:55s} {old[name]:12.3f} {new[name]:12.3f} {change:+7.1f}%")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark profile generation against a local GitHub stub')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='Comma-separated repo counts')
+    parser.add_argument('--fixture', help='Recorded fixture (from benchmarks.github_stub --record) instead of synthetic accounts')
+    parser.add_argument('--username', help='Account in --fixture to profile')
+    parser.add_argument('--max-repos', type=int, help='max_repos per request (default: the whole account)')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='Injected GitHub latency per response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random latency per response')
+    parser.add_argument('--openai-latency-ms', type=float, default=300.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--warm', action='store_true', help='Keep response/profile/completion caches enabled')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--output', help='Write JSON results here')
+    parser.add_argument('--compare', help='Previous JSON results to compare against')
+    args = parser.parse_args(argv)
+    
+    if args.fixture:
+        if not args.username:
+            parser.error('--username is required with --fixture')
+        with open(args.fixture, encoding='utf-8') as f:
+            fixture = json.load(f)
+        accounts = [(args.username, sum(len(value['body']) for key, value in fixture.items()
+                                        if key.startswith(f'GET /users/{args.username}/repos')))]
+        sizes = [count for _, count in accounts]
+    else:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+        fixture = {}
+        accounts = []
+        for size in sizes:
+            fixture.update(make_fixture(f'bench-{size}', size, seed=size))
+            accounts.append((f'bench-{size}', size))
+    
+    server = GitHubStubServer(fixture, args.latency_ms / 1000, args.jitter_ms / 1000).start()
+    database = tempfile.TemporaryDirectory(prefix='profile-bench-')
+    configure(server.url, f"sqlite:///{os.path.join(database.name, 'bench.db')}", args.warm)
+    completions = openai_stub.install(args.openai_latency_ms / 1000)
+    
+    import app
+    client = app.app.test_client()
+    
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'openai_latency_ms': args.openai_latency_ms,
+            'repeat': args.repeat,
+            'warm': args.warm,
+            'detail_limit': Config.REPO_DETAIL_LIMIT,
+            'max_workers': Config.GITHUB_MAX_WORKERS
+        },
+        'pipeline': [],
+        'micro': []
+    }
+    
+    try:
+        for username, repo_count in accounts:
+            run = bench_pipeline(client, server, username, repo_count, args.max_repos or max(repo_count, 1), args.repeat)
+            results['pipeline'].append(run)
+            stages = '  '.join(f"{stage}={summary['median_ms']:.1f}" for stage, summary in run['stages'].items())
+            print(f"{repo_count:5d} repos  e2e median {run['end_to_end']['median_ms']:9.1f} ms  "
+                  f"{run['github_requests']:4d} GitHub requests  {stages}", file=sys.stderr)
+    finally:
+        server.stop()
+    results['meta']['openai_calls'] = completions.calls
+    
+    if not args.skip_micro:
+        results['micro'] = bench_micro(sizes)
+        for run in results['micro']:
+            print(f"{run['repos']:5d} repos  " + '  '.join(f"{name}={value}" for name, value in run.items()
+                                                        if name != 'repos'), file=sys.stderr)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), results)
+    
+    database.cleanup()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
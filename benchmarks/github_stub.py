@@ -0,0 +1,396 @@
+"""Local GitHub API stub that replays recorded responses with injected latency
+
+A fixture is a JSON object mapping "GET /path?page=N" to a recorded
+{"status", "headers", "body"} response. "{base_url}" inside headers (the
+Link header of paginated lists) is replaced with the stub's own URL when
+served. Query parameters other than page are ignored, so fixtures keep
+matching when the fetcher's per_page changes. POST /graphql answers the
+profile query from the same REST fixture.
+
+Record a real account, then serve it (run from the project root):
+    python -m benchmarks.github_stub --record octocat --output octocat.json
+    python -m benchmarks.github_stub --serve octocat.json --port 8765 --latency-ms 50
+    python -m benchmarks.github_stub --serve synthetic:100 --latency-ms 80 --sigma 0.5 --error-5xx 0.02
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+GITHUB_API = 'https://api.github.com'
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Java', 'HTML', 'CSS', 'Shell', 'Ruby']
+TOPICS = ['react', 'django', 'flask', 'docker', 'kubernetes', 'postgresql', 'redis', 'graphql', 'aws', 'cli']
+WORDS = ('a fast small tool service library dashboard api for managing tasks notes files data with clean '
+         'interface tests docs plugins web app backend server mobile analysis script utility').split()
+README_LINES = [
+    '```bash\npip install django djangorestframework\n```',
+    '[![CI](https://img.shields.io/badge/docker-ready-blue)](https://example.com)',
+    'Run `npm install react` and `docker compose up` to start.',
+    'This project keeps things simple and well tested.'
+]
+
+
+def normalize_path(path: str) -> str:
+    """Fixture key for a request path: only the page parameter is significant"""
+    parts = urlsplit(path)
+    page = parse_qs(parts.query).get('page', ['1'])[0]
+    return f"{parts.path}?page={page}" if page != '1' else parts.path
+
+
+def _response(body, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Dict:
+    return {'status': status, 'headers': headers or {}, 'body': body}
+
+
+def make_fixture(username: str = 'bench-user', repo_count: int = 50, seed: int = 0, page_size: int = 100,
+                 readme_lines: int = 40) -> Dict[str, Dict]:
+    """Synthetic account in the recorded-fixture format (deterministic for a seed)"""
+    rng = random.Random(seed)
+    fixture = {
+        f"GET /users/{username}": _response({
+            'login': username, 'name': username.replace('-', ' ').title(), 'bio': 'Builds things',
+            'location': 'Remote', 'public_repos': repo_count, 'followers': rng.randint(0, 500),
+            'following': rng.randint(0, 100), 'created_at': '2016-03-01T12:00:00Z',
+            'avatar_url': f'https://avatars.example.com/{username}'
+        })
+    }
+    
+    repos = []
+    for i in range(repo_count):
+        name = f"{rng.choice(['awesome', 'my', 'team', 'open'])}-{rng.choice(['tool', 'service', 'site', 'lib'])}-{i}"
+        # Most recently updated first, like sort=updated
+        updated = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() - i * 3 * 86400))
+        repos.append({
+            'name': name, 'full_name': f'{username}/{name}', 'owner': {'login': username},
+            'html_url': f'https://github.com/{username}/{name}',
+            'description': ' '.join(rng.choice(WORDS + TOPICS) for _ in range(rng.randint(4, 20))),
+            'language': rng.choice(LANGUAGES), 'stargazers_count': int(rng.paretovariate(1.2)) - 1,
+            'forks_count': rng.randint(0, 20), 'created_at': '2018-01-01T00:00:00Z', 'updated_at': updated,
+            'pushed_at': updated, 'topics': rng.sample(TOPICS, rng.randint(0, 4)), 'size': rng.randint(10, 50000),
+            'fork': rng.random() < 0.1, 'open_issues_count': rng.randint(0, 30), 'private': False
+        })
+        
+        languages = {language: rng.randint(1000, 200000) for language in rng.sample(LANGUAGES, rng.randint(1, 4))}
+        readme = '\n\n'.join(rng.choice(README_LINES) for _ in range(readme_lines))
+        fixture[f"GET /repos/{username}/{name}/languages"] = _response(languages)
+        fixture[f"GET /repos/{username}/{name}/readme"] = _response(readme)
+    
+    pages = [repos[start:start + page_size] for start in range(0, len(repos), page_size)] or [[]]
+    for number, page in enumerate(pages, start=1):
+        headers = {}
+        if number < len(pages):
+            headers['Link'] = f'<{{base_url}}/users/{username}/repos?page={number + 1}>; rel="next"'
+        key = f"GET /users/{username}/repos" + (f"?page={number}" if number > 1 else '')
+        fixture[key] = _response(page, headers=headers)
+    
+    return fixture
+
+
+def record_fixture(username: str, token: Optional[str] = None, max_repos: int = 30) -> Dict[str, Dict]:
+    """Record user, repository list and per-repo detail responses from the real GitHub API"""
+    import requests
+    
+    session = requests.Session()
+    session.headers['Accept'] = 'application/vnd.github.v3+json'
+    if token:
+        session.headers['Authorization'] = f'token {token}'
+    fixture = {}
+    
+    def get(path: str, accept: Optional[str] = None) -> requests.Response:
+        response = session.get(f'{GITHUB_API}{path}', headers={'Accept': accept} if accept else None, timeout=30)
+        headers = {}
+        if 'Link' in response.headers:
+            headers['Link'] = response.headers['Link'].replace(GITHUB_API, '{base_url}')
+        content_type = response.headers.get('Content-Type', '')
+        body = response.json() if 'json' in content_type else response.text
+        fixture[f"GET {normalize_path(path)}"] = _response(body, response.status_code, headers)
+        return response
+    
+    get(f'/users/{username}')
+    repos: List[Dict] = []
+    path = f'/users/{username}/repos?sort=updated&per_page=100&type=owner'
+    while path and len(repos) < max_repos:
+        response = get(path)
+        repos.extend(response.json())
+        next_url = response.links.get('next', {}).get('url')
+        path = next_url[len(GITHUB_API):] if next_url else None
+    
+    for repo in repos[:max_repos]:
+        get(f"/repos/{repo['full_name']}/languages")
+        get(f"/repos/{repo['full_name']}/readme", accept='application/vnd.github.raw')
+    return fixture
+
+
+class GitHubStubServer:
+    """Threaded HTTP server replaying a fixture over REST and GraphQL
+    
+    Each response waits latency seconds plus up to jitter; with sigma > 0
+    the latency is drawn from a lognormal distribution with that median
+    instead, giving the long tail of real API calls. Every resource (core,
+    graphql) allows rate_limit requests per rate_limit_window seconds and
+    then answers 403 with X-RateLimit-Remaining: 0 (GraphQL: a RATE_LIMITED
+    error). error_403 and error_5xx are the fractions of requests answered
+    with an injected secondary-rate-limit 403 or a 502/503.
+    """
+    
+    def __init__(self, fixture: Dict[str, Dict], latency: float = 0.0, jitter: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0, sigma: float = 0.0, rate_limit: int = 100000,
+                 rate_limit_window: float = 3600.0, error_403: float = 0.0, error_5xx: float = 0.0,
+                 seed: Optional[int] = None):
+        self.fixture = {self._normalize_key(key): value for key, value in fixture.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.sigma = sigma
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.error_403 = error_403
+        self.error_5xx = error_5xx
+        self.request_count = 0
+        self.injected = {'403': 0, '5xx': 0, 'rate_limited': 0}
+        self._count_lock = threading.Lock()
+        self._rng = random.Random(seed)
+        # resource -> [remaining, reset epoch]
+        self._budgets: Dict[str, List[float]] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self.url = f'http://{host}:{self._server.server_address[1]}'
+    
+    @staticmethod
+    def _normalize_key(key: str) -> str:
+        method, _, path = key.partition(' ')
+        return f"{method} {normalize_path(path)}"
+    
+    def _budget(self, resource: str, now: float) -> List[float]:
+        """Current window of a rate-limit resource (count lock held)"""
+        budget = self._budgets.get(resource)
+        if budget is None or now >= budget[1]:
+            budget = self._budgets[resource] = [self.rate_limit, now + self.rate_limit_window]
+        return budget
+    
+    def _admit(self, resource: Optional[str]) -> Tuple[Optional[Dict], Dict[str, str]]:
+        """Count, delay and rate-limit one request
+        
+        Returns an error response to send instead of the fixture (or None)
+        plus the X-RateLimit headers. resource None (GET /rate_limit) is
+        free and never fails, as on GitHub, and reports the core budget.
+        """
+        now = time.time()
+        with self._count_lock:
+            self.request_count += 1
+            delay = self.latency * (self._rng.lognormvariate(0, self.sigma) if self.sigma else 1)
+            delay += self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+            
+            error = None
+            budget = self._budget(resource or 'core', now)
+            exhausted = budget[0] <= 0
+            if resource is not None:
+                budget[0] = max(0, budget[0] - 1)
+            headers = {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(int(budget[0])),
+                'X-RateLimit-Reset': str(int(budget[1])),
+                'X-RateLimit-Resource': resource or 'core'
+            }
+            
+            if resource is not None:
+                if exhausted:
+                    self.injected['rate_limited'] += 1
+                    if resource == 'graphql':
+                        error = _response({'errors': [{'type': 'RATE_LIMITED', 'message': 'API rate limit exceeded'}]})
+                    else:
+                        error = _response({'message': 'API rate limit exceeded'}, status=403)
+                elif roll < self.error_403:
+                    self.injected['403'] += 1
+                    error = _response({'message': 'You have exceeded a secondary rate limit'}, status=403,
+                                      headers={'Retry-After': '1'})
+                elif roll < self.error_403 + self.error_5xx:
+                    self.injected['5xx'] += 1
+                    error = _response({'message': 'Server Error'}, status=self._rng.choice((502, 503)))
+        
+        if delay > 0:
+            time.sleep(delay)
+        return error, headers
+    
+    def rate_limit_status(self) -> Dict:
+        """Body of GET /rate_limit"""
+        now = time.time()
+        with self._count_lock:
+            resources = {
+                resource: {'limit': self.rate_limit, 'remaining': int(budget[0]), 'reset': int(budget[1]),
+                           'used': self.rate_limit - int(budget[0])}
+                for resource, budget in ((name, self._budget(name, now)) for name in ('core', 'graphql'))
+            }
+        return {'resources': resources, 'rate': resources['core']}
+    
+    def graphql(self, request: Dict) -> Dict:
+        """Answer the profile query from the REST fixture (user, one page of non-fork repos)"""
+        variables = request.get('variables') or {}
+        login = variables.get('login', '')
+        user = self.fixture.get(f"GET /users/{login}")
+        if user is None or user['status'] != 200:
+            return {'data': {'user': None},
+                    'errors': [{'type': 'NOT_FOUND', 'message': f"Could not resolve to a User with the login of '{login}'."}]}
+        
+        repos = []
+        page = 1
+        while True:
+            recorded = self.fixture.get(f"GET /users/{login}/repos" + (f"?page={page}" if page > 1 else ''))
+            if recorded is None or not recorded['body']:
+                break
+            repos.extend(repo for repo in recorded['body'] if not repo.get('fork'))
+            page += 1
+        
+        start = int(variables.get('after') or 0)
+        end = start + max(1, min(int(variables.get('first') or 100), 100))
+        body = user['body']
+        return {'data': {'user': {
+            'login': body['login'],
+            'name': body.get('name'),
+            'bio': body.get('bio'),
+            'location': body.get('location'),
+            'createdAt': body.get('created_at'),
+            'avatarUrl': body.get('avatar_url'),
+            'followers': {'totalCount': body.get('followers', 0)},
+            'following': {'totalCount': body.get('following', 0)},
+            'publicRepos': {'totalCount': body.get('public_repos', len(repos))},
+            'repositories': {
+                'pageInfo': {'hasNextPage': end < len(repos), 'endCursor': str(min(end, len(repos)))},
+                'nodes': [self._graphql_repository(repo, variables.get('withReadme', True)) for repo in repos[start:end]]
+            }
+        }}}
+    
+    def _graphql_repository(self, repo: Dict, with_readme: bool) -> Dict:
+        languages = (self.fixture.get(f"GET /repos/{repo['full_name']}/languages") or {}).get('body') or {}
+        node = {
+            'name': repo['name'],
+            'nameWithOwner': repo['full_name'],
+            'description': repo.get('description'),
+            'url': repo.get('html_url'),
+            'isPrivate': repo.get('private', False),
+            'createdAt': repo.get('created_at'),
+            'updatedAt': repo.get('updated_at'),
+            'pushedAt': repo.get('pushed_at'),
+            'stargazerCount': repo.get('stargazers_count', 0),
+            'forkCount': repo.get('forks_count', 0),
+            'diskUsage': repo.get('size', 0),
+            'primaryLanguage': {'name': repo['language']} if repo.get('language') else None,
+            'issues': {'totalCount': repo.get('open_issues_count', 0)},
+            'languages': {'edges': [{'size': size, 'node': {'name': name}} for name, size in
+                                    sorted(languages.items(), key=lambda item: -item[1])[:20]]},
+            'repositoryTopics': {'nodes': [{'topic': {'name': topic}} for topic in repo.get('topics', [])[:20]]}
+        }
+        if with_readme:
+            readme = self.fixture.get(f"GET /repos/{repo['full_name']}/readme")
+            found = readme is not None and readme['status'] == 200 and isinstance(readme['body'], str)
+            node['readme0'] = {'text': readme['body']} if found else None
+        return node
+    
+    def _handler_class(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                error, headers = stub._admit(None if path == '/rate_limit' else 'core')
+                if error is not None:
+                    recorded = error
+                elif path == '/rate_limit':
+                    recorded = _response(stub.rate_limit_status())
+                else:
+                    recorded = stub.fixture.get(f"GET {normalize_path(self.path)}")
+                    if recorded is None:
+                        recorded = _response({'message': 'Not Found'}, status=404)
+                self._send(recorded, headers)
+            
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if urlsplit(self.path).path != '/graphql':
+                    self._send(_response({'message': 'Not Found'}, status=404), {})
+                    return
+                error, headers = stub._admit('graphql')
+                self._send(error or _response(stub.graphql(request)), headers)
+            
+            def _send(self, recorded: Dict, rate_headers: Dict[str, str]):
+                body = recorded['body']
+                if isinstance(body, str):
+                    payload, content_type = body.encode(), 'text/plain; charset=utf-8'
+                else:
+                    payload, content_type = json.dumps(body).encode(), 'application/json; charset=utf-8'
+                
+                self.send_response(recorded['status'])
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in {**rate_headers, **recorded['headers']}.items():
+                    self.send_header(name, value.replace('{base_url}', stub.url))
+                self.end_headers()
+                self.wfile.write(payload)
+        
+        return Handler
+    
+    def start(self) -> 'GitHubStubServer':
+        threading.Thread(target=self._server.serve_forever, name='github-stub', daemon=True).start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Record or serve GitHub API fixtures')
+    parser.add_argument('--record', metavar='USERNAME', help='Record this account from api.github.com')
+    parser.add_argument('--token', default=os.getenv('GITHUB_TOKEN'), help='Token used while recording')
+    parser.add_argument('--max-repos', type=int, default=30, help='Repositories whose details are recorded')
+    parser.add_argument('--output', help='Fixture file written by --record')
+    parser.add_argument('--serve', metavar='FIXTURE', help="Serve a fixture file ('synthetic:N' for N generated repos)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--sigma', type=float, default=0.0, help='Lognormal spread; --latency-ms becomes the median')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='Requests per hour per resource')
+    parser.add_argument('--error-403', type=float, default=0.0, help='Fraction of secondary-rate-limit 403s')
+    parser.add_argument('--error-5xx', type=float, default=0.0, help='Fraction of 502/503 responses')
+    args = parser.parse_args(argv)
+    
+    if args.record:
+        fixture = record_fixture(args.record, args.token, args.max_repos)
+        with open(args.output or f'{args.record}.json', 'w', encoding='utf-8') as f:
+            json.dump(fixture, f)
+        print(f"Recorded {len(fixture)} responses", file=sys.stderr)
+        return 0
+    
+    if not args.serve:
+        parser.error('one of --record or --serve is required')
+    
+    if args.serve.startswith('synthetic:'):
+        fixture = make_fixture(repo_count=int(args.serve.split(':', 1)[1]))
+    else:
+        with open(args.serve, encoding='utf-8') as f:
+            fixture = json.load(f)
+    
+    server = GitHubStubServer(fixture, args.latency_ms / 1000, args.jitter_ms / 1000, port=args.port,
+                              sigma=args.sigma, rate_limit=args.rate_limit, error_403=args.error_403,
+                              error_5xx=args.error_5xx).start()
+    print(f"Serving {len(fixture)} responses at {server.url} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Fail when importing the app gets slower than a startup budget
+
+Imports the app in fresh interpreters and compares the median import time
+with --budget-ms. It also checks that modules meant to load lazily
+(openai on the first transcription, httpx on the first async build) are
+not imported at startup, and it prints the slowest top-level imports from
+-X importtime. Exits 1 on a regression. tests/test_import_budget.py runs
+the same checks under pytest.
+
+Run from the project root:
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 300 --lazy openai --lazy flask_sqlalchemy
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the app must not import at startup
+DEFAULT_LAZY = ('openai', 'httpx')
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - started, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def measure(module: str, importtime: bool = False) -> Tuple[float, List[str], str]:
+    """Import module in a fresh interpreter; returns (seconds, loaded modules, -X importtime output)"""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', PROBE.format(module=module)]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    # The app may print warnings before the probe's JSON line
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report['seconds'], report['modules'], result.stderr
+
+
+def slowest_imports(importtime_output: str, module: str, limit: int = 10) -> List[Dict]:
+    """Direct imports of module by cumulative time, from -X importtime output"""
+    children: List[Dict] = []
+    pending: List[Dict] = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Children are listed before their parent, indented two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            pending.append({'module': name.strip(), 'ms': round(int(cumulative) / 1000, 1)})
+        elif depth == 0:
+            if name.strip() == module:
+                children = pending
+            pending = []
+    return sorted(children, key=lambda entry: -entry['ms'])[:limit]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Check the import-time budget of the app')
+    parser.add_argument('--module', default='app', help='Module to import')
+    parser.add_argument('--budget-ms', type=float, default=500.0, help='Maximum median import time')
+    parser.add_argument('--lazy', action='append',
+                        help=f"Module that must not be imported at startup (default: {', '.join(DEFAULT_LAZY)})")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+    lazy = args.lazy or list(DEFAULT_LAZY)
+    
+    # First run warms the bytecode cache
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    median_ms = statistics.median(seconds for seconds, _, _ in runs) * 1000
+    loaded = [name for name in lazy if name in runs[-1][1]]
+    _, _, importtime_output = measure(args.module, importtime=True)
+    
+    print(f"import {args.module}: median {median_ms:.1f} ms over {len(runs)} runs (budget {args.budget_ms:.0f} ms)")
+    for entry in slowest_imports(importtime_output, args.module):
+        print(f"  {entry['ms']:8.1f} ms  {entry['module']}")
+    
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"FAIL: import time exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: imported at startup but should load lazily: {', '.join(loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Load test POST /api/profile/generate against local GitHub and OpenAI mocks
+
+Starts benchmarks.github_stub (REST and GraphQL) and
+benchmarks.openai_stub.OpenAIStubServer with lognormal latency, a real
+rate-limit budget and optional 403/429/5xx injection, points
+Config.GITHUB_API_BASE_URL and Config.OPENAI_BASE_URL at them and serves
+the app from a threaded local server, so requests go through the real
+HTTP clients. Each concurrency level then sends --requests profile
+requests from that many client threads, cycling through --users synthetic
+accounts, and reports throughput, p50/p95/p99 latency and status codes.
+Caches are cold unless --warm.
+
+Run from the project root:
+    python -m benchmarks.load_test --concurrency 1,8,32 --requests 200
+    python -m benchmarks.load_test --backend graphql --error-403 0.01 --error-5xx 0.02 --output load.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from config import Config
+from benchmarks.bench_pipeline import _git_commit, configure
+from benchmarks.github_stub import GitHubStubServer, make_fixture
+from benchmarks.openai_stub import OpenAIStubServer
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(-(-p * len(ordered) // 100)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_level(base_url: str, usernames: List[str], concurrency: int, total: int, max_repos: int,
+              duration: Optional[float] = None, timeout: float = 120.0) -> Dict:
+    """Send total requests (or as many as fit in duration seconds) from concurrency threads"""
+    lock = threading.Lock()
+    issued = [0]
+    samples: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    deadline = time.perf_counter() + duration if duration else None
+    
+    def worker():
+        session = requests.Session()
+        while True:
+            with lock:
+                if (deadline is None and issued[0] >= total) or (deadline and time.perf_counter() >= deadline):
+                    break
+                username = usernames[issued[0] % len(usernames)]
+                issued[0] += 1
+            
+            started = time.perf_counter()
+            try:
+                response = session.post(f'{base_url}/api/profile/generate', timeout=timeout,
+                                        json={'github_username': username, 'max_repos': max_repos})
+                status = str(response.status_code)
+                error = None
+                if response.status_code != 200:
+                    try:
+                        message = str(response.json().get('error', ''))
+                    except ValueError:
+                        message = ''
+                    error = f'{status}: {message[:80]}'
+            except requests.exceptions.RequestException as e:
+                status, error = 'network', f'network: {type(e).__name__}'
+            elapsed = time.perf_counter() - started
+            
+            with lock:
+                samples.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+                if error:
+                    errors[error] = errors.get(error, 0) + 1
+    
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, name=f'load-{i}') for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'seconds': round(wall, 3),
+        'throughput_rps': round(len(samples) / wall, 3) if wall else 0.0,
+        'success_rps': round(statuses.get('200', 0) / wall, 3) if wall else 0.0,
+        'latency': {
+            'p50_ms': round(percentile(ms, 50), 3),
+            'p95_ms': round(percentile(ms, 95), 3),
+            'p99_ms': round(percentile(ms, 99), 3),
+            'mean_ms': round(statistics.mean(ms), 3) if ms else 0.0,
+            'max_ms': round(ms[-1], 3) if ms else 0.0
+        },
+        'statuses': statuses,
+        'errors': dict(sorted(errors.items(), key=lambda item: -item[1])[:10])
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load test profile generation against local GitHub/OpenAI mocks')
+    parser.add_argument('--concurrency', default='1,4,16', help='Comma-separated client thread counts')
+    parser.add_argument('--requests', type=int, default=100, help='Requests per concurrency level')
+    parser.add_argument('--duration', type=float, help='Seconds per level instead of a fixed request count')
+    parser.add_argument('--users', type=int, default=50, help='Distinct synthetic accounts to cycle through')
+    parser.add_argument('--repos', type=int, default=30, help='Repositories per account')
+    parser.add_argument('--max-repos', type=int, default=10, help='max_repos per request')
+    parser.add_argument('--backend', choices=['rest', 'graphql'], default='rest')
+    parser.add_argument('--github-latency-ms', type=float, default=60.0, help='Median GitHub latency')
+    parser.add_argument('--github-sigma', type=float, default=0.5, help='Lognormal spread of GitHub latency (0: fixed)')
+    parser.add_argument('--rate-limit', type=int, default=100000, help='Mock GitHub requests per hour per resource')
+    parser.add_argument('--error-403', type=float, default=0.0, help='Fraction of GitHub secondary-rate-limit 403s')
+    parser.add_argument('--error-5xx', type=float, default=0.0, help='Fraction of GitHub 502/503 responses')
+    parser.add_argument('--openai-latency-ms', type=float, default=800.0, help='Median OpenAI time to first token')
+    parser.add_argument('--openai-sigma', type=float, default=0.3)
+    parser.add_argument('--openai-error-429', type=float, default=0.0)
+    parser.add_argument('--openai-error-5xx', type=float, default=0.0)
+    parser.add_argument('--warm', action='store_true', help='Keep response/profile/completion caches enabled')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write JSON results here')
+    args = parser.parse_args(argv)
+    
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    usernames = [f'load-{i}' for i in range(max(1, args.users))]
+    fixture = {}
+    for i, username in enumerate(usernames):
+        fixture.update(make_fixture(username, args.repos, seed=args.seed + i))
+    
+    github = GitHubStubServer(fixture, args.github_latency_ms / 1000, sigma=args.github_sigma,
+                              rate_limit=args.rate_limit, error_403=args.error_403, error_5xx=args.error_5xx,
+                              seed=args.seed).start()
+    openai_server = OpenAIStubServer(args.openai_latency_ms / 1000, sigma=args.openai_sigma,
+                                     error_429=args.openai_error_429, error_5xx=args.openai_error_5xx,
+                                     seed=args.seed).start()
+    database = tempfile.TemporaryDirectory(prefix='profile-load-')
+    configure(github.url, f"sqlite:///{os.path.join(database.name, 'load.db')}", args.warm)
+    Config.GITHUB_FETCH_BACKEND = args.backend
+    if args.backend == 'graphql':
+        # GraphQL needs a token; the mock accepts any
+        Config.GITHUB_TOKEN = 'mock-token'
+    Config.OPENAI_BASE_URL = f'{openai_server.url}/v1'
+    Config.OPENAI_API_KEY = 'mock-key'
+    
+    from werkzeug.serving import make_server
+    import app
+    # One access log line per request would drown the report
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='load-app', daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': args.backend,
+            'users': len(usernames),
+            'repos': args.repos,
+            'max_repos': args.max_repos,
+            'github_latency_ms': args.github_latency_ms,
+            'github_sigma': args.github_sigma,
+            'rate_limit': args.rate_limit,
+            'error_403': args.error_403,
+            'error_5xx': args.error_5xx,
+            'openai_latency_ms': args.openai_latency_ms,
+            'openai_sigma': args.openai_sigma,
+            'warm': args.warm,
+            'max_workers': Config.GITHUB_MAX_WORKERS
+        },
+        'levels': []
+    }
+    
+    print(f"{'conc':>5s} {'reqs':>6s} {'rps':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}  statuses",
+          file=sys.stderr)
+    try:
+        for concurrency in levels:
+            before = (github.request_count, openai_server.calls)
+            level = run_level(base_url, usernames, concurrency, args.requests, args.max_repos, args.duration)
+            level['github_requests'] = github.request_count - before[0]
+            level['openai_calls'] = openai_server.calls - before[1]
+            results['levels'].append(level)
+            latency = level['latency']
+            print(f"{concurrency:5d} {level['requests']:6d} {level['throughput_rps']:8.2f} {latency['p50_ms']:9.1f} "
+                  f"{latency['p95_ms']:9.1f} {latency['p99_ms']:9.1f}  {level['statuses']}", file=sys.stderr)
+    finally:
+        server.shutdown()
+        github.stop()
+        openai_server.stop()
+    results['meta']['github_injected'] = github.injected
+    results['meta']['openai_injected'] = openai_server.injected
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    
+    database.cleanup()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Stand-ins for OpenAI so benchmarks measure this code, not the network
+
+install() swaps profile_generator.OpenAI for StubOpenAI. Chat completions
+sleep for a fixed latency and return a canned transcription, split into
+token-sized deltas when stream=True.
+
+OpenAIStubServer serves the same reply over HTTP at /v1/chat/completions
+(JSON, or server-sent events when stream=true) for tests that keep the
+real client: point Config.OPENAI_BASE_URL at its url + '/v1'.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+TRANSCRIPTION = (
+    "Hi, I'm a software developer who enjoys turning ideas into reliable products. "
+    "Over the years I've built web applications, APIs and developer tools, and I care "
+    "about clean code, good tests and clear communication. I'd love to help with your next project."
+)
+
+
+class _Completions:
+    def __init__(self, latency: float, tokens_per_second: float):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.calls = 0
+    
+    def create(self, stream: bool = False, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        words = TRANSCRIPTION.split(' ')
+        usage = SimpleNamespace(prompt_tokens=250, completion_tokens=len(words))
+        
+        if not stream:
+            message = SimpleNamespace(content=TRANSCRIPTION)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+        
+        def chunks():
+            for i, word in enumerate(words):
+                if self.tokens_per_second:
+                    time.sleep(1 / self.tokens_per_second)
+                delta = SimpleNamespace(content=word if i == 0 else f' {word}')
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+            yield SimpleNamespace(choices=[], usage=usage)
+        return chunks()
+
+
+class StubOpenAI:
+    """Mimics the OpenAI(api_key=...).chat.completions.create surface used by ProfileGenerator"""
+    
+    # Shared by every client instance so callers can count calls
+    completions: Optional[_Completions] = None
+    
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        self.chat = SimpleNamespace(completions=StubOpenAI.completions)
+
+
+def install(latency: float = 0.3, tokens_per_second: float = 0.0) -> _Completions:
+    """Route the shared OpenAI client to the stub; returns the shared completions (for call counts)"""
+    from config import Config
+    from profile_helper import profile_generator
+    
+    StubOpenAI.completions = _Completions(latency, tokens_per_second)
+    profile_generator.OpenAI = StubOpenAI
+    profile_generator.OPENAI_AVAILABLE = True
+    Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or 'stub-key'
+    return StubOpenAI.completions
+
+
+class OpenAIStubServer:
+    """Threaded HTTP mock of the chat completions endpoint
+    
+    Replies wait latency seconds, drawn from a lognormal distribution with
+    that median when sigma > 0, then stream at tokens_per_second.
+    error_429 and error_5xx are the fractions of requests answered with an
+    injected 429 (Retry-After: 1) or 500/503, which the client retries.
+    """
+    
+    def __init__(self, latency: float = 0.3, sigma: float = 0.0, tokens_per_second: float = 0.0,
+                 error_429: float = 0.0, error_5xx: float = 0.0, host: str = '127.0.0.1', port: int = 0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.sigma = sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.calls = 0
+        self.injected = {'429': 0, '5xx': 0}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self.url = f'http://{host}:{self._server.server_address[1]}'
+    
+    def _admit(self) -> Optional[int]:
+        """Count and delay one request; returns an injected error status or None"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * (self._rng.lognormvariate(0, self.sigma) if self.sigma else 1)
+            roll = self._rng.random()
+            status = None
+            if roll < self.error_429:
+                status = 429
+                self.injected['429'] += 1
+            elif roll < self.error_429 + self.error_5xx:
+                status = self._rng.choice((500, 503))
+                self.injected['5xx'] += 1
+        
+        time.sleep(delay)
+        return status
+    
+    def _handler_class(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+                    return
+                
+                status = stub._admit()
+                if status == 429:
+                    self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'requests',
+                                                    'code': 'rate_limit_exceeded'}}, {'Retry-After': '1'})
+                    return
+                if status is not None:
+                    self._send_json(status, {'error': {'message': 'The server had an error', 'type': 'server_error'}})
+                    return
+                
+                words = TRANSCRIPTION.split(' ')
+                usage = {'prompt_tokens': 250, 'completion_tokens': len(words), 'total_tokens': 250 + len(words)}
+                reply = {'id': 'chatcmpl-stub', 'created': int(time.time()), 'model': request.get('model', 'stub')}
+                if not request.get('stream'):
+                    self._send_json(200, {
+                        **reply, 'object': 'chat.completion', 'usage': usage,
+                        'choices': [{'index': 0, 'finish_reason': 'stop',
+                                     'message': {'role': 'assistant', 'content': TRANSCRIPTION}}]
+                    })
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                
+                def event(choices, **extra):
+                    chunk = {**reply, 'object': 'chat.completion.chunk', 'choices': choices, **extra}
+                    self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+                    self.wfile.flush()
+                
+                for i, word in enumerate(words):
+                    if stub.tokens_per_second:
+                        time.sleep(1 / stub.tokens_per_second)
+                    event([{'index': 0, 'finish_reason': None,
+                            'delta': {'content': word if i == 0 else f' {word}'}}])
+                event([{'index': 0, 'finish_reason': 'stop', 'delta': {}}])
+                if (request.get('stream_options') or {}).get('include_usage'):
+                    event([], usage=usage)
+                self.wfile.write(b'data: [DONE]\n\n')
+            
+            def _send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+        
+        return Handler
+    
+    def start(self) -> 'OpenAIStubServer':
+        threading.Thread(target=self._server.serve_forever, name='openai-stub', daemon=True).start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -5,9 +5,10 @@ from dotenv import load_dotenv
 # 1. user_config.env (user's actual keys)
 # 2. my_config.env (user's custom config)
 # 3. config.env (fallback with placeholder values)
-load_dotenv('user_config.env')
-load_dotenv('my_config.env')
-load_dotenv('config.env')  # Fallback with placeholder values
+# Missing files are skipped without being opened
+for env_file in ('user_config.env', 'my_config.env', 'config.env'):
+    if os.path.isfile(env_file):
+        load_dotenv(env_file)
 
 class Config:
     """Configuration settings for the Upwork Assistant"""
@@ -18,15 +19,60 @@ class Config:
     
     # GitHub API settings
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-    GITHUB_API_BASE_URL = 'https://api.github.com'
+    # Extra service tokens (comma-separated) rotated by remaining budget alongside GITHUB_TOKEN
+    GITHUB_TOKENS = [token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()]
+    GITHUB_API_BASE_URL = os.getenv('GITHUB_API_BASE_URL', 'https://api.github.com')
+    GITHUB_GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', f'{GITHUB_API_BASE_URL}/graphql')
+    GITHUB_FETCH_BACKEND = os.getenv('GITHUB_FETCH_BACKEND', 'rest').lower()  # 'rest' or 'graphql'
+    GITHUB_PAGE_SIZE = min(100, int(os.getenv('GITHUB_PAGE_SIZE', '100')))  # Repos per list page (GitHub caps at 100)
+    GITHUB_MAX_WORKERS = int(os.getenv('GITHUB_MAX_WORKERS', '8'))  # Concurrent repo detail fetches
+    GITHUB_POOL_CONNECTIONS = int(os.getenv('GITHUB_POOL_CONNECTIONS', '4'))  # Distinct hosts kept pooled
+    GITHUB_POOL_SIZE = int(os.getenv('GITHUB_POOL_SIZE', '16'))  # Keep-alive connections per host
+    GITHUB_POOL_TIMEOUT = float(os.getenv('GITHUB_POOL_TIMEOUT', '10'))  # Seconds to wait for a free pooled connection
+    GITHUB_CONNECT_TIMEOUT = float(os.getenv('GITHUB_CONNECT_TIMEOUT', '5'))
+    GITHUB_READ_TIMEOUT = float(os.getenv('GITHUB_READ_TIMEOUT', '20'))
+    GITHUB_RATE_LIMIT_PACING_THRESHOLD = int(os.getenv('GITHUB_RATE_LIMIT_PACING_THRESHOLD', '500'))  # Pace below this budget
+    GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv('GITHUB_RATE_LIMIT_MAX_WAIT', '10'))  # Longest pacing sleep per request
+    GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE = float(os.getenv('GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE', '60'))  # Older budgets are re-checked live
+    GITHUB_CACHE_ENABLED = os.getenv('GITHUB_CACHE_ENABLED', 'True').lower() == 'true'  # ETag cache in DATABASE_URL
+    GITHUB_CACHE_MAX_BYTES = int(os.getenv('GITHUB_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+    REPO_STORE_ENABLED = os.getenv('REPO_STORE_ENABLED', 'True').lower() == 'true'  # Incremental repo sync in DATABASE_URL
+    REPO_STORE_MAX_AGE = float(os.getenv('REPO_STORE_MAX_AGE', str(7 * 24 * 3600)))  # Refetch stored details and relist stored repo lists older than this
     
     # OpenAI API settings
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')  # OpenAI-compatible endpoint (proxy or local mock); None uses api.openai.com
+    OPENAI_CACHE_ENABLED = os.getenv('OPENAI_CACHE_ENABLED', 'True').lower() == 'true'  # Completion cache in DATABASE_URL
+    OPENAI_CACHE_TTL = float(os.getenv('OPENAI_CACHE_TTL', str(30 * 24 * 3600)))  # Seconds a cached transcription is reused
+    OPENAI_CACHE_MAX_BYTES = int(os.getenv('OPENAI_CACHE_MAX_BYTES', str(5 * 1024 * 1024)))
+    OPENAI_CACHE_ONLY = os.getenv('OPENAI_CACHE_ONLY', 'False').lower() == 'true'  # Never call OpenAI; fail on cache misses
     
     # Application settings
     MAX_REPOS_TO_FETCH = int(os.getenv('MAX_REPOS_TO_FETCH', '10'))
     MAX_PROPOSAL_LENGTH = int(os.getenv('MAX_PROPOSAL_LENGTH', '2000'))
+    REPO_SCORING_POLICY = os.getenv('REPO_SCORING_POLICY', 'balanced')  # 'balanced', 'stars' or 'recent'
+    REPO_CANDIDATE_POOL = int(os.getenv('REPO_CANDIDATE_POOL', '30'))  # Repos ranked from list metadata per request
+    REPO_DETAIL_LIMIT = int(os.getenv('REPO_DETAIL_LIMIT', '5'))  # Top repos that also get README calls (and README skill extraction); all get languages (0 = all)
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '4'))  # Profiles built in parallel per batch
+    BATCH_MAX_USERS = int(os.getenv('BATCH_MAX_USERS', '100'))  # Usernames accepted per /api/profile/batch request
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))  # Background profile jobs run in parallel
+    JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', '50'))  # Waiting jobs before submissions get 503
+    JOB_RETENTION = float(os.getenv('JOB_RETENTION', str(24 * 3600)))  # Seconds finished jobs stay pollable
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', '10'))  # Seconds between owner heartbeats on active jobs
+    JOB_STALE_AFTER = float(os.getenv('JOB_STALE_AFTER', '60'))  # Heartbeat age after which another process takes a job over
+    KEYWORDS_FILE = os.getenv('KEYWORDS_FILE')  # Technology/project-type keywords JSON (default: profile_helper/data/keywords.json)
+    README_MAX_BYTES = int(os.getenv('README_MAX_BYTES', str(64 * 1024)))  # README bytes downloaded per repo
+    README_SKILL_EXTRACTION = os.getenv('README_SKILL_EXTRACTION', 'True').lower() == 'true'  # Scan README code/badges for technologies
     
-    # Database settings (for future use)
+    # Generated profile cache (PROFILE_CACHE_TTL=0 disables it)
+    PROFILE_CACHE_TTL = float(os.getenv('PROFILE_CACHE_TTL', '600'))  # Seconds an entry is fresh
+    PROFILE_CACHE_GRACE = float(os.getenv('PROFILE_CACHE_GRACE', '3600'))  # Extra seconds served stale while refreshing
+    PROFILE_CACHE_MAX_ENTRIES = int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', '256'))
+    PROFILE_CACHE_MAX_BYTES = int(os.getenv('PROFILE_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    
+    # Instrumentation: Prometheus /metrics and Server-Timing headers on /api/ calls
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    
+    # Database settings (SQLite backs the GitHub response cache)
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///upwork_assistant.db') 
\ No newline at end of file
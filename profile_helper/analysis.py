@@ -0,0 +1,185 @@
+import heapq
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Set, Tuple, Union
+from config import Config
+from .keyword_matcher import KEYWORDS
+from .records import RepoRecord, to_repo_records
+
+# Number of projects kept in analysis['top_projects']
+TOP_PROJECTS = 5
+RECENT_PROJECT_DAYS = 180
+
+
+def match_repo_keywords(repo: RepoRecord) -> Tuple[Set[str], str]:
+    """Scan a repository once for technologies and its project type"""
+    readme = repo.readme_content if Config.README_SKILL_EXTRACTION else None
+    return KEYWORDS.match(repo.name, repo.description, repo.topics, readme)
+
+
+class _RepoContribution:
+    """What one repository adds to the aggregate, kept so it can be subtracted again"""
+    
+    __slots__ = ('repo', 'seq', 'languages', 'technologies', 'project_type')
+    
+    def __init__(self, repo: RepoRecord, seq: int):
+        self.repo = repo
+        self.seq = seq
+        
+        # Primary language counts once, detailed languages add their byte counts
+        languages: Dict[str, int] = {}
+        if repo.language:
+            languages[repo.language] = 1
+        for lang, amount in repo.languages:
+            languages[lang] = languages.get(lang, 0) + amount
+        self.languages = languages
+        
+        self.technologies, self.project_type = match_repo_keywords(repo)
+    
+    def rebased(self, seq: int) -> '_RepoContribution':
+        """Copy with a new insertion sequence number (keyword matching is not repeated)"""
+        copy = _RepoContribution.__new__(_RepoContribution)
+        for name in self.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.seq = seq
+        return copy
+
+
+class AnalysisAccumulator:
+    """Incrementally maintained repository analysis
+    
+    add(), remove() and merge() update running totals in O(1) per repository
+    (plus keyword matching on add), so refreshing a profile after one repo
+    changes does not re-walk the others. Repositories are identified by
+    full_name; adding one that is already present replaces it. result()
+    returns the same dict as GitHubFetcher.analyze_repos().
+    """
+    
+    def __init__(self, top_k: int = TOP_PROJECTS):
+        self.top_k = top_k
+        self._entries: Dict[str, _RepoContribution] = {}
+        self._seq = 0
+        self._languages: Dict[str, int] = {}
+        self._technologies: Counter = Counter()
+        self._total_stars = 0
+        self._total_forks = 0
+        self._total_size = 0
+        # (stars, -seq, key) min-heap of the top_k most starred; earlier repos win ties
+        self._top: List[Tuple[int, int, str]] = []
+        # Set when a top repo is removed; the heap is rebuilt on the next result()
+        self._top_stale = False
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _key(repo: Union[RepoRecord, str]) -> str:
+        return repo if isinstance(repo, str) else repo.full_name
+    
+    def add(self, repo: RepoRecord) -> 'AnalysisAccumulator':
+        """Add a repository, replacing an earlier version of it"""
+        self._add_contribution(self._key(repo), _RepoContribution(repo, self._seq))
+        return self
+    
+    def remove(self, repo: Union[RepoRecord, str]) -> bool:
+        """Remove a repository (dict or full_name); returns False when it was not present"""
+        key = self._key(repo)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        
+        for lang, amount in entry.languages.items():
+            remaining = self._languages[lang] - amount
+            if remaining:
+                self._languages[lang] = remaining
+            else:
+                del self._languages[lang]
+        
+        self._technologies.subtract(entry.technologies)
+        for tech in entry.technologies:
+            if self._technologies[tech] <= 0:
+                del self._technologies[tech]
+        
+        self._total_stars -= entry.repo.stars
+        self._total_forks -= entry.repo.forks
+        self._total_size -= entry.repo.size
+        
+        if any(top_key == key for _, _, top_key in self._top):
+            self._top_stale = True
+        return True
+    
+    def merge(self, other: 'AnalysisAccumulator') -> 'AnalysisAccumulator':
+        """Add every repository of another accumulator (e.g. another shard) without re-matching"""
+        for key, entry in other._entries.items():
+            self._add_contribution(key, entry.rebased(self._seq))
+        return self
+    
+    def _add_contribution(self, key: str, entry: _RepoContribution):
+        if key in self._entries:
+            self.remove(key)
+        self._entries[key] = entry
+        self._seq += 1
+        
+        for lang, amount in entry.languages.items():
+            self._languages[lang] = self._languages.get(lang, 0) + amount
+        # Sorted so the technologies list has the same order under any hash seed
+        self._technologies.update(sorted(entry.technologies))
+        self._total_stars += entry.repo.stars
+        self._total_forks += entry.repo.forks
+        self._total_size += entry.repo.size
+        
+        if self._top_stale:
+            return
+        item = (entry.repo.stars, -entry.seq, key)
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, item)
+        elif item[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, item)
+    
+    def _top_projects(self) -> List[RepoRecord]:
+        if self._top_stale:
+            self._top = heapq.nlargest(
+                self.top_k, ((entry.repo.stars, -entry.seq, key) for key, entry in self._entries.items())
+            )
+            heapq.heapify(self._top)
+            self._top_stale = False
+        
+        ordered = sorted(self._top, key=lambda item: item[:2], reverse=True)
+        return [self._entries[key].repo for _, _, key in ordered]
+    
+    def result(self) -> Dict:
+        """Build the analysis dict (same keys and values as analyze_repos)"""
+        analysis = {
+            'languages': dict(self._languages),
+            'technologies': set(),
+            'project_types': [],
+            'total_stars': self._total_stars,
+            'total_forks': self._total_forks,
+            'avg_repo_size': 0,
+            'recent_projects': [],
+            'top_projects': []
+        }
+        if not self._entries:
+            return analysis
+        
+        cutoff = datetime.now(timezone.utc) - timedelta(days=RECENT_PROJECT_DAYS)
+        for entry in self._entries.values():
+            if entry.project_type:
+                analysis['project_types'].append(entry.project_type)
+            if entry.repo.updated_at is not None and entry.repo.updated_at > cutoff:
+                analysis['recent_projects'].append(entry.repo)
+        
+        analysis['avg_repo_size'] = self._total_size / len(self._entries)
+        analysis['top_projects'] = self._top_projects()
+        
+        # List for JSON serialization
+        analysis['technologies'] = list(self._technologies)
+        return analysis
+    
+    @classmethod
+    def from_repos(cls, repos: Iterable[RepoRecord]) -> 'AnalysisAccumulator':
+        """Build an accumulator from a list or stream of repositories (records or legacy dicts)"""
+        accumulator = cls()
+        for repo in to_repo_records(repos):
+            accumulator.add(repo)
+        return accumulator
@@ -0,0 +1,319 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Awaitable, Dict, List, Mapping, Optional, Tuple, Union
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+from config import Config
+from . import metrics
+from .github_fetcher import GitHubFetcher, README_MEDIA_TYPE
+from .records import RepoRecord, UserRecord
+from .response_cache import get_response_cache
+from .rate_limiter import GitHubRateLimitError, get_rate_limiter
+from .repo_ranking import ScoringPolicy, rank_repos, selection_stats
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    print("Warning: httpx package not installed. Install with: pip install httpx")
+
+# One event loop per process runs every async fetch, so all of them share one
+# httpx connection pool regardless of which thread or request started them
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional['httpx.AsyncClient'] = None
+_loop_lock = threading.Lock()
+
+
+def get_shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop used for async GitHub traffic"""
+    global _loop
+    
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='github-async-loop', daemon=True)
+                thread.start()
+                _loop = loop
+    
+    return _loop
+
+
+def run_on_shared_loop(coro: Awaitable) -> Any:
+    """Run a coroutine on the shared loop and block until it finishes"""
+    return asyncio.run_coroutine_threadsafe(coro, get_shared_loop()).result()
+
+
+async def await_on_shared_loop(coro: Awaitable) -> Any:
+    """Await a coroutine on the shared loop from any other event loop"""
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_shared_loop()))
+
+
+def _next_link(headers: Mapping[str, str]) -> Optional[str]:
+    """Return the rel="next" URL from a Link header, if any"""
+    for link in parse_header_links(headers.get('Link', '')):
+        if link.get('rel') == 'next':
+            return link.get('url')
+    return None
+
+
+def _get_async_client() -> 'httpx.AsyncClient':
+    """Return the pooled httpx client (must be called on the shared loop)"""
+    global _client
+    
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.GITHUB_POOL_SIZE,
+                max_keepalive_connections=Config.GITHUB_POOL_SIZE
+            ),
+            timeout=httpx.Timeout(Config.GITHUB_READ_TIMEOUT, connect=Config.GITHUB_CONNECT_TIMEOUT)
+        )
+    
+    return _client
+
+
+class AsyncGitHubFetcher:
+    """asyncio counterpart of GitHubFetcher with the same public methods
+    
+    Coroutines must run on the shared loop (see await_on_shared_loop). Token
+    rotation, rate limiting, the response cache and the output dict shapes
+    are shared with GitHubFetcher.
+    """
+    
+    def __init__(self, github_token: Optional[str] = None):
+        if not HTTPX_AVAILABLE:
+            raise Exception("httpx package not installed. Install with: pip install httpx")
+        
+        # The sync fetcher supplies token selection, formatting and analysis
+        self._fetcher = GitHubFetcher(github_token)
+        self.token = self._fetcher.token
+        self.token_pool = self._fetcher.token_pool
+        self.base_url = self._fetcher.base_url
+        self.headers = self._fetcher.headers
+        # Created on first use so it binds to the loop the fetcher runs on
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.last_selection: Optional[Dict] = None
+    
+    async def _make_request(self, url: str, params: Dict = None, accept: Optional[str] = None,
+                            max_bytes: Optional[int] = None) -> Tuple[int, Any, Mapping[str, str]]:
+        """Make a rate-limited GET and return (status, parsed JSON or raw bytes with accept, headers)"""
+        tried = []
+        
+        while True:
+            token = self._fetcher._select_token(tried)
+            rotating = token is not None and not self.token
+            
+            try:
+                status, data, headers = await self._send_request(url, params, token, accept, max_bytes)
+            except GitHubRateLimitError:
+                tried.append(token)
+                if not rotating or self.token_pool.choose(exclude=tried) is None:
+                    raise
+                continue
+            
+            if status == 401 and rotating:
+                self.token_pool.mark_invalid(token)
+                tried.append(token)
+                if self.token_pool.choose(exclude=tried) is not None:
+                    continue
+            
+            return status, data, headers
+    
+    async def _send_request(self, url: str, params: Optional[Dict], token: Optional[str], accept: Optional[str] = None,
+                            max_bytes: Optional[int] = None, revalidate: bool = True) -> Tuple[int, Any, Mapping[str, str]]:
+        """Send one GET with the given token through the cache and rate limiter"""
+        cache = get_response_cache()
+        headers = dict(self.headers)
+        if token:
+            headers['Authorization'] = f'token {token}'
+        if accept:
+            headers['Accept'] = accept
+        
+        cache_key = None
+        conditional = {}
+        if cache is not None:
+            scope = token if self.token else ('service' if token else None)
+            key_params = dict(params or {})
+            if accept:
+                key_params.update({'_accept': accept, '_max_bytes': max_bytes})
+            cache_key = cache.make_key(url, key_params or None, scope)
+            conditional = cache.conditional_headers(cache_key) if revalidate else {}
+            headers.update(conditional)
+        
+        limiter = get_rate_limiter()
+        wait = limiter.reserve(token)
+        if wait > 0:
+            await asyncio.sleep(wait)
+            metrics.record_rate_limit_wait(wait, self._fetcher._timings)
+        
+        started = time.perf_counter()
+        try:
+            if max_bytes is None:
+                response = await _get_async_client().get(url, headers=headers, params=params)
+                body = response.content
+            else:
+                # Stop downloading at the cap instead of buffering the whole body
+                async with _get_async_client().stream('GET', url, headers=headers, params=params) as response:
+                    buffer = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        buffer.extend(chunk)
+                        if len(buffer) >= max_bytes:
+                            break
+                    body = bytes(buffer[:max_bytes])
+        except httpx.HTTPError as e:
+            limiter.release(token)
+            raise Exception(f"Network error: {str(e)}")
+        metrics.record_github_request(
+            url, response.status_code, len(body), time.perf_counter() - started, self._fetcher._timings
+        )
+        
+        rate_limit_error = limiter.update(token, response.headers, response.status_code,
+                                          body if response.status_code in (403, 429) else b'')
+        if rate_limit_error is not None:
+            raise rate_limit_error
+        
+        status, response_headers = response.status_code, response.headers
+        if cache is not None:
+            status, response_headers, body = cache.handle_raw(
+                cache_key, url, status, response_headers, body, bool(conditional)
+            )
+            if status == 304 and conditional:
+                # The entry was evicted after conditional_headers(); fetch the body once more
+                return await self._send_request(url, params, token, accept, max_bytes, revalidate=False)
+        
+        if accept:
+            data = body if status == 200 else None
+        else:
+            data = json.loads(body) if status == 200 and body else None
+        return status, data, CaseInsensitiveDict(response_headers)
+    
+    async def get_user_info(self, username: str) -> UserRecord:
+        """Get basic user information"""
+        try:
+            status, data, _ = await self._make_request(f"{self.base_url}/users/{username}")
+            if status != 200:
+                raise Exception(f"{status} Error for user '{username}'")
+            return UserRecord.from_github(data)
+        
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to fetch user information: {str(e)}")
+    
+    async def _list_user_repos(self, username: str, max_repos: int) -> List[Dict]:
+        """Collect the user's own non-fork repositories, following Link pages lazily"""
+        if self.token:
+            url = f"{self.base_url}/user/repos"
+        else:
+            url = f"{self.base_url}/users/{username}/repos"
+        params = {
+            'sort': 'updated',
+            'per_page': min(Config.GITHUB_PAGE_SIZE, max_repos * 2),
+            'type': 'owner'
+        }
+        
+        selected = []
+        while url and len(selected) < max_repos:
+            status, page, headers = await self._make_request(url, params)
+            if status != 200:
+                raise Exception(f"{status} Error listing repositories for '{username}'")
+            
+            for repo in page:
+                if self.token and repo['owner']['login'] != username:
+                    continue
+                if not repo.get('fork', False):
+                    selected.append(repo)
+                    if len(selected) >= max_repos:
+                        break
+            
+            url = _next_link(headers)
+            params = None
+        
+        return selected
+    
+    async def get_user_repos(self, username: str, max_repos: int = 10, include_readme: bool = True,
+                             scoring_policy: Union[str, ScoringPolicy, None] = None) -> List[RepoRecord]:
+        """Fetch user repositories best scored first, fetching README and languages concurrently
+        
+        Only the top REPO_DETAIL_LIMIT get README requests; all get languages.
+        """
+        try:
+            candidates = await self._list_user_repos(username, max(max_repos, Config.REPO_CANDIDATE_POOL))
+            detailed, languages_only = rank_repos(candidates, max_repos, Config.REPO_DETAIL_LIMIT, scoring_policy)
+            self.last_selection = selection_stats(len(candidates), len(detailed), len(languages_only), include_readme)
+            
+            return list(await asyncio.gather(
+                *(self._get_repo_details(repo, include_readme) for repo in detailed),
+                *(self._get_repo_details(repo, False) for repo in languages_only)
+            ))
+        
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to fetch GitHub repositories: {str(e)}")
+    
+    async def _get_repo_details(self, repo: Dict, include_readme: bool = True) -> RepoRecord:
+        """Get detailed information about a repository (bounded by the semaphore)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, Config.GITHUB_MAX_WORKERS))
+        
+        async with self._semaphore:
+            try:
+                owner, name = repo['owner']['login'], repo['name']
+                if include_readme:
+                    readme_content, languages = await asyncio.gather(
+                        self._get_readme_content(owner, name),
+                        self._get_repo_languages(owner, name)
+                    )
+                else:
+                    readme_content, languages = '', await self._get_repo_languages(owner, name)
+                return RepoRecord.from_github(repo, languages, readme_content)
+            
+            except GitHubRateLimitError:
+                raise
+            except Exception:
+                return RepoRecord.from_github(repo)
+    
+    async def _get_readme_content(self, owner: str, repo: str) -> str:
+        """Get README content from repository (raw text, capped at README_MAX_BYTES)"""
+        try:
+            status, data, _ = await self._make_request(
+                f"{self.base_url}/repos/{owner}/{repo}/readme",
+                accept=README_MEDIA_TYPE, max_bytes=Config.README_MAX_BYTES
+            )
+            if status == 200:
+                return data.decode('utf-8', errors='ignore')
+            return ""
+        
+        except GitHubRateLimitError:
+            raise
+        except Exception:
+            return ""
+    
+    async def _get_repo_languages(self, owner: str, repo: str) -> Dict[str, int]:
+        """Get programming languages used in repository"""
+        try:
+            status, data, _ = await self._make_request(f"{self.base_url}/repos/{owner}/{repo}/languages")
+            return data if status == 200 else {}
+        
+        except GitHubRateLimitError:
+            raise
+        except Exception:
+            return {}
+    
+    async def get_user_info_and_repos(self, username: str, max_repos: int = 10,
+                                      include_readme: bool = True) -> Tuple[UserRecord, List[RepoRecord]]:
+        """Fetch user info and repositories concurrently"""
+        user_info, repos = await asyncio.gather(
+            self.get_user_info(username),
+            self.get_user_repos(username, max_repos, include_readme)
+        )
+        return user_info, repos
+    
+    def analyze_repos(self, repos: List[RepoRecord]) -> Dict:
+        """Analyze repositories to extract skills and patterns (CPU only, no I/O)"""
+        return self._fetcher.analyze_repos(repos)
@@ -0,0 +1,152 @@
+"""Batch profile generation shared by /api/profile/batch and the command line
+
+Run from the project root:
+    python -m profile_helper.batch alice bob --file team.txt --output profiles.jsonl
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional
+from config import Config
+from .profile_service import NO_REPOS_ERROR, generate_cached_profile
+from .rate_limiter import GitHubRateLimitError
+
+
+def normalize_usernames(usernames: Iterable[str]) -> List[str]:
+    """Strip blanks and '#' comments and drop case-insensitive duplicates, keeping order"""
+    seen = set()
+    result = []
+    for username in usernames:
+        username = (username or '').split('#', 1)[0].strip()
+        if username and username.lower() not in seen:
+            seen.add(username.lower())
+            result.append(username)
+    return result
+
+
+class _RateLimitGate:
+    """Remembers the first rate-limit error so queued users fail fast instead of spending budget"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.error: Optional[GitHubRateLimitError] = None
+    
+    def trip(self, error: GitHubRateLimitError):
+        with self._lock:
+            if self.error is None or error.reset_time > self.error.reset_time:
+                self.error = error
+    
+    def check(self):
+        """Raise the remembered error until its reset time has passed"""
+        with self._lock:
+            error = self.error
+            if error is not None and time.time() >= error.reset_time:
+                self.error = error = None
+        if error is not None:
+            raise error
+
+
+def _build_one(username: str, gate: _RateLimitGate, max_repos: int, include_readme: bool,
+               force_refresh: bool) -> Dict:
+    """Build one profile and turn its outcome into a result line"""
+    started = time.time()
+    try:
+        gate.check()
+        body, cache_info = generate_cached_profile(username, None, max_repos, include_readme, force_refresh)
+        if body is None:
+            result = {'success': False, 'status': 404, 'error': NO_REPOS_ERROR}
+        else:
+            result = {**body, 'status': 200, 'cache': cache_info}
+    
+    except GitHubRateLimitError as e:
+        gate.trip(e)
+        result = {'success': False, 'status': 429, 'error': str(e), 'reset_time': int(e.reset_time)}
+    except Exception as e:
+        result = {'success': False, 'status': 500, 'error': str(e)}
+    
+    return {'username': username, **result, 'elapsed_seconds': round(time.time() - started, 3)}
+
+
+def iter_batch_profiles(usernames: Iterable[str], max_repos: Optional[int] = None, include_readme: bool = True,
+                        force_refresh: bool = False, max_workers: Optional[int] = None) -> Iterator[Dict]:
+    """Build profiles on a worker pool and yield one result dict per user as each completes
+    
+    Batches only use the configured service tokens: a caller token lists
+    /user/repos, which holds that caller's repositories only, so every
+    other user in the batch would come back empty.
+    
+    Workers share the process-wide rate limiter, token pool, response cache
+    and profile cache. Once GitHub reports the budget exhausted, users that
+    have not started yet are reported as 429 without making requests. Closing
+    the iterator early cancels users that have not started.
+    """
+    usernames = normalize_usernames(usernames)
+    max_repos = max_repos if max_repos is not None else Config.MAX_REPOS_TO_FETCH
+    max_workers = max(1, min(max_workers or Config.BATCH_MAX_WORKERS, len(usernames) or 1))
+    gate = _RateLimitGate()
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='profile-batch')
+    try:
+        futures = [
+            executor.submit(_build_one, username, gate, max_repos, include_readme, force_refresh)
+            for username in usernames
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def batch_summary(results: List[Dict]) -> Dict:
+    """Counts for the trailing summary line"""
+    succeeded = sum(1 for result in results if result.get('success'))
+    return {'summary': {'total': len(results), 'succeeded': succeeded, 'failed': len(results) - succeeded}}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; writes one JSON line per user, then a summary line"""
+    parser = argparse.ArgumentParser(description='Generate profiles for several GitHub users as JSON Lines')
+    parser.add_argument('usernames', nargs='*', help='GitHub usernames')
+    parser.add_argument('--file', help="File with one username per line ('-' for stdin)")
+    parser.add_argument('--output', help='Write JSON Lines here instead of stdout')
+    parser.add_argument('--max-repos', type=int, default=Config.MAX_REPOS_TO_FETCH)
+    parser.add_argument('--workers', type=int, default=Config.BATCH_MAX_WORKERS, help='Profiles built in parallel')
+    parser.add_argument('--no-readme', action='store_true', help='Skip README requests')
+    parser.add_argument('--force-refresh', action='store_true', help='Bypass the profile cache')
+    args = parser.parse_args(argv)
+    
+    usernames = list(args.usernames)
+    if args.file:
+        if args.file == '-':
+            usernames.extend(sys.stdin.read().splitlines())
+        else:
+            with open(args.file, encoding='utf-8') as f:
+                usernames.extend(f.read().splitlines())
+    
+    usernames = normalize_usernames(usernames)
+    if not usernames:
+        parser.error('no usernames given')
+    
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    results = []
+    try:
+        for result in iter_batch_profiles(usernames, args.max_repos, not args.no_readme, args.force_refresh,
+                                          args.workers):
+            results.append(result)
+            output.write(json.dumps(result, default=str) + '\n')
+            output.flush()
+            print(f"{result['username']}: {result['status']}", file=sys.stderr)
+        
+        output.write(json.dumps(batch_summary(results)) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    return 0 if all(result.get('success') for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+from config import Config
+from .db import connect_sqlite
+
+
+class CompletionCacheMiss(Exception):
+    """Raised in cache-only mode when a completion is not cached"""
+
+
+class CompletionCache:
+    """Persistent, content-addressed cache for OpenAI chat completions
+    
+    Keys hash the full request (model, messages and sampling parameters),
+    so a changed prompt or model never returns an old reply. Entries expire
+    after ttl seconds; least recently used entries are evicted past
+    max_bytes. Token usage and call latency are stored with each entry so
+    hits can report the tokens and seconds they saved.
+    """
+    
+    def __init__(self, database_url: Optional[str] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else Config.OPENAI_CACHE_TTL
+        self.max_bytes = max_bytes if max_bytes is not None else Config.OPENAI_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(database_url)
+        if self._conn is None:
+            raise ValueError("Completion cache requires a sqlite:/// DATABASE_URL")
+        
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS openai_completion_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL,
+                completion_tokens INTEGER NOT NULL,
+                latency REAL NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_openai_completion_cache_access "
+            "ON openai_completion_cache (last_access)"
+        )
+        self._conn.commit()
+        
+        self.stats = {
+            'hits': 0, 'misses': 0, 'stores': 0, 'expired': 0, 'evictions': 0, 'cache_only_misses': 0,
+            # Spent by real API calls
+            'api_calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'api_seconds': 0.0,
+            # What the hits would have cost
+            'tokens_saved': 0, 'seconds_saved': 0.0
+        }
+    
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Hash the chat completion arguments that determine the reply"""
+        fields = {name: value for name, value in request.items() if name not in ('stream', 'stream_options')}
+        return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached reply, or None when missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, prompt_tokens, completion_tokens, latency, created_at "
+                "FROM openai_completion_cache WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is not None and now - row[4] > self.ttl:
+                self._conn.execute("DELETE FROM openai_completion_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats['expired'] += 1
+                row = None
+            
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            
+            self._conn.execute("UPDATE openai_completion_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats['hits'] += 1
+            self.stats['tokens_saved'] += row[1] + row[2]
+            self.stats['seconds_saved'] += row[3]
+        return row[0]
+    
+    def put(self, key: str, model: str, content: str, usage: Any, latency: float):
+        """Store a reply with the usage and latency of the call that produced it"""
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+        size = len(content.encode())
+        
+        with self._lock:
+            self.stats['api_calls'] += 1
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+            self.stats['api_seconds'] += latency
+            if size > self.max_bytes:
+                return
+            
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO openai_completion_cache "
+                "(key, model, content, prompt_tokens, completion_tokens, latency, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, content, prompt_tokens, completion_tokens, latency, size, now, now)
+            )
+            self.stats['stores'] += 1
+            self._evict()
+            self._conn.commit()
+    
+    def record_cache_only_miss(self):
+        with self._lock:
+            self.stats['cache_only_misses'] += 1
+    
+    def _evict(self):
+        """Drop expired, then least recently used entries until the cache fits in max_bytes (lock held)"""
+        cursor = self._conn.execute(
+            "DELETE FROM openai_completion_cache WHERE created_at < ?", (time.time() - self.ttl,)
+        )
+        self.stats['expired'] += cursor.rowcount
+        
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM openai_completion_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = self._conn.execute(
+            "SELECT key, size FROM openai_completion_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM openai_completion_cache WHERE key = ?", (key,))
+            total -= size
+            self.stats['evictions'] += 1
+    
+    def get_stats(self) -> Dict:
+        """Return counters plus current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM openai_completion_cache"
+            ).fetchone()
+            stats = dict(self.stats)
+        
+        stats['api_seconds'] = round(stats['api_seconds'], 3)
+        stats['seconds_saved'] = round(stats['seconds_saved'], 3)
+        stats.update({'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes,
+                      'cache_only': Config.OPENAI_CACHE_ONLY})
+        return stats
+
+
+_cache: Optional[CompletionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """Return the process-wide completion cache, or None when disabled"""
+    global _cache
+    
+    if not Config.OPENAI_CACHE_ENABLED:
+        return None
+    
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = CompletionCache()
+                except Exception as e:
+                    print(f"OpenAI completion cache disabled: {e}")
+                    Config.OPENAI_CACHE_ENABLED = False
+                    return None
+    
+    return _cache
@@ -0,0 +1,32 @@
+import os
+import sqlite3
+from typing import Optional
+from config import Config
+
+
+def get_sqlite_path(database_url: Optional[str] = None) -> Optional[str]:
+    """Resolve a sqlite:/// DATABASE_URL to a file path (None if not SQLite)"""
+    url = database_url or Config.DATABASE_URL
+    if not url or not url.startswith('sqlite:///'):
+        return None
+    
+    path = url[len('sqlite:///'):]
+    return path or ':memory:'
+
+
+def connect_sqlite(database_url: Optional[str] = None) -> Optional[sqlite3.Connection]:
+    """Open a connection to the configured SQLite database, shared across threads"""
+    path = get_sqlite_path(database_url)
+    if path is None:
+        return None
+    
+    if path != ':memory:':
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+    
+    # Callers serialize access with their own lock
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    if path != ':memory:':
+        conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
@@ -1,157 +1,448 @@
 import requests
 import json
+import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Iterable, Iterator, List, Dict, Optional, Union
 from config import Config
+from . import metrics
+from .http_session import get_github_session, get_github_timeout
+from .response_cache import get_response_cache
+from .rate_limiter import GitHubRateLimitError, get_rate_limiter
+from .token_pool import get_token_pool
+from .singleflight import github_request_flight
+from .analysis import AnalysisAccumulator, match_repo_keywords
+from .records import RepoRecord, UserRecord
+from .repo_ranking import ScoringPolicy, rank_repos, selection_stats
+from .repo_store import RepoStore, get_repo_store
+
+README_MEDIA_TYPE = 'application/vnd.github.raw'
+
+
+def _read_capped(response: requests.Response, max_bytes: int) -> bytes:
+    """Read at most max_bytes of a streamed response body, then release the connection"""
+    body = bytearray()
+    try:
+        for chunk in response.iter_content(chunk_size=8192):
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                break
+    finally:
+        response.close()
+    
+    return bytes(body[:max_bytes])
+
 
 class GitHubFetcher:
     """Fetches and analyzes GitHub repositories for profile generation"""
     
     def __init__(self, github_token: Optional[str] = None):
-        self.token = github_token or Config.GITHUB_TOKEN
+        # A caller-supplied token is used as-is (it can see the caller's private
+        # repos); otherwise requests rotate across the configured service tokens
+        self.token = github_token
+        self.token_pool = get_token_pool()
         self.base_url = Config.GITHUB_API_BASE_URL
         self.headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'Upwork-Assistant/1.0'
         }
         
-        if self.token:
-            self.headers['Authorization'] = f'token {self.token}'
+        # Concurrent repo detail fetching (1 = sequential)
+        self.max_workers = max(1, Config.GITHUB_MAX_WORKERS)
+        
+        # Candidate/detail counts from the last get_user_repos call
+        self.last_selection: Optional[Dict] = None
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Optional callback(stage, done, total), e.g. for background job progress
+        self.on_progress: Optional[Callable[[str, Optional[int], Optional[int]], None]] = None
+        self._progress_lock = threading.Lock()
+        self._details_done = 0
+        self._details_total: Optional[int] = None
+        
+        # Repos whose languages request returned 404 during the current get_user_repos call
+        self._missing_repos = set()
+        self._missing_lock = threading.Lock()
+        
+        # Server-Timing collector of the request that created this fetcher (None outside requests)
+        self._timings = metrics.current_request_timings()
+    
+    def _rate_limit_request(self, bucket: Hashable = None) -> float:
+        """Wait for budget from the shared, header-driven rate limiter"""
+        waited = get_rate_limiter().acquire(bucket)
+        metrics.record_rate_limit_wait(waited, self._timings)
+        return waited
     
-    def _rate_limit_request(self):
-        """Ensure we don't exceed rate limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def _select_token(self, tried: List[str]) -> Optional[str]:
+        """Pick the token for the next request (None means anonymous)"""
+        if self.token:
+            return self.token
+        return self.token_pool.choose(exclude=tried)
+    
+    def _make_request(self, url: str, params: Dict = None, json_body: Optional[Dict] = None,
+                      accept: Optional[str] = None, max_bytes: Optional[int] = None) -> requests.Response:
+        """Make a rate-limited request, rotating service tokens when one is drained or revoked
         
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
+        Sends a GET, or a POST when json_body is given (GraphQL). accept
+        overrides the media type; max_bytes streams the body and stops reading
+        after that many bytes, leaving it in response.capped_content (the
+        closed stream has no response.content). Concurrent identical GETs in the same auth scope
+        share one network call.
+        """
+        if json_body is not None:
+            return self._make_uncoalesced_request(url, params, json_body)
         
-        self.last_request_time = time.time()
+        scope = self.token or 'service'
+        key = (scope, url, tuple(sorted((params or {}).items())), accept, max_bytes)
+        return github_request_flight.do(
+            key, lambda: self._make_uncoalesced_request(url, params, accept=accept, max_bytes=max_bytes)
+        )
     
-    def _make_request(self, url: str, params: Dict = None) -> requests.Response:
-        """Make a rate-limited request with error handling"""
-        self._rate_limit_request()
+    def _make_uncoalesced_request(self, url: str, params: Optional[Dict] = None, json_body: Optional[Dict] = None,
+                                  accept: Optional[str] = None, max_bytes: Optional[int] = None) -> requests.Response:
+        """Send a request, retrying with another pooled token when one is drained or revoked"""
+        tried = []
         
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
+        while True:
+            token = self._select_token(tried)
+            rotating = token is not None and not self.token
             
-            # Check for rate limiting
-            if response.status_code == 403 and 'rate limit' in response.text.lower():
-                raise Exception("GitHub API rate limit exceeded. Please add a GitHub token or wait an hour.")
+            try:
+                response = self._send_request(url, params, token, json_body, accept, max_bytes)
+            except GitHubRateLimitError:
+                tried.append(token)
+                if not rotating or self.token_pool.choose(exclude=tried) is None:
+                    raise
+                continue
+            
+            if response.status_code == 401 and rotating:
+                self.token_pool.mark_invalid(token)
+                tried.append(token)
+                if self.token_pool.choose(exclude=tried) is not None:
+                    continue
             
             return response
+    
+    def _send_request(self, url: str, params: Optional[Dict], token: Optional[str], json_body: Optional[Dict] = None,
+                      accept: Optional[str] = None, max_bytes: Optional[int] = None,
+                      revalidate: bool = True) -> requests.Response:
+        """Send one request with the given token through the cache and rate limiter"""
+        # Only GETs are revalidated; GraphQL POSTs have their own rate-limit bucket
+        cache = get_response_cache() if json_body is None else None
+        bucket = token if json_body is None else (token, 'graphql')
+        headers = dict(self.headers)
+        if token:
+            headers['Authorization'] = f'token {token}'
+        if accept:
+            headers['Accept'] = accept
+        
+        cache_key = None
+        conditional = {}
+        if cache is not None:
+            # Service tokens all see the same data, so they share one cache scope
+            scope = token if self.token else ('service' if token else None)
+            key_params = dict(params or {})
+            if accept or max_bytes:
+                # Different representations of the same URL are cached separately
+                key_params.update({'_accept': accept, '_max_bytes': max_bytes})
+            cache_key = cache.make_key(url, key_params, scope)
+            conditional = cache.conditional_headers(cache_key) if revalidate else {}
+            headers.update(conditional)
+        
+        self._rate_limit_request(bucket)
+        
+        started = time.perf_counter()
+        body = None
+        try:
+            try:
+                if json_body is None:
+                    response = get_github_session().get(
+                        url, headers=headers, params=params, timeout=get_github_timeout(),
+                        stream=max_bytes is not None
+                    )
+                    if max_bytes is not None:
+                        body = _read_capped(response, max_bytes)
+                else:
+                    response = get_github_session().post(
+                        url, headers=headers, params=params, json=json_body, timeout=get_github_timeout()
+                    )
+            except requests.exceptions.RequestException:
+                get_rate_limiter().release(bucket)
+                raise
+            if body is None:
+                body = response.content or b''
+            metrics.record_github_request(
+                url, response.status_code, len(body), time.perf_counter() - started, self._timings
+            )
+            
+            # Learn the remaining budget and check for rate limiting
+            rate_limit_error = get_rate_limiter().update(
+                bucket, response.headers, response.status_code,
+                body if response.status_code in (403, 429) else b''
+            )
+            if rate_limit_error is not None:
+                raise rate_limit_error
+            
+            if cache is not None:
+                served = cache.handle_response(cache_key, url, response, bool(conditional), body)
+                if served is not response:
+                    # A 304 answered from the cache
+                    response, body = served, served.content
+                if response.status_code == 304 and conditional:
+                    # The entry was evicted after conditional_headers(); fetch the body once more
+                    return self._send_request(url, params, token, json_body, accept, max_bytes, revalidate=False)
             
+            if max_bytes is not None:
+                response.capped_content = body
+            
+            # The limiter bucket this request counted against (the pooled token may differ from self.token)
+            response.rate_limit_bucket = bucket
+            return response
+        
         except requests.exceptions.RequestException as e:
             raise Exception(f"Network error: {str(e)}")
     
-    def get_user_repos(self, username: str, max_repos: int = 10) -> List[Dict]:
-        """Fetch user repositories from GitHub API"""
-        try:
-            # Use different endpoints based on authentication
-            if self.token:
-                # With token: get both public and private repos
-                url = f"{self.base_url}/user/repos"
-                params = {
-                    'sort': 'updated',
-                    'per_page': max_repos * 2,  # Get more to account for filtering
-                    'type': 'owner'
-                }
-            else:
-                # Without token: only public repos
-                url = f"{self.base_url}/users/{username}/repos"
-                params = {
-                    'sort': 'updated',
-                    'per_page': max_repos,
-                    'type': 'owner'
-                }
-            
+    def iter_user_repos(self, username: str, max_repos: Optional[int] = None) -> Iterator[Dict]:
+        """Lazily yield the user's own non-fork repositories, most recently updated first
+        
+        Pages are requested one at a time by following the Link header and only
+        as far as needed to produce max_repos repositories (all when None).
+        """
+        if max_repos is not None and max_repos <= 0:
+            return
+        
+        # Over-fetch to account for filtering, within GitHub's page size cap
+        per_page = Config.GITHUB_PAGE_SIZE
+        if max_repos is not None:
+            per_page = min(per_page, max_repos * 2)
+        
+        # Use different endpoints based on authentication
+        if self.token:
+            # With the caller's token: get both public and private repos
+            url = f"{self.base_url}/user/repos"
+        else:
+            # Without a caller token: only public repos
+            url = f"{self.base_url}/users/{username}/repos"
+        params = {
+            'sort': 'updated',
+            'per_page': per_page,
+            'type': 'owner'
+        }
+        
+        produced = 0
+        while url:
             response = self._make_request(url, params)
             response.raise_for_status()
             
-            repos = response.json()
-            
-            # Filter out forks and get additional details
-            filtered_repos = []
-            for repo in repos:
+            for repo in response.json():
                 # When using token, filter by username to get only user's repos
                 if self.token and repo['owner']['login'] != username:
                     continue
-                    
-                if not repo.get('fork', False):  # Skip forked repositories
-                    repo_details = self._get_repo_details(repo)
-                    filtered_repos.append(repo_details)
-                    
-                    if len(filtered_repos) >= max_repos:
-                        break
-            return filtered_repos
+                
+                if repo.get('fork', False):  # Skip forked repositories
+                    continue
+                
+                yield repo
+                produced += 1
+                if max_repos is not None and produced >= max_repos:
+                    return
+            
+            # The next link already carries the query string
+            url = response.links.get('next', {}).get('url')
+            params = None
+    
+    def get_user_repos(self, username: str, max_repos: int = 10, include_readme: bool = True,
+                       scoring_policy: Union[str, ScoringPolicy, None] = None) -> List[RepoRecord]:
+        """Fetch user repositories from GitHub API, best scored first
+        
+        Candidates are ranked on list metadata alone. Every selected repo gets
+        a language request, but only the top REPO_DETAIL_LIMIT get a README
+        request. include_readme=False skips README requests. Repos whose
+        languages request returns 404 were deleted since they were listed and
+        are left out (and removed from the store).
+        """
+        try:
+            pool = max(max_repos, Config.REPO_CANDIDATE_POOL)
+            store = get_repo_store()
+            with self._missing_lock:
+                self._missing_repos = set()
+            
+            # Filter out forks before spending requests on details
+            with metrics.stage('repo_list', self._timings):
+                if store is None:
+                    candidates = list(self.iter_user_repos(username, pool))
+                else:
+                    candidates = self._sync_repo_listings(store, username, pool)
+                
+                detailed, languages_only = rank_repos(candidates, max_repos, Config.REPO_DETAIL_LIMIT, scoring_policy)
+            self._start_detail_progress(len(detailed) + len(languages_only))
             
+            reused = reused_languages_only = 0
+            with metrics.stage('repo_details', self._timings):
+                if store is None:
+                    repos = self._get_repos_details(detailed, include_readme)
+                    repos.extend(self._get_repos_details(languages_only, False))
+                else:
+                    repos, reused = self._get_stored_repos_details(store, detailed, include_readme)
+                    rest, reused_languages_only = self._get_stored_repos_details(store, languages_only, False)
+                    repos.extend(rest)
+            
+            with self._missing_lock:
+                missing = set(self._missing_repos)
+            if missing:
+                repos = [repo for repo in repos if repo.full_name not in missing]
+                if store is not None:
+                    store.forget_repos(missing)
+            
+            self.last_selection = selection_stats(
+                len(candidates), len(detailed), len(languages_only), include_readme, reused, reused_languages_only
+            )
+            return repos
+        
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to fetch GitHub repositories: {str(e)}")
     
-    def _get_repo_details(self, repo: Dict) -> Dict:
+    def _sync_repo_listings(self, store: RepoStore, username: str, limit: int) -> List[Dict]:
+        """List repositories incrementally against the store and return up to limit list entries
+        
+        The list is sorted by update time, so paging stops at the first known
+        repository whose pushed_at/updated_at is unchanged, provided the
+        stored list is long enough to fill the rest of limit; older entries
+        come from the store. A stored list older than REPO_STORE_MAX_AGE is
+        relisted without stopping early and without its stored tail, so
+        repositories deleted, renamed or transferred since then drop out.
+        """
+        scope = RepoStore.make_scope(self.token)
+        relist = not store.is_listing_current(username, scope)
+        known = [] if relist else store.get_user_repo_names(username, scope)
+        known_set = set(known)
+        
+        fresh = []
+        fresh_known = 0
+        stopped = False
+        for repo in self.iter_user_repos(username, limit):
+            # Only this user's own known repos end the sync (an org repo may
+            # be current because another user's sync stored it), and only when
+            # an earlier, shorter sync left enough stored names to reach limit
+            if repo['full_name'] in known_set:
+                if store.is_current(repo) and len(fresh) + len(known) - fresh_known >= limit:
+                    stopped = True
+                    break
+                fresh_known += 1
+            fresh.append(repo)
+        store.save_listings(fresh)
+        
+        full_names = [repo['full_name'] for repo in fresh]
+        if stopped or len(fresh) >= limit:
+            # The listing was cut short, so keep the stored tail
+            fresh_set = set(full_names)
+            full_names.extend(name for name in known if name not in fresh_set)
+        # A relist, or a sync that paged to the end, checked every stored name
+        store.set_user_repo_names(username, scope, full_names, complete=relist or not (stopped or len(fresh) >= limit))
+        
+        return store.get_listings(full_names[:limit])
+    
+    def _get_stored_repos_details(self, store: RepoStore, repos: List[Dict], include_readme: bool):
+        """Like _get_repos_details, but reuse stored details of unchanged repos; returns (records, reused)"""
+        results: List[Optional[RepoRecord]] = [None] * len(repos)
+        missing = []
+        for i, repo in enumerate(repos):
+            details = store.get_details(repo['full_name'], include_readme)
+            if details is None:
+                missing.append(i)
+            else:
+                results[i] = RepoRecord.from_github(repo, *details)
+                self._advance_detail_progress()
+        
+        fetched = self._get_repos_details([repos[i] for i in missing], include_readme)
+        for i, repo in zip(missing, fetched):
+            readme_content = repo.readme_content if include_readme else None
+            store.save_details(repo.full_name, dict(repo.languages), readme_content)
+            results[i] = repo
+        
+        return results, len(repos) - len(missing)
+    
+    def iter_repo_details(self, username: str, max_repos: Optional[int] = None,
+                          include_readme: bool = True) -> Iterator[RepoRecord]:
+        """Yield detailed repositories as a stream, fetching details in worker-sized batches"""
+        batch = []
+        for repo in self.iter_user_repos(username, max_repos):
+            batch.append(repo)
+            if len(batch) >= self.max_workers:
+                yield from self._get_repos_details(batch, include_readme)
+                batch = []
+        
+        if batch:
+            yield from self._get_repos_details(batch, include_readme)
+    
+    def _get_repos_details(self, repos: List[Dict], include_readme: bool = True) -> List[RepoRecord]:
+        """Get detailed information for several repositories, preserving order"""
+        if self.max_workers == 1 or len(repos) <= 1:
+            return [self._get_repo_details(repo, include_readme) for repo in repos]
+        
+        # _get_repo_details only raises GitHubRateLimitError, which should fail the whole listing
+        workers = min(self.max_workers, len(repos))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda repo: self._get_repo_details(repo, include_readme), repos))
+    
+    def _get_repo_details(self, repo: Dict, include_readme: bool = True) -> RepoRecord:
         """Get detailed information about a repository"""
         try:
             # Get README content
-            readme_content = self._get_readme_content(repo['owner']['login'], repo['name'])
+            readme_content = ''
+            if include_readme:
+                readme_content = self._get_readme_content(repo['owner']['login'], repo['name'])
             
             # Get languages used
             languages = self._get_repo_languages(repo['owner']['login'], repo['name'])
             
-            return {
-                'name': repo['name'],
-                'full_name': repo['full_name'],
-                'description': repo.get('description', ''),
-                'html_url': repo['html_url'],
-                'language': repo.get('language', ''),
-                'languages': languages,
-                'stars': repo.get('stargazers_count', 0),
-                'forks': repo.get('forks_count', 0),
-                'created_at': repo['created_at'],
-                'updated_at': repo['updated_at'],
-                'readme_content': readme_content,
-                'topics': repo.get('topics', []),
-                'size': repo.get('size', 0),
-                'open_issues': repo.get('open_issues_count', 0),
-                'private': repo.get('private', False)
-            }
-            
+            return RepoRecord.from_github(repo, languages, readme_content)
+        
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             # Return basic info if detailed fetch fails
-            return {
-                'name': repo['name'],
-                'full_name': repo['full_name'],
-                'description': repo.get('description', ''),
-                'html_url': repo['html_url'],
-                'language': repo.get('language', ''),
-                'languages': {},
-                'stars': repo.get('stargazers_count', 0),
-                'forks': repo.get('forks_count', 0),
-                'created_at': repo['created_at'],
-                'updated_at': repo['updated_at'],
-                'readme_content': '',
-                'topics': repo.get('topics', []),
-                'size': repo.get('size', 0),
-                'open_issues': repo.get('open_issues_count', 0)
-            }
+            return RepoRecord.from_github(repo)
+        
+        finally:
+            self._advance_detail_progress()
+    
+    def _report_progress(self, stage: str, done: Optional[int] = None, total: Optional[int] = None):
+        if self.on_progress is not None:
+            self.on_progress(stage, done, total)
+    
+    def _start_detail_progress(self, total: int):
+        with self._progress_lock:
+            self._details_done = 0
+            self._details_total = total
+        self._report_progress('repo_details', 0, total)
+    
+    def _advance_detail_progress(self):
+        """Count one finished repository (called from detail worker threads)"""
+        if self.on_progress is None:
+            return
+        with self._progress_lock:
+            self._details_done += 1
+            done, total = self._details_done, self._details_total
+        self._report_progress('repo_details', done, total)
     
     def _get_readme_content(self, owner: str, repo: str) -> str:
-        """Get README content from repository"""
+        """Get README content from repository (raw text, capped at README_MAX_BYTES)"""
         try:
             url = f"{self.base_url}/repos/{owner}/{repo}/readme"
-            response = self._make_request(url)
+            # The raw media type skips the JSON + base64 wrapper, and the body is
+            # streamed so huge READMEs stop downloading at the cap
+            response = self._make_request(url, accept=README_MEDIA_TYPE, max_bytes=Config.README_MAX_BYTES)
             
             if response.status_code == 200:
-                readme_data = response.json()
-                import base64
-                content = base64.b64decode(readme_data['content']).decode('utf-8')
-                return content
+                # The cap can split a multi-byte character
+                return response.capped_content.decode('utf-8', errors='ignore')
             else:
                 return ""
-                
+        
+        except GitHubRateLimitError:
+            raise
         except Exception:
             return ""
     
@@ -164,148 +455,57 @@ class GitHubFetcher:
             if response.status_code == 200:
                 return response.json()
             else:
+                if response.status_code == 404:
+                    # Deleted (or made private) since it was listed
+                    with self._missing_lock:
+                        self._missing_repos.add(f"{owner}/{repo}")
                 return {}
-                
+        
+        except GitHubRateLimitError:
+            raise
         except Exception:
             return {}
     
-    def get_user_info(self, username: str) -> Dict:
+    def get_user_info(self, username: str) -> UserRecord:
         """Get basic user information"""
         try:
             # Always use the users/{username} endpoint for specific user info
             # The token will still be used for authentication if available
             url = f"{self.base_url}/users/{username}"
             
-            response = self._make_request(url)
+            with metrics.stage('user_info', self._timings):
+                response = self._make_request(url)
             response.raise_for_status()
             
-            user_data = response.json()
-            return {
-                'username': user_data['login'],
-                'name': user_data.get('name', ''),
-                'bio': user_data.get('bio', ''),
-                'location': user_data.get('location', ''),
-                'public_repos': user_data.get('public_repos', 0),
-                'followers': user_data.get('followers', 0),
-                'following': user_data.get('following', 0),
-                'created_at': user_data.get('created_at', ''),
-                'avatar_url': user_data.get('avatar_url', '')
-            }
-            
+            user_info = UserRecord.from_github(response.json())
+            store = get_repo_store()
+            if store is not None:
+                store.save_user(username, user_info.to_dict())
+            return user_info
+        
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to fetch user information: {str(e)}")
     
-    def analyze_repos(self, repos: List[Dict]) -> Dict:
-        """Analyze repositories to extract skills and patterns"""
-        analysis = {
-            'languages': {},
-            'technologies': set(),
-            'project_types': [],
-            'total_stars': 0,
-            'total_forks': 0,
-            'avg_repo_size': 0,
-            'recent_projects': [],
-            'top_projects': []
-        }
-        
-        if not repos:
-            return analysis
-        
-        # Analyze each repository
-        for repo in repos:
-            # Count languages
-            if repo['language']:
-                analysis['languages'][repo['language']] = analysis['languages'].get(repo['language'], 0) + 1
-            
-            # Add languages from detailed analysis
-            for lang in repo['languages']:
-                analysis['languages'][lang] = analysis['languages'].get(lang, 0) + repo['languages'][lang]
-            
-            # Extract technologies from topics and descriptions
-            self._extract_technologies(repo, analysis['technologies'])
-            
-            # Categorize project type
-            project_type = self._categorize_project(repo)
-            if project_type:
-                analysis['project_types'].append(project_type)
-            
-            # Sum up stats
-            analysis['total_stars'] += repo['stars']
-            analysis['total_forks'] += repo['forks']
-        
-        # Calculate averages
-        analysis['avg_repo_size'] = sum(repo['size'] for repo in repos) / len(repos)
-        
-        # Get recent projects (last 6 months)
-        from datetime import datetime, timedelta
-        six_months_ago = datetime.now() - timedelta(days=180)
-        
-        analysis['recent_projects'] = []
-        for repo in repos:
-            try:
-                # Handle GitHub's ISO format with 'Z' timezone
-                updated_at_str = repo['updated_at']
-                if updated_at_str.endswith('Z'):
-                    updated_at_str = updated_at_str[:-1] + '+00:00'
-                
-                repo_date = datetime.fromisoformat(updated_at_str)
-                if repo_date > six_months_ago:
-                    analysis['recent_projects'].append(repo)
-            except Exception:
-                # Skip repos with invalid dates
-                continue
+    def analyze_repos(self, repos: Iterable[RepoRecord]) -> Dict:
+        """Analyze repositories to extract skills and patterns
         
-        # Get top projects by stars
-        analysis['top_projects'] = sorted(repos, key=lambda x: x['stars'], reverse=True)[:5]
-        
-        # Convert set to list for JSON serialization
-        analysis['technologies'] = list(analysis['technologies'])
-        
-        return analysis
+        Makes a single pass, so repos may be a list or a stream such as
+        iter_repo_details(). Use AnalysisAccumulator directly to update an
+        analysis repo by repo or to merge shards.
+        """
+        with metrics.stage('analysis', self._timings):
+            return AnalysisAccumulator.from_repos(repos).result()
+    
+    def _match_keywords(self, repo: RepoRecord):
+        """Scan a repository once for technologies and its project type"""
+        return match_repo_keywords(repo)
     
-    def _extract_technologies(self, repo: Dict, technologies: set):
+    def _extract_technologies(self, repo: RepoRecord, technologies: set):
         """Extract technology names from repository data"""
-        # From topics
-        for topic in repo['topics']:
-            technologies.add(topic.lower())
-        
-        # From description
-        description = repo['description'].lower() if repo['description'] else ''
-        common_techs = [
-            'react', 'vue', 'angular', 'node.js', 'express', 'django', 'flask',
-            'python', 'javascript', 'typescript', 'java', 'c#', 'php', 'ruby',
-            'mongodb', 'postgresql', 'mysql', 'redis', 'docker', 'kubernetes',
-            'aws', 'azure', 'gcp', 'firebase', 'heroku', 'netlify'
-        ]
-        
-        for tech in common_techs:
-            if tech in description:
-                technologies.add(tech)
+        technologies.update(self._match_keywords(repo)[0])
     
-    def _categorize_project(self, repo: Dict) -> str:
+    def _categorize_project(self, repo: RepoRecord) -> str:
         """Categorize project based on name, description, and topics"""
-        name = repo['name'].lower()
-        description = repo['description'].lower() if repo['description'] else ''
-        topics = [topic.lower() for topic in repo['topics']]
-        
-        # Web applications
-        if any(word in name or word in description for word in ['web', 'app', 'website', 'dashboard']):
-            return 'Web Application'
-        
-        # API projects
-        if any(word in name or word in description for word in ['api', 'backend', 'server']):
-            return 'API/Backend'
-        
-        # Mobile apps
-        if any(word in name or word in description for word in ['mobile', 'android', 'ios', 'react-native']):
-            return 'Mobile Application'
-        
-        # Data science
-        if any(word in name or word in description for word in ['ml', 'ai', 'data', 'analysis', 'jupyter']):
-            return 'Data Science'
-        
-        # Tools/Utilities
-        if any(word in name or word in description for word in ['tool', 'utility', 'cli', 'script']):
-            return 'Tool/Utility'
-        
-        return 'Other' 
\ No newline at end of file
+        return self._match_keywords(repo)[1]
@@ -0,0 +1,218 @@
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from config import Config
+from . import metrics
+from .github_fetcher import GitHubFetcher
+from .rate_limiter import SECONDARY_LIMIT_BACKOFF, GitHubRateLimitError, get_rate_limiter
+from .records import RepoRecord, UserRecord, parse_github_timestamp
+from .repo_ranking import ScoringPolicy, selection_stats
+from .token_pool import get_token_pool
+
+# README paths tried in order; REST /readme resolves these server-side
+README_EXPRESSIONS = ('HEAD:README.md', 'HEAD:readme.md', 'HEAD:README.rst', 'HEAD:README')
+
+PROFILE_QUERY = """
+query($login: String!, $first: Int!, $after: String, $privacy: RepositoryPrivacy, $withReadme: Boolean!) {
+  user(login: $login) {
+    login
+    name
+    bio
+    location
+    createdAt
+    avatarUrl
+    followers { totalCount }
+    following { totalCount }
+    publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    repositories(first: $first, after: $after, privacy: $privacy, isFork: false,
+                 ownerAffiliations: OWNER, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        url
+        isPrivate
+        createdAt
+        updatedAt
+        pushedAt
+        stargazerCount
+        forkCount
+        diskUsage
+        primaryLanguage { name }
+        issues(states: OPEN) { totalCount }
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        %s
+      }
+    }
+  }
+}
+""" % "\n        ".join(
+    f'readme{i}: object(expression: "{expression}") @include(if: $withReadme) {{ ... on Blob {{ text }} }}'
+    for i, expression in enumerate(README_EXPRESSIONS)
+)
+
+
+class GraphQLGitHubFetcher(GitHubFetcher):
+    """Fetches the same profile data as GitHubFetcher through GitHub's GraphQL API
+    
+    User info, repositories, languages, topics and README text come back in
+    one paginated query instead of 2 + 2N REST calls. GraphQL requires a
+    token, so use create_github_fetcher() to fall back to REST without one.
+    max_repos and include_readme size the first page that get_user_info
+    prefetches; pass the values the following get_user_repos call will use.
+    """
+    
+    def __init__(self, github_token: Optional[str] = None, max_repos: Optional[int] = None,
+                 include_readme: bool = True):
+        super().__init__(github_token)
+        self.graphql_url = Config.GITHUB_GRAPHQL_URL
+        self.prefetch_repos = max_repos if max_repos is not None else Config.MAX_REPOS_TO_FETCH
+        self.prefetch_readme = include_readme
+        # First page from get_user_info (username, first, with_readme, user), reused by get_user_repos
+        self._first_page: Optional[Tuple[str, int, bool, Dict]] = None
+    
+    def _graphql(self, query: str, variables: Dict) -> Dict:
+        """Run a GraphQL query and return its data, raising on errors"""
+        response = self._make_request(self.graphql_url, json_body={'query': query, 'variables': variables})
+        response.raise_for_status()
+        
+        payload = response.json()
+        errors = payload.get('errors') or []
+        for error in errors:
+            if error.get('type') == 'RATE_LIMITED':
+                bucket = getattr(response, 'rate_limit_bucket', (self.token, 'graphql'))
+                reset_time = get_rate_limiter().snapshot(bucket)['reset_time']
+                raise GitHubRateLimitError(float(reset_time) or time.time() + SECONDARY_LIMIT_BACKOFF)
+            if error.get('type') == 'NOT_FOUND':
+                raise Exception(f"404 Not Found: {error.get('message', '')}")
+        if errors and not payload.get('data'):
+            raise Exception(f"GraphQL error: {errors[0].get('message', 'unknown error')}")
+        
+        return payload.get('data') or {}
+    
+    def _fetch_page(self, username: str, first: int, after: Optional[str] = None, with_readme: bool = True) -> Dict:
+        """Fetch the user plus one page of owned, non-fork repositories"""
+        if (after is None and self._first_page and self._first_page[:2] == (username, first)
+                and (self._first_page[2] or not with_readme)):
+            return self._first_page[3]
+        
+        variables = {
+            'login': username,
+            'first': max(1, min(first, 100)),
+            'after': after,
+            # Only a caller token may see that caller's private repositories
+            'privacy': None if self.token else 'PUBLIC',
+            'withReadme': with_readme
+        }
+        user = self._graphql(PROFILE_QUERY, variables).get('user')
+        if user is None:
+            raise Exception(f"404 Not Found: GitHub user '{username}' does not exist")
+        
+        if after is None:
+            self._first_page = (username, first, with_readme, user)
+        return user
+    
+    def get_user_info(self, username: str) -> UserRecord:
+        """Get basic user information (prefetches the first page of repositories)"""
+        try:
+            with metrics.stage('user_info', self._timings):
+                user = self._fetch_page(username, self.prefetch_repos, with_readme=self.prefetch_readme)
+            return UserRecord(
+                username=user['login'],
+                name=user.get('name') or '',
+                bio=user.get('bio') or '',
+                location=user.get('location') or '',
+                public_repos=user['publicRepos']['totalCount'],
+                followers=user['followers']['totalCount'],
+                following=user['following']['totalCount'],
+                created_at=parse_github_timestamp(user.get('createdAt')),
+                avatar_url=user.get('avatarUrl', '')
+            )
+        
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to fetch user information: {str(e)}")
+    
+    def get_user_repos(self, username: str, max_repos: int = 10, include_readme: bool = True,
+                       scoring_policy: Union[str, ScoringPolicy, None] = None) -> List[RepoRecord]:
+        """Fetch user repositories with languages, topics and README in as few queries as possible
+        
+        Details arrive in the same query as the list, so there are no detail
+        calls to save and scoring_policy is ignored (order stays most recently updated).
+        """
+        try:
+            repos = []
+            after = None
+            first = max_repos
+            if (self._first_page and self._first_page[0] == username and self._first_page[1] >= max_repos
+                    and (self._first_page[2] or not include_readme)):
+                first = self._first_page[1]
+            
+            while len(repos) < max_repos:
+                # Lists and details arrive together, so all query time counts as repo_list
+                with metrics.stage('repo_list', self._timings):
+                    user = self._fetch_page(username, first, after, include_readme)
+                connection = user['repositories']
+                # A prefetched first page may carry README text this call does not want
+                repos.extend(self._repo_details(node, include_readme) for node in connection['nodes'])
+                
+                if not connection['pageInfo']['hasNextPage']:
+                    break
+                after = connection['pageInfo']['endCursor']
+                first = max_repos - len(repos)
+            
+            repos = repos[:max_repos]
+            self.last_selection = selection_stats(len(repos), len(repos), 0, include_readme)
+            # Details arrived with the list
+            self._report_progress('repo_details', len(repos), len(repos))
+            return repos
+        
+        except GitHubRateLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to fetch GitHub repositories: {str(e)}")
+    
+    def _repo_details(self, node: Dict, include_readme: bool = True) -> RepoRecord:
+        """Convert a GraphQL repository node to the record _get_repo_details returns"""
+        readme_content = ''
+        for i in range(len(README_EXPRESSIONS) if include_readme else 0):
+            blob = node.get(f'readme{i}')
+            if blob and blob.get('text'):
+                # Same cap as the REST raw download (characters rather than bytes)
+                readme_content = blob['text'][:Config.README_MAX_BYTES]
+                break
+        
+        primary_language = node.get('primaryLanguage') or {}
+        return RepoRecord.from_dict({
+            'name': node['name'],
+            'full_name': node['nameWithOwner'],
+            'description': node.get('description') or '',
+            'html_url': node['url'],
+            'language': primary_language.get('name') or '',
+            'languages': {edge['node']['name']: edge['size'] for edge in node['languages']['edges']},
+            'stars': node.get('stargazerCount', 0),
+            'forks': node.get('forkCount', 0),
+            'created_at': node['createdAt'],
+            'updated_at': node['updatedAt'],
+            'readme_content': readme_content,
+            'topics': [topic['topic']['name'] for topic in node['repositoryTopics']['nodes']],
+            'size': node.get('diskUsage') or 0,
+            'open_issues': node['issues']['totalCount'],
+            'private': node.get('isPrivate', False)
+        })
+
+
+def create_github_fetcher(github_token: Optional[str] = None, max_repos: Optional[int] = None,
+                          include_readme: bool = True) -> GitHubFetcher:
+    """Build the fetcher selected by Config.GITHUB_FETCH_BACKEND
+    
+    max_repos and include_readme describe the upcoming get_user_repos call
+    (the GraphQL fetcher prefetches its first page with them).
+    """
+    # GraphQL rejects anonymous requests, so stay on REST without any token
+    if Config.GITHUB_FETCH_BACKEND == 'graphql' and (github_token or get_token_pool().choose()):
+        return GraphQLGitHubFetcher(github_token, max_repos, include_readme)
+    
+    return GitHubFetcher(github_token)
@@ -0,0 +1,83 @@
+import threading
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from config import Config
+
+# Process-wide keep-alive session shared by every GitHubFetcher and the
+# rate-limit endpoint. Auth headers are passed per request, never stored here.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class _TimedPoolMixin:
+    """Blocking connection pool that waits at most GITHUB_POOL_TIMEOUT for a free connection"""
+    
+    def urlopen(self, *args, **kwargs):
+        if kwargs.get('pool_timeout') is None:
+            kwargs['pool_timeout'] = Config.GITHUB_POOL_TIMEOUT
+        return super().urlopen(*args, **kwargs)
+
+
+class _TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _GitHubAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools give up waiting for a connection after GITHUB_POOL_TIMEOUT"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+    
+    def send(self, request, **kwargs):
+        try:
+            return super().send(request, **kwargs)
+        except EmptyPoolError as e:
+            # requests re-raises this urllib3 error as-is; callers expect a RequestException
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+
+def get_github_session() -> requests.Session:
+    """Return the shared pooled HTTP session for GitHub traffic"""
+    global _session
+    
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = _GitHubAdapter(
+                    pool_connections=Config.GITHUB_POOL_CONNECTIONS,
+                    pool_maxsize=Config.GITHUB_POOL_SIZE,
+                    # Wait (up to GITHUB_POOL_TIMEOUT) for a free connection instead of opening extras
+                    pool_block=True
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    
+    return _session
+
+
+def get_github_timeout() -> Tuple[float, float]:
+    """Return the (connect, read) timeout used for GitHub requests"""
+    return (Config.GITHUB_CONNECT_TIMEOUT, Config.GITHUB_READ_TIMEOUT)
+
+
+def reset_github_session():
+    """Close the shared session so the next caller builds a fresh one"""
+    global _session
+    
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,303 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+from config import Config
+from .db import connect_sqlite
+from .profile_service import NO_REPOS_ERROR, PROFILE_STAGES, generate_cached_profile
+from .rate_limiter import GitHubRateLimitError
+
+# Suggested client wait when the queue is full
+RETRY_AFTER_SECONDS = 5
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobQueueFull(Exception):
+    """Raised by submit() when JOB_QUEUE_SIZE jobs are already waiting"""
+
+
+class JobQueue:
+    """Background profile generation on a local worker pool
+    
+    Jobs are written through to the profile_jobs table on every state and
+    progress change, so GET /api/jobs/<id> keeps working across restarts.
+    Each row records the process that owns it and a heartbeat that process
+    refreshes while the job is queued or running. Jobs whose heartbeat goes
+    stale (the owner stopped) are claimed by another process with a single
+    UPDATE and queued again there, except those submitted with a caller
+    token: tokens are only held in memory, so those jobs are marked failed
+    instead. Live processes never take each other's jobs.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, max_queued: Optional[int] = None,
+                 retention: Optional[float] = None, database_url: Optional[str] = None,
+                 heartbeat_interval: Optional[float] = None, stale_after: Optional[float] = None):
+        self.max_queued = max_queued if max_queued is not None else Config.JOB_QUEUE_SIZE
+        self.retention = retention if retention is not None else Config.JOB_RETENTION
+        self.heartbeat_interval = heartbeat_interval if heartbeat_interval is not None else Config.JOB_HEARTBEAT_INTERVAL
+        self.stale_after = stale_after if stale_after is not None else Config.JOB_STALE_AFTER
+        # Identifies this process's rows in profile_jobs
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue[str]' = queue.Queue()
+        # Queued and running jobs; finished jobs are only read back from the database
+        self._active: Dict[str, Dict] = {}
+        # Caller tokens by job id, never persisted
+        self._tokens: Dict[str, str] = {}
+        
+        self._conn = connect_sqlite(database_url)
+        if self._conn is None:
+            print("Warning: DATABASE_URL is not SQLite; profile jobs will not survive a restart")
+            self._conn = connect_sqlite('sqlite:///')
+        
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS profile_jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                record TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                finished_at REAL,
+                owner TEXT,
+                heartbeat REAL
+            );
+            CREATE INDEX IF NOT EXISTS profile_jobs_status ON profile_jobs (status);
+        """)
+        # Tables created before jobs had owners
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(profile_jobs)")}
+        for column, kind in (('owner', 'TEXT'), ('heartbeat', 'REAL')):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE profile_jobs ADD COLUMN {column} {kind}")
+        self._conn.commit()
+        
+        with self._lock:
+            self._recover()
+        
+        for i in range(max(1, workers or Config.JOB_WORKERS)):
+            threading.Thread(target=self._work, name=f'profile-job-{i}', daemon=True).start()
+        threading.Thread(target=self._heartbeat, name='profile-job-heartbeat', daemon=True).start()
+    
+    def submit(self, github_username: str, github_token: Optional[str], max_repos: int,
+               include_readme: bool = True, force_refresh: bool = False) -> Dict:
+        """Queue a profile build and return the new job; raises JobQueueFull under backpressure"""
+        now = time.time()
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'stage': None,
+            'progress': {stage: {'status': 'pending'} for stage in PROFILE_STAGES},
+            'params': {
+                'github_username': github_username,
+                'max_repos': max_repos,
+                'include_readme': include_readme,
+                'force_refresh': force_refresh
+            },
+            'has_token': bool(github_token),
+            'created_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'status_code': None,
+            'error': None,
+            'result': None
+        }
+        
+        with self._lock:
+            queued = sum(1 for active in self._active.values() if active['status'] == 'queued')
+            if queued >= self.max_queued:
+                raise JobQueueFull(f'Job queue is full ({queued} jobs waiting)')
+            
+            self._prune(now)
+            self._active[job['job_id']] = job
+            if github_token:
+                self._tokens[job['job_id']] = github_token
+            self._save(job)
+            snapshot = self._public(job)
+        
+        self._queue.put(job['job_id'])
+        return snapshot
+    
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job's status, progress and (once finished) result"""
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None:
+                row = self._conn.execute("SELECT record FROM profile_jobs WHERE job_id = ?", (job_id,)).fetchone()
+                job = json.loads(row[0]) if row else None
+            return self._public(job) if job else None
+    
+    def get_stats(self) -> Dict:
+        """Return queued/running counts plus stored jobs by status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM profile_jobs GROUP BY status").fetchall()
+            active = [job['status'] for job in self._active.values()]
+        
+        return {
+            'queued': active.count('queued'),
+            'running': active.count('running'),
+            'max_queued': self.max_queued,
+            'stored': dict(rows)
+        }
+    
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception as e:
+                print(f"Warning: profile job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def _heartbeat(self):
+        """Keep this process's active jobs fresh and take over jobs of stopped processes"""
+        while True:
+            time.sleep(self.heartbeat_interval)
+            try:
+                with self._lock:
+                    self._conn.execute(
+                        f"UPDATE profile_jobs SET heartbeat = ? WHERE owner = ? "
+                        f"AND status IN ({', '.join('?' * len(ACTIVE_STATUSES))})",
+                        (time.time(), self.owner) + ACTIVE_STATUSES
+                    )
+                    self._conn.commit()
+                    self._recover()
+            except Exception as e:
+                print(f"Warning: profile job heartbeat failed: {e}")
+    
+    def _run(self, job_id: str):
+        with self._lock:
+            job = self._active[job_id]
+            job['status'] = 'running'
+            job['started_at'] = time.time()
+            self._save(job)
+            github_token = self._tokens.pop(job_id, None)
+        
+        params = job['params']
+        outcome = {}
+        try:
+            body, cache_info = generate_cached_profile(
+                params['github_username'], github_token, params['max_repos'], params['include_readme'],
+                params['force_refresh'], progress=lambda *args: self._progress(job_id, *args)
+            )
+            if body is None:
+                outcome = {'status': 'failed', 'status_code': 404, 'error': NO_REPOS_ERROR}
+            else:
+                outcome = {'status': 'succeeded', 'status_code': 200, 'result': {**body, 'cache': cache_info}}
+        
+        except GitHubRateLimitError as e:
+            outcome = {'status': 'failed', 'status_code': 429, 'error': str(e), 'reset_time': int(e.reset_time)}
+        except Exception as e:
+            outcome = {'status': 'failed', 'status_code': 500, 'error': str(e)}
+        
+        self._finish(job_id, outcome)
+    
+    def _progress(self, job_id: str, stage: str, done: Optional[int] = None, total: Optional[int] = None):
+        """Record a stage change or repo_details count (called from fetcher threads)"""
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None:
+                return
+            
+            if stage != job['stage']:
+                # Stages run in order, so entering one completes the previous
+                for state in job['progress'].values():
+                    if state['status'] == 'running':
+                        state['status'] = 'done'
+                job['stage'] = stage
+            
+            state = job['progress'].setdefault(stage, {})
+            state['status'] = 'running'
+            if total is not None:
+                state.update({'done': done, 'total': total})
+            self._save(job)
+    
+    def _finish(self, job_id: str, outcome: Dict):
+        with self._lock:
+            job = self._active.pop(job_id)
+            for state in job['progress'].values():
+                if state['status'] == 'running':
+                    state['status'] = 'done' if outcome['status'] == 'succeeded' else 'failed'
+                elif state['status'] == 'pending' and outcome['status'] == 'succeeded':
+                    # e.g. served from the profile cache
+                    state['status'] = 'skipped'
+            job.update(outcome)
+            job['finished_at'] = time.time()
+            self._save(job)
+    
+    def _recover(self):
+        """Claim and requeue active jobs whose owner stopped heartbeating (caller holds the lock)"""
+        now = time.time()
+        statuses = ', '.join('?' * len(ACTIVE_STATUSES))
+        # One statement, so two processes cannot claim the same row
+        claimed = self._conn.execute(
+            f"UPDATE profile_jobs SET owner = ?, heartbeat = ? WHERE status IN ({statuses}) "
+            "AND (owner IS NULL OR owner != ?) AND (heartbeat IS NULL OR heartbeat < ?)",
+            (self.owner, now) + ACTIVE_STATUSES + (self.owner, now - self.stale_after)
+        ).rowcount
+        self._conn.commit()
+        if not claimed:
+            return
+        
+        rows = self._conn.execute(
+            f"SELECT record FROM profile_jobs WHERE owner = ? AND status IN ({statuses}) ORDER BY created_at",
+            (self.owner,) + ACTIVE_STATUSES
+        ).fetchall()
+        
+        for (record,) in rows:
+            job = json.loads(record)
+            if job['job_id'] in self._active:
+                continue
+            if job['has_token']:
+                job.update({
+                    'status': 'failed',
+                    'status_code': 503,
+                    'error': 'Interrupted by a restart; resubmit (caller tokens are not stored)',
+                    'finished_at': time.time()
+                })
+            else:
+                job.update({'status': 'queued', 'stage': None, 'started_at': None})
+                job['progress'] = {stage: {'status': 'pending'} for stage in PROFILE_STAGES}
+                self._active[job['job_id']] = job
+                self._queue.put(job['job_id'])
+            self._save(job)
+    
+    def _prune(self, now: float):
+        """Delete finished jobs older than the retention period (caller holds the lock)"""
+        self._conn.execute(
+            "DELETE FROM profile_jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (now - self.retention,)
+        )
+    
+    def _save(self, job: Dict):
+        """Write a job through to SQLite (caller holds the lock)"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO profile_jobs (job_id, status, record, created_at, finished_at, owner, heartbeat) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job['job_id'], job['status'], json.dumps(job, default=str), job['created_at'], job['finished_at'],
+             self.owner, time.time())
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def _public(job: Dict) -> Dict:
+        """Copy of a job as returned by the API"""
+        snapshot = json.loads(json.dumps(job, default=str))
+        snapshot.pop('has_token', None)
+        return snapshot
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, starting its workers on first use"""
+    global _job_queue
+    
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+    
+    return _job_queue
@@ -0,0 +1,158 @@
+import json
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from config import Config
+
+DEFAULT_KEYWORDS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'keywords.json')
+
+
+# Byte translation table: lowercase ASCII letters, keep digits, '#', '+', '.',
+# '-' and non-ASCII bytes, and turn every other byte into a word separator
+_WORD_BYTES = set(b'abcdefghijklmnopqrstuvwxyz0123456789#+.-')
+_TRANSLATE = bytes(
+    c + 32 if 65 <= c <= 90 else (c if c in _WORD_BYTES or c > 127 else 32)
+    for c in range(256)
+)
+
+
+def _find(text: str, keywords: FrozenSet[bytes]) -> FrozenSet[bytes]:
+    """Return the keywords that occur in text as whole words
+    
+    Tokenizing with bytes.translate/split and intersecting in C keeps the
+    whole scan out of Python. 'node.js', 'c#' and 'react-native' stay whole,
+    and hyphenated words also match by part ('my-react-app' finds 'react').
+    """
+    data = text.encode('utf-8').translate(_TRANSLATE) + b' '
+    data = data.replace(b'. ', b' ')  # Sentence-final periods
+    found = keywords.intersection(data.split())
+    if b'-' in data:
+        found = found.union(keywords.intersection(data.replace(b'-', b' ').split()))
+    return found
+
+
+# README parts that name what a project is built with: fenced and inline code
+# (dependency lists, imports, commands), shields.io badges and install commands
+_README_SIGNALS = re.compile(
+    r"```[^`]*```"
+    r"|`[^`\n]+`"
+    r"|\S*shields\.io/\S*"
+    r"|^[ \t>$]*(?:sudo[ \t]+)?(?:pip3?|pipenv|poetry|conda|npm|npx|yarn|pnpm|gem|bundle|composer|cargo|go"
+    r"|docker|docker-compose|brew|apt|apt-get|dotnet|mvn|gradle)[ \t]+"
+    r"(?:install|add|get|require|pull|run|build|up)\b[^\n]*",
+    re.MULTILINE
+)
+
+
+def extract_readme_signals(readme: str) -> str:
+    """Return the code, badge and install-command parts of a README
+    
+    Prose is dropped, so a README that only mentions a technology in passing
+    ('unlike Django, this...') does not list it as a skill.
+    """
+    return '\n'.join(_README_SIGNALS.findall(readme))
+
+
+class KeywordMatcher:
+    """Single-pass technology and project-type extraction
+    
+    Text is split into words in one C-level pass and intersected with a
+    keyword table built once from the data file. Matching whole words
+    means 'ai' no longer matches 'maintain' and 'java' no longer matches
+    'javascript'. One scan over name, description, topics and optional
+    README text yields both technologies and the project type.
+    """
+    
+    def __init__(self, data: Dict):
+        self.default_project_type = data.get('default_project_type', 'Other')
+        self.default_technology_category = data.get('default_technology_category', 'Tools')
+        
+        # keyword -> canonical technology name
+        aliases: Dict[str, str] = data.get('technology_aliases', {})
+        technologies: Dict[str, str] = {tech: tech for tech in data.get('technologies', [])}
+        technologies.update(aliases)
+        
+        # keyword -> project type priority (lower wins, like the old if/elif chain)
+        self._project_types: List[str] = []
+        category_rank: Dict[str, int] = {}
+        for rank, entry in enumerate(data.get('project_types', [])):
+            self._project_types.append(entry['category'])
+            for keyword in entry['keywords']:
+                category_rank.setdefault(keyword, rank)
+                # Project-type keywords also match their plural ('apps', 'tools')
+                category_rank.setdefault(keyword + 's', rank)
+        
+        # Lookup tables keyed by the encoded word
+        no_rank = len(self._project_types)
+        self._tech_names: Dict[bytes, str] = {}
+        self._ranks: Dict[bytes, int] = {}
+        for keyword in set(technologies) | set(category_rank):
+            self._check_keyword(keyword)
+            word = keyword.encode('utf-8')
+            self._ranks[word] = category_rank.get(keyword, no_rank)
+            if keyword in technologies:
+                self._tech_names[word] = technologies[keyword]
+        self._keywords = frozenset(self._ranks)
+        
+        self._technology_categories: Dict[bytes, int] = {}
+        self._technology_category_names: List[str] = []
+        for rank, entry in enumerate(data.get('technology_categories', [])):
+            self._technology_category_names.append(entry['category'])
+            for keyword in entry['keywords']:
+                self._check_keyword(keyword)
+                self._technology_categories.setdefault(keyword.encode('utf-8'), rank)
+        # Aliases ('expressjs', 'python3') categorize like their canonical name
+        self._category_aliases: Dict[bytes, bytes] = {
+            alias.encode('utf-8'): name.encode('utf-8') for alias, name in aliases.items()
+        }
+        self._technology_category_keywords = frozenset(self._technology_categories) | frozenset(self._category_aliases)
+    
+    @staticmethod
+    def _check_keyword(keyword: str):
+        word = keyword.encode('utf-8')
+        if keyword != keyword.lower() or not _find(keyword, frozenset([word])) or b' ' in word:
+            raise ValueError(f"Keyword {keyword!r} must be a single lowercase word (use '-' instead of spaces)")
+    
+    def match(self, name: str, description: Optional[str], topics: Iterable[str],
+              readme: Optional[str] = None) -> Tuple[Set[str], str]:
+        """Return (technologies, project type) for one repository
+        
+        Topics are always technologies. README text only contributes
+        technologies, since words like 'app' appear in nearly every README,
+        and only its code, badges and install commands are scanned.
+        """
+        topics = [topic.lower() for topic in topics]
+        technologies = set(topics)
+        
+        # Set intersection keeps the per-word work in C; only hits are inspected
+        hits = _find(f"{name}\n{description or ''}\n{' '.join(topics)}", self._keywords)
+        if readme:
+            readme_hits = _find(extract_readme_signals(readme), self._keywords)
+            technologies.update(self._tech_names[word] for word in readme_hits if word in self._tech_names)
+        
+        if not hits:
+            return technologies, self.default_project_type
+        
+        technologies.update(self._tech_names[word] for word in hits if word in self._tech_names)
+        best_rank = min(self._ranks[word] for word in hits)
+        if best_rank < len(self._project_types):
+            return technologies, self._project_types[best_rank]
+        return technologies, self.default_project_type
+    
+    def categorize_technology(self, technology: str) -> str:
+        """Return the skill category for a technology or topic name"""
+        words = (self._category_aliases.get(word, word) for word in _find(technology, self._technology_category_keywords))
+        ranks = [self._technology_categories[word] for word in words if word in self._technology_categories]
+        if ranks:
+            return self._technology_category_names[min(ranks)]
+        return self.default_technology_category
+
+
+def load_keyword_matcher(path: Optional[str] = None) -> KeywordMatcher:
+    """Build a matcher from a keywords JSON file"""
+    with open(path or Config.KEYWORDS_FILE or DEFAULT_KEYWORDS_FILE, encoding='utf-8') as f:
+        return KeywordMatcher(json.load(f))
+
+
+# Compiled once at import time and shared by the fetcher and generator
+KEYWORDS = load_keyword_matcher()
@@ -0,0 +1,207 @@
+"""Lightweight profile-pipeline metrics
+
+Stage durations, GitHub call counts/bytes/status codes and rate-limit
+waits are aggregated process-wide for the Prometheus /metrics endpoint
+and per request for the Server-Timing header. Every entry point checks
+Config.METRICS_ENABLED first, so disabled instrumentation costs one
+attribute lookup per call.
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+from config import Config
+
+# Seconds; stages range from ~1ms (analysis) to several seconds (OpenAI)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_NOOP = nullcontext()
+
+_METRICS = {
+    # name: (type, help)
+    'profile_stage_duration_seconds': ('histogram', 'Time spent in each profile pipeline stage'),
+    'github_requests_total': ('counter', 'GitHub API responses by endpoint and status code'),
+    'github_response_bytes_total': ('counter', 'GitHub API response body bytes downloaded'),
+    'github_request_duration_seconds': ('histogram', 'GitHub API request latency'),
+    'github_rate_limit_wait_seconds_total': ('counter', 'Seconds slept by the GitHub rate limiter'),
+    'http_request_duration_seconds': ('histogram', 'API request latency by route and status code'),
+}
+
+
+class MetricsRegistry:
+    """Thread-safe counters and fixed-bucket histograms rendered in Prometheus text format"""
+    
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        # labels -> [per-bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+    
+    def inc(self, name: str, labels: Labels = (), amount: float = 1):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+    
+    def observe(self, name: str, labels: Labels, value: float):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(labels)
+            if state is None:
+                state = series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+    
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {labels: list(state) for labels, state in series.items()}
+                          for name, series in self._histograms.items()}
+        
+        lines = []
+        for name, (kind, help_text) in _METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(counters.get(name, {}).items()):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            for labels, state in sorted(histograms.get(name, {}).items()):
+                for bound, count in zip(self.buckets, state):
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", repr(bound)),))} {count}')
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {state[-1]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(state[-2])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {state[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+class RequestTimings:
+    """Per-request totals for the Server-Timing header (safe to update from worker threads)"""
+    
+    __slots__ = ('_lock', '_durations', '_counts', 'started')
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self.started = time.perf_counter()
+    
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self._durations[name] = self._durations.get(name, 0.0) + seconds
+            self._counts[name] = self._counts.get(name, 0) + 1
+    
+    def header(self) -> str:
+        """Server-Timing value; GitHub time is summed over parallel calls"""
+        with self._lock:
+            entries = [
+                f'{name};dur={seconds * 1000:.1f}' + (f';desc="{self._counts[name]} calls"' if name == 'github' else '')
+                for name, seconds in self._durations.items()
+            ]
+        entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.1f}')
+        return ', '.join(entries)
+
+
+registry = MetricsRegistry()
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+def start_request():
+    """Begin collecting Server-Timing data for the current request; returns a token for finish_request"""
+    if not Config.METRICS_ENABLED:
+        return None
+    return _request_timings.set(RequestTimings())
+
+
+def finish_request(token):
+    if token is not None:
+        _request_timings.reset(token)
+
+
+def current_request_timings() -> Optional[RequestTimings]:
+    """Timings of the request being handled (capture it before handing work to other threads)"""
+    return _request_timings.get() if Config.METRICS_ENABLED else None
+
+
+def stage(name: str, timings: Optional[RequestTimings] = None):
+    """Context manager timing one pipeline stage"""
+    if not Config.METRICS_ENABLED:
+        return _NOOP
+    return _timed_stage(name, timings or _request_timings.get())
+
+
+@contextmanager
+def _timed_stage(name: str, timings: Optional[RequestTimings]) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        registry.observe('profile_stage_duration_seconds', (('stage', name),), seconds)
+        if timings is not None:
+            timings.add(name, seconds)
+
+
+def github_endpoint(url: str) -> str:
+    """Low-cardinality endpoint label for a GitHub API URL"""
+    path = urlsplit(url).path
+    if path.endswith('/graphql'):
+        return 'graphql'
+    if path.endswith('/readme'):
+        return 'readme'
+    if path.endswith('/languages'):
+        return 'languages'
+    if path.endswith('/repos'):
+        return 'repo_list'
+    if path.endswith('/rate_limit'):
+        return 'rate_limit'
+    if path.startswith('/users/'):
+        return 'user'
+    return 'other'
+
+
+def record_github_request(url: str, status: int, size: int, seconds: float,
+                          timings: Optional[RequestTimings] = None):
+    if not Config.METRICS_ENABLED:
+        return
+    endpoint = github_endpoint(url)
+    registry.inc('github_requests_total', (('endpoint', endpoint), ('status', str(status))))
+    registry.inc('github_response_bytes_total', (('endpoint', endpoint),), size)
+    registry.observe('github_request_duration_seconds', (('endpoint', endpoint),), seconds)
+    if timings is not None:
+        timings.add('github', seconds)
+
+
+def record_rate_limit_wait(seconds: float, timings: Optional[RequestTimings] = None):
+    if not Config.METRICS_ENABLED or seconds <= 0:
+        return
+    registry.inc('github_rate_limit_wait_seconds_total', (), seconds)
+    if timings is not None:
+        timings.add('rate_limit_wait', seconds)
+
+
+def record_http_request(route: str, method: str, status: int, seconds: float):
+    if not Config.METRICS_ENABLED:
+        return
+    registry.observe('http_request_duration_seconds',
+                     (('route', route), ('method', method), ('status', str(status))), seconds)
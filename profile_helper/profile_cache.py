@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from config import Config
+
+
+class ProfileCache:
+    """In-memory TTL/LRU cache for generated profiles with stale-while-revalidate
+    
+    Entries younger than ttl are served as hits. Entries older than ttl but
+    within ttl + grace are served immediately as stale while a background
+    refresh replaces them. Eviction is least recently used, bounded by entry
+    count and total serialized bytes.
+    """
+    
+    def __init__(self, ttl: Optional[float] = None, grace: Optional[float] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else Config.PROFILE_CACHE_TTL
+        self.grace = grace if grace is not None else Config.PROFILE_CACHE_GRACE
+        self.max_entries = max_entries if max_entries is not None else Config.PROFILE_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else Config.PROFILE_CACHE_MAX_BYTES
+        self._entries: 'OrderedDict[str, Tuple[Any, float, int]]' = OrderedDict()
+        self._bytes = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='profile-refresh')
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0}
+    
+    @staticmethod
+    def make_key(username: str, max_repos: int, github_token: Optional[str], include_readme: bool = True) -> str:
+        """Build a cache key from username, max_repos, auth scope and README option"""
+        # A caller token can expose private repos, so it gets its own scope
+        scope = hashlib.sha256(github_token.encode()).hexdigest() if github_token else 'service'
+        key = f"{username.lower()}|{max_repos}|{scope}"
+        return key if include_readme else f"{key}|no-readme"
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any], force_refresh: bool = False) -> Tuple[Any, Dict]:
+        """Return (value, cache info) serving fresh or stale entries when possible
+        
+        compute() builds the value; a None result is returned but not cached.
+        Cache info is {'status': 'hit' | 'stale' | 'miss', 'age_seconds': float}.
+        """
+        if not force_refresh:
+            cached = self.lookup(key, compute)
+            if cached is not None:
+                return cached
+        
+        self.record_miss()
+        value = compute()
+        if value is not None:
+            self.set(key, value)
+        return value, {'status': 'miss', 'age_seconds': 0.0}
+    
+    def lookup(self, key: str, compute: Callable[[], Any]) -> Optional[Tuple[Any, Dict]]:
+        """Return a fresh or stale (value, cache info), or None on a miss
+        
+        Stale entries schedule compute() in the background. Misses are not
+        counted here; callers that build the value themselves call record_miss().
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            value, created_at, _ = entry
+            age = time.time() - created_at
+            
+            if age <= self.ttl:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return value, {'status': 'hit', 'age_seconds': round(age, 1)}
+            
+            if age <= self.ttl + self.grace:
+                self._entries.move_to_end(key)
+                self.stats['stale_hits'] += 1
+                self._schedule_refresh(key, compute)
+                return value, {'status': 'stale', 'age_seconds': round(age, 1)}
+        
+        return None
+    
+    def record_miss(self):
+        with self._lock:
+            self.stats['misses'] += 1
+    
+    def _schedule_refresh(self, key: str, compute: Callable[[], Any]):
+        """Refresh an entry in the background unless a refresh is already running (lock held)"""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, compute)
+    
+    def _refresh(self, key: str, compute: Callable[[], Any]):
+        try:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+                with self._lock:
+                    self.stats['refreshes'] += 1
+        except Exception as e:
+            # Keep serving the stale entry; the next request past grace recomputes
+            print(f"Background profile refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def set(self, key: str, value: Any):
+        """Store a value, evicting least recently used entries to fit the limits"""
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            
+            self._entries[key] = (value, time.time(), size)
+            self._bytes += size
+            
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.stats['evictions'] += 1
+    
+    def invalidate(self, key: str):
+        """Drop one entry"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+    
+    def get_stats(self) -> Dict:
+        """Return counters plus current size"""
+        with self._lock:
+            return {**self.stats, 'entries': len(self._entries), 'bytes': self._bytes}
+
+
+_cache: Optional[ProfileCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> Optional[ProfileCache]:
+    """Return the process-wide profile cache, or None when PROFILE_CACHE_TTL is 0"""
+    global _cache
+    
+    if Config.PROFILE_CACHE_TTL <= 0:
+        return None
+    
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ProfileCache()
+    
+    return _cache
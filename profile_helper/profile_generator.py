@@ -1,16 +1,71 @@
 import json
-from datetime import datetime
-from typing import Dict, List
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from config import Config
+from . import metrics
+from .completion_cache import CompletionCache, CompletionCacheMiss, get_completion_cache
+from .keyword_matcher import KEYWORDS
+from .records import RepoRecord, UserRecord
+
+# The openai package takes ~0.5s to import, so it is loaded on the first
+# transcription rather than at startup (None: not tried yet)
+OpenAI = None
+OPENAI_AVAILABLE: Optional[bool] = None
+
+# (client class, api key, base url) -> client; one connection pool per process
+_openai_client: Optional[Tuple[Tuple, Any]] = None
+_openai_lock = threading.Lock()
+
+# Appended to every AI transcription
+SPEAKING_NOTES = "\n".join([
+    "💡 Speaking Tips:",
+    "• Speak at a natural pace - this should take about 2 minutes",
+    "• Pause briefly after each sentence for clarity",
+    "• Emphasize your key skills and project achievements",
+    "• End with enthusiasm about the opportunity"
+])
+
+def _load_openai():
+    """Import the OpenAI client class on first use"""
+    global OpenAI, OPENAI_AVAILABLE
+    
+    if OPENAI_AVAILABLE is None:
+        try:
+            from openai import OpenAI as client_class
+            OpenAI = client_class
+            OPENAI_AVAILABLE = True
+        except ImportError:
+            OPENAI_AVAILABLE = False
+            print("Warning: OpenAI package not installed. Install with: pip install openai")
+    
+    return OpenAI if OPENAI_AVAILABLE else None
+
+
+def get_openai_client():
+    """Return the process-wide OpenAI client, or None without an API key or the openai package
+    
+    The client is rebuilt only when OPENAI_API_KEY or OPENAI_BASE_URL change.
+    """
+    global _openai_client
+    
+    if not Config.OPENAI_API_KEY:
+        return None
+    
+    client_class = _load_openai()
+    if client_class is None:
+        return None
+    
+    key = (client_class, Config.OPENAI_API_KEY, Config.OPENAI_BASE_URL)
+    current = _openai_client
+    if current is None or current[0] != key:
+        with _openai_lock:
+            current = _openai_client
+            if current is None or current[0] != key:
+                current = _openai_client = (key, client_class(api_key=key[1], base_url=key[2]))
+    
+    return current[1]
 
-# Add OpenAI import
-try:
-    import openai
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    print("Warning: OpenAI package not installed. Install with: pip install openai")
 
 class ProfileGenerator:
     """Generates professional Upwork profiles from GitHub data"""
@@ -24,21 +79,84 @@ class ProfileGenerator:
             'DevOps': ['Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Heroku', 'Netlify', 'CI/CD', 'Git'],
             'Tools': ['Git', 'Docker', 'VS Code', 'IntelliJ', 'Postman', 'Jira', 'Slack']
         }
-        self.openai_client = None
-        if OPENAI_AVAILABLE and Config.OPENAI_API_KEY:
-            self.openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
     
-    def generate_profile(self, user_info: Dict, repos: List[Dict], analysis: Dict) -> Dict:
-        """Generate complete profile content"""
-        return {
-            'title': self._generate_title(user_info, analysis),
-            'overview': self._generate_overview(user_info, repos, analysis),
-            'skills': self._generate_skills(analysis),
-            'portfolio_projects': self._generate_portfolio_projects(repos, analysis),
-            'transcription': self._generate_transcription(user_info, repos, analysis)
-        }
+    @property
+    def openai_client(self):
+        """Shared OpenAI client (created, and the package imported, on first use)"""
+        return get_openai_client()
+    
+    def generate_profile(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict,
+                         progress: Optional[Callable[[str], None]] = None) -> Dict:
+        """Generate complete profile content (progress is told 'generation', then 'transcription')"""
+        # Resolved per call: one generator serves every request
+        timings = metrics.current_request_timings()
+        if progress:
+            progress('generation')
+        with metrics.stage('generation', timings):
+            profile = dict(self.iter_sections(user_info, repos, analysis))
+        
+        if progress:
+            progress('transcription')
+        with metrics.stage('transcription', timings):
+            profile['transcription'] = self._generate_transcription(user_info, repos, analysis)
+        return profile
     
-    def _generate_title(self, user_info: Dict, analysis: Dict) -> str:
+    def iter_sections(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> Iterator[Tuple[str, str]]:
+        """Yield (name, content) for the locally generated sections, one at a time"""
+        yield 'title', self._generate_title(user_info, analysis)
+        yield 'overview', self._generate_overview(user_info, repos, analysis)
+        yield 'skills', self._generate_skills(analysis)
+        yield 'portfolio_projects', self._generate_portfolio_projects(repos, analysis)
+    
+    def iter_transcription(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> Iterator[str]:
+        """Stream the AI transcription as text deltas; joined they equal _generate_transcription()
+        
+        A cached transcription is yielded as a single delta.
+        """
+        request = self._transcription_request(user_info, repos, analysis)
+        cache, cache_key, cached = self._cached_transcription(request)
+        if cached is not None:
+            yield f"{cached}\n\n{SPEAKING_NOTES}"
+            return
+        
+        if not self.openai_client:
+            raise Exception("OpenAI client not available. Please set OPENAI_API_KEY environment variable.")
+        
+        try:
+            started_at = time.time()
+            stream = self.openai_client.chat.completions.create(
+                **request, stream=True, stream_options={'include_usage': True}
+            )
+            
+            # Strip like the non-streamed reply: hold back whitespace until more text follows
+            started = False
+            pending = ''
+            parts = []
+            usage = None
+            for chunk in stream:
+                # The final chunk carries token usage and no choices
+                usage = getattr(chunk, 'usage', None) or usage
+                if not chunk.choices:
+                    continue
+                text = pending + (chunk.choices[0].delta.content or '')
+                content = text.rstrip()
+                pending = text[len(content):]
+                if not started:
+                    content = content.lstrip()
+                if content:
+                    started = True
+                    parts.append(content)
+                    yield content
+            
+        except Exception as e:
+            print(f"OpenAI API error: {e}")
+            raise Exception(f"Failed to generate AI transcription: {str(e)}")
+        
+        if cache is not None:
+            cache.put(cache_key, request['model'], ''.join(parts), usage, time.time() - started_at)
+        yield f"\n\n{SPEAKING_NOTES}"
+    
+    def _generate_title(self, user_info: UserRecord, analysis: Dict) -> str:
         """Generate professional profile title"""
         # Get top languages
         top_languages = sorted(analysis.get('languages', {}).items(), 
@@ -69,27 +187,15 @@ class ProfileGenerator:
         
         return title
     
-    def _generate_overview(self, user_info: Dict, repos: List[Dict], analysis: Dict) -> str:
+    def _generate_overview(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> str:
         """Generate professional overview section"""
         # Calculate experience years
-        years_experience = 0
-        if user_info.get('created_at'):
-            try:
-                # Handle GitHub's ISO format with 'Z' timezone
-                created_at_str = user_info['created_at']
-                if created_at_str.endswith('Z'):
-                    created_at_str = created_at_str[:-1] + '+00:00'
-                
-                join_date = datetime.fromisoformat(created_at_str)
-                years_experience = (datetime.now() - join_date).days // 365
-            except Exception:
-                # If date parsing fails, use 0 years
-                years_experience = 0
+        years_experience = user_info.years_on_github
         
         # Get project count and types
         total_projects = len(repos)
         project_types = analysis.get('project_types', [])
-        unique_types = list(set(project_types))
+        unique_types = list(dict.fromkeys(project_types))
         
         # Get top technologies
         technologies = analysis.get('technologies', [])
@@ -99,8 +205,8 @@ class ProfileGenerator:
         overview_parts = []
         
         # Introduction
-        if user_info.get('name'):
-            overview_parts.append(f"I'm {user_info['name']}, a passionate software developer")
+        if user_info.name:
+            overview_parts.append(f"I'm {user_info.name}, a passionate software developer")
         else:
             overview_parts.append("I'm a passionate software developer")
         
@@ -137,7 +243,7 @@ class ProfileGenerator:
         
         # Get all languages and their counts
         languages = analysis.get('languages', {})
-        technologies = set(analysis.get('technologies', []))
+        technologies = dict.fromkeys(analysis.get('technologies', []))
         
         # Organize skills by category
         categorized_skills = {}
@@ -172,20 +278,9 @@ class ProfileGenerator:
     
     def _categorize_technology(self, technology: str) -> str:
         """Categorize technology"""
-        tech_lower = technology.lower()
-        
-        if any(tech in tech_lower for tech in ['react', 'vue', 'angular', 'html', 'css', 'bootstrap']):
-            return "Frontend"
-        elif any(tech in tech_lower for tech in ['node', 'express', 'django', 'flask', 'spring']):
-            return "Backend"
-        elif any(tech in tech_lower for tech in ['postgres', 'mysql', 'mongo', 'redis']):
-            return "Database"
-        elif any(tech in tech_lower for tech in ['docker', 'kubernetes', 'aws', 'azure', 'heroku']):
-            return "DevOps"
-        else:
-            return "Tools"
+        return KEYWORDS.categorize_technology(technology)
     
-    def _generate_portfolio_projects(self, repos: List[Dict], analysis: Dict) -> str:
+    def _generate_portfolio_projects(self, repos: List[RepoRecord], analysis: Dict) -> str:
         """Generate portfolio projects section"""
         if not repos:
             return "No projects available"
@@ -201,13 +296,13 @@ class ProfileGenerator:
         
         return "<br>".join(projects_html)
     
-    def _generate_project_description(self, repo: Dict) -> str:
+    def _generate_project_description(self, repo: RepoRecord) -> str:
         """Generate description for a single project"""
-        name = repo['name']
-        description = repo.get('description', '')
-        language = repo.get('language', '')
-        stars = repo.get('stars', 0)
-        forks = repo.get('forks', 0)
+        name = repo.name
+        description = repo.description
+        language = repo.language
+        stars = repo.stars
+        forks = repo.forks
         
         # Build description
         parts = []
@@ -224,9 +319,9 @@ class ProfileGenerator:
             tech_parts.append(language)
         
         # Add other languages if available
-        languages = repo.get('languages', {})
+        languages = repo.language_names
         if languages:
-            other_langs = [lang for lang in languages.keys() if lang != language]
+            other_langs = [lang for lang in languages if lang != language]
             if other_langs:
                 tech_parts.extend(other_langs[:2])  # Limit to 2 additional languages
         
@@ -263,18 +358,53 @@ class ProfileGenerator:
         
         return ", ".join(unique_skills[:8])  # Limit to 8 skills
     
-    def _generate_ai_transcription(self, user_info: Dict, repos: List[Dict], analysis: Dict) -> str:
-        """Generate AI-powered transcription using OpenAI"""
+    def _generate_ai_transcription(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> str:
+        """Generate AI-powered transcription using OpenAI (served from the completion cache when possible)"""
+        request = self._transcription_request(user_info, repos, analysis)
+        cache, cache_key, cached = self._cached_transcription(request)
+        if cached is not None:
+            return f"{cached}\n\n{SPEAKING_NOTES}"
+        
         if not self.openai_client:
             # No fallback - require OpenAI to be available
             raise Exception("OpenAI client not available. Please set OPENAI_API_KEY environment variable.")
         
         try:
-            # Prepare context for AI
-            context = self._prepare_ai_context(user_info, repos, analysis)
+            # Make API call with token limits
+            started_at = time.time()
+            response = self.openai_client.chat.completions.create(**request)
+            
+            transcription = response.choices[0].message.content.strip()
+            if cache is not None:
+                cache.put(cache_key, request['model'], transcription, response.usage, time.time() - started_at)
             
-            # Create the prompt with token limits
-            prompt = f"""Generate a professional 2-minute self-introduction transcription for an Upwork profile. 
+            # Add speaking tips
+            return f"{transcription}\n\n{SPEAKING_NOTES}"
+            
+        except Exception as e:
+            print(f"OpenAI API error: {e}")
+            # No fallback - raise the error
+            raise Exception(f"Failed to generate AI transcription: {str(e)}")
+    
+    def _cached_transcription(self, request: Dict) -> Tuple[Optional[CompletionCache], Optional[str], Optional[str]]:
+        """Return (cache, key, cached reply or None); raises CompletionCacheMiss in cache-only mode"""
+        cache = get_completion_cache()
+        cache_key = cache.make_key(request) if cache is not None else None
+        cached = cache.get(cache_key) if cache is not None else None
+        
+        if cached is None and Config.OPENAI_CACHE_ONLY:
+            if cache is not None:
+                cache.record_cache_only_miss()
+            raise CompletionCacheMiss("Transcription is not cached and OPENAI_CACHE_ONLY is enabled")
+        return cache, cache_key, cached
+    
+    def _transcription_request(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> Dict:
+        """Chat completion arguments for the transcription (shared by the streamed variant)"""
+        # Prepare context for AI
+        context = self._prepare_ai_context(user_info, repos, analysis)
+        
+        # Create the prompt with token limits
+        prompt = f"""Generate a professional 2-minute self-introduction transcription for an Upwork profile. 
 
 Context:
 {context}
@@ -288,54 +418,26 @@ Requirements:
 
 Generate only the transcription text (no speaking tips or formatting):"""
 
-            # Make API call with token limits
-            response = self.openai_client.chat.completions.create(
-                model=Config.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a professional profile writer specializing in creating engaging self-introductions for freelancers."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,  # Limit to ~300 tokens for cost control
-                temperature=0.7,  # Some creativity but not too random
-                presence_penalty=0.1,  # Encourage mentioning key details
-                frequency_penalty=0.1   # Reduce repetition
-            )
-            
-            transcription = response.choices[0].message.content.strip()
-            
-            # Add speaking tips
-            speaking_notes = [
-                "💡 Speaking Tips:",
-                "• Speak at a natural pace - this should take about 2 minutes",
-                "• Pause briefly after each sentence for clarity",
-                "• Emphasize your key skills and project achievements",
-                "• End with enthusiasm about the opportunity"
-            ]
-            
-            return f"{transcription}\n\n" + "\n".join(speaking_notes)
-            
-        except Exception as e:
-            print(f"OpenAI API error: {e}")
-            # No fallback - raise the error
-            raise Exception(f"Failed to generate AI transcription: {str(e)}")
+        return dict(
+            model=Config.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a professional profile writer specializing in creating engaging self-introductions for freelancers."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=300,  # Limit to ~300 tokens for cost control
+            temperature=0.7,  # Some creativity but not too random
+            presence_penalty=0.1,  # Encourage mentioning key details
+            frequency_penalty=0.1   # Reduce repetition
+        )
     
-    def _prepare_ai_context(self, user_info: Dict, repos: List[Dict], analysis: Dict) -> str:
+    def _prepare_ai_context(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> str:
         """Prepare context data for AI prompt"""
         # Calculate experience years
-        years_experience = 0
-        if user_info.get('created_at'):
-            try:
-                created_at_str = user_info['created_at']
-                if created_at_str.endswith('Z'):
-                    created_at_str = created_at_str[:-1] + '+00:00'
-                join_date = datetime.fromisoformat(created_at_str)
-                years_experience = (datetime.now() - join_date).days // 365
-            except Exception:
-                years_experience = 0
+        years_experience = user_info.years_on_github
         
         # Get key information
-        name = user_info.get('name', 'Software Developer')
-        username = user_info.get('username', '')
+        name = user_info.name
+        username = user_info.username
         total_projects = len(repos)
         
         # Get top skills
@@ -345,7 +447,8 @@ Generate only the transcription text (no speaking tips or formatting):"""
         
         # Get project types
         project_types = analysis.get('project_types', [])
-        unique_types = list(set(project_types))
+        # First-seen order, not set order, so the prompt (and its cache key) is the same in every process
+        unique_types = list(dict.fromkeys(project_types))
         
         # Get top projects
         top_projects = analysis.get('top_projects', repos[:2])
@@ -357,13 +460,29 @@ Experience: {years_experience} years of coding
 Total Projects: {total_projects}
 Top Programming Languages: {', '.join(lang_names) if lang_names else 'Various'}
 Project Types: {', '.join(unique_types) if unique_types else 'Various software projects'}
-Notable Projects: {', '.join([p['name'] for p in top_projects[:2]]) if top_projects else 'Various projects'}
+Notable Projects: {', '.join([p.name for p in top_projects[:2]]) if top_projects else 'Various projects'}
 """
         return context
     
 
 
-    def _generate_transcription(self, user_info: Dict, repos: List[Dict], analysis: Dict) -> str:
+    def _generate_transcription(self, user_info: UserRecord, repos: List[RepoRecord], analysis: Dict) -> str:
         """Generate a 2-minute self-introduction transcription for recording"""
         # Try AI-powered transcription first, fallback to template-based
-        return self._generate_ai_transcription(user_info, repos, analysis) 
\ No newline at end of file
+        return self._generate_ai_transcription(user_info, repos, analysis) 
+
+
+_generator: Optional[ProfileGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_profile_generator() -> ProfileGenerator:
+    """Return the process-wide profile generator (it holds no per-request state)"""
+    global _generator
+    
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = ProfileGenerator()
+    
+    return _generator
@@ -0,0 +1,160 @@
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .graphql_fetcher import create_github_fetcher
+from .profile_generator import get_profile_generator
+from .profile_cache import ProfileCache, get_profile_cache
+from .records import RepoRecord, UserRecord
+from .singleflight import profile_flight
+
+NO_REPOS_ERROR = 'No repositories found or unable to access repositories'
+
+# progress(stage, done=None, total=None); stages in order:
+PROFILE_STAGES = ('user_info', 'repo_list', 'repo_details', 'analysis', 'generation', 'transcription')
+ProgressCallback = Callable[..., None]
+
+
+def _no_progress(stage: str, done: Optional[int] = None, total: Optional[int] = None):
+    pass
+
+
+def fetch_profile_inputs(github_username: str, github_token: Optional[str], max_repos: int,
+                         include_readme: bool = True, progress: Optional[ProgressCallback] = None
+                         ) -> Optional[Tuple[UserRecord, List[RepoRecord], Dict, Optional[Dict]]]:
+    """Fetch and analyze a user's repositories
+    
+    Returns (user_info, repos, analysis, selection), or None when no
+    repositories are found.
+    """
+    progress = progress or _no_progress
+    
+    github_fetcher = create_github_fetcher(github_token, max_repos, include_readme)
+    github_fetcher.on_progress = progress
+    
+    # Fetch user information and repositories
+    progress('user_info')
+    user_info = github_fetcher.get_user_info(github_username)
+    progress('repo_list')
+    repos = github_fetcher.get_user_repos(github_username, max_repos, include_readme)
+    
+    if not repos:
+        return None
+    
+    # Analyze repositories
+    progress('analysis')
+    analysis = github_fetcher.analyze_repos(repos)
+    
+    return user_info, repos, analysis, github_fetcher.last_selection
+
+
+def build_profile(github_username: str, github_token: Optional[str], max_repos: int,
+                  include_readme: bool = True, progress: Optional[ProgressCallback] = None) -> Optional[Dict]:
+    """Fetch, analyze and generate a profile; returns None when no repositories are found"""
+    inputs = fetch_profile_inputs(github_username, github_token, max_repos, include_readme, progress)
+    if inputs is None:
+        return None
+    user_info, repos, analysis, selection = inputs
+    
+    # Generate profile content
+    profile_content = get_profile_generator().generate_profile(user_info, repos, analysis, progress)
+    
+    return profile_response(user_info, repos, analysis, profile_content, selection)
+
+
+def profile_response(user_info: UserRecord, repos: List[RepoRecord], analysis: Dict, profile_content: Dict,
+                     selection: Optional[Dict] = None) -> Dict:
+    """Build the JSON body returned by the profile endpoints"""
+    return {
+        'success': True,
+        'profile': profile_content,
+        'user_info': user_info.to_dict(),
+        'analysis': {
+            'total_repos': len(repos),
+            'languages': analysis.get('languages', {}),
+            'technologies': analysis.get('technologies', []),
+            'project_types': analysis.get('project_types', [])
+        },
+        # Repos ranked from list metadata and the README/language calls skipped
+        'selection': selection
+    }
+
+
+def generate_cached_profile(github_username: str, github_token: Optional[str], max_repos: int,
+                            include_readme: bool = True, force_refresh: bool = False,
+                            progress: Optional[ProgressCallback] = None) -> Tuple[Optional[Dict], Dict]:
+    """Build a profile through the profile cache and in-flight coalescing
+    
+    Returns (body or None when no repositories were found, cache info).
+    progress only sees stages when this call runs the build itself.
+    """
+    cache_key = ProfileCache.make_key(github_username, max_repos, github_token, include_readme)
+    
+    def compute():
+        # Identical concurrent builds wait on one fetch + OpenAI call
+        return profile_flight.do(
+            cache_key, lambda: build_profile(github_username, github_token, max_repos, include_readme, progress)
+        )
+    
+    # Serve repeat requests from the profile cache (stale entries refresh in the background)
+    profile_cache = get_profile_cache()
+    if profile_cache is None:
+        return compute(), {'status': 'disabled', 'age_seconds': 0.0}
+    return profile_cache.get_or_compute(cache_key, compute, force_refresh)
+
+
+def _body_events(body: Dict, cache_info: Dict) -> Iterator[Dict]:
+    """Replay a finished profile body as stream events"""
+    yield {'event': 'analysis', 'user_info': body['user_info'], 'analysis': body['analysis'],
+           'selection': body.get('selection')}
+    for name, content in body['profile'].items():
+        if name != 'transcription':
+            yield {'event': 'section', 'name': name, 'content': content}
+    yield {'event': 'transcription', 'content': body['profile']['transcription']}
+    yield {'event': 'done', 'success': True, 'cache': cache_info}
+
+
+def iter_profile_events(github_username: str, github_token: Optional[str], max_repos: int,
+                        include_readme: bool = True, force_refresh: bool = False) -> Iterator[Dict]:
+    """Build a profile as a stream of events, sending each part as soon as it is ready
+    
+    Events, in order: 'analysis' (user_info, analysis, selection), one
+    'section' per locally generated section, 'transcription' text deltas
+    from the OpenAI streaming API, then 'done'. Cached profiles are replayed
+    at once; freshly streamed profiles are stored in the profile cache.
+    No repositories ends the stream with an 'error' event; other errors
+    are raised to the caller.
+    """
+    cache_key = ProfileCache.make_key(github_username, max_repos, github_token, include_readme)
+    profile_cache = get_profile_cache()
+    
+    if profile_cache is not None:
+        if not force_refresh:
+            cached = profile_cache.lookup(cache_key, lambda: profile_flight.do(
+                cache_key, lambda: build_profile(github_username, github_token, max_repos, include_readme)
+            ))
+            if cached is not None:
+                yield from _body_events(*cached)
+                return
+        profile_cache.record_miss()
+    
+    inputs = fetch_profile_inputs(github_username, github_token, max_repos, include_readme)
+    if inputs is None:
+        yield {'event': 'error', 'status': 404, 'error': NO_REPOS_ERROR}
+        return
+    user_info, repos, analysis, selection = inputs
+    
+    body = profile_response(user_info, repos, analysis, {}, selection)
+    yield {'event': 'analysis', 'user_info': body['user_info'], 'analysis': body['analysis'], 'selection': selection}
+    
+    profile_generator = get_profile_generator()
+    for name, content in profile_generator.iter_sections(user_info, repos, analysis):
+        body['profile'][name] = content
+        yield {'event': 'section', 'name': name, 'content': content}
+    
+    deltas = []
+    for delta in profile_generator.iter_transcription(user_info, repos, analysis):
+        deltas.append(delta)
+        yield {'event': 'transcription', 'content': delta}
+    body['profile']['transcription'] = ''.join(deltas)
+    
+    if profile_cache is not None:
+        profile_cache.set(cache_key, body)
+    yield {'event': 'done', 'success': True, 'cache': {'status': 'miss', 'age_seconds': 0.0}}
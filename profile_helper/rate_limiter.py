@@ -0,0 +1,223 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Hashable, Mapping, Optional
+from config import Config
+
+
+# Seconds to back off after a secondary rate limit that has no Retry-After
+SECONDARY_LIMIT_BACKOFF = 60
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when the GitHub API budget for a token is exhausted"""
+    
+    def __init__(self, reset_time: float, message: Optional[str] = None):
+        self.reset_time = reset_time
+        self.retry_after = max(0.0, reset_time - time.time())
+        if message is None:
+            reset_at = datetime.fromtimestamp(reset_time, tz=timezone.utc).strftime('%H:%M:%S UTC')
+            message = f"GitHub API rate limit exceeded. Please add a GitHub token or wait until {reset_at}."
+        super().__init__(message)
+
+
+class _Budget:
+    """Last known rate-limit state for one token"""
+    
+    __slots__ = ('limit', 'remaining', 'reset_time', 'next_slot', 'blocked_until', 'updated_at', 'in_flight',
+                 'reported_low')
+    
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_time = 0.0
+        self.next_slot = 0.0
+        self.blocked_until = 0.0
+        # When response headers last reported the budget (0: never)
+        self.updated_at = 0.0
+        # Reservations whose response has not been seen yet
+        self.in_flight = 0
+        # Lowest count reported in this window since in_flight was last zero
+        self.reported_low: Optional[int] = None
+
+
+class RateLimiter:
+    """Process-wide GitHub request scheduler driven by X-RateLimit-* headers
+    
+    Requests go out at full speed while the remaining budget is above
+    GITHUB_RATE_LIMIT_PACING_THRESHOLD (or 10% of the limit, if lower). Below
+    it, requests are spaced so the remaining budget is spread evenly until
+    the reset time, with no single wait longer than max_wait. Requests only
+    fail once the budget is spent or GitHub has asked us to back off.
+    
+    Every reservation is settled by update() with its response, or by
+    release() when no response arrived. 304 responses are free on GitHub, so
+    their reservation is given back.
+    """
+    
+    def __init__(self, pacing_threshold: Optional[int] = None, max_wait: Optional[float] = None):
+        self.pacing_threshold = pacing_threshold if pacing_threshold is not None else Config.GITHUB_RATE_LIMIT_PACING_THRESHOLD
+        self.max_wait = max_wait if max_wait is not None else Config.GITHUB_RATE_LIMIT_MAX_WAIT
+        self._lock = threading.Lock()
+        self._budgets: Dict[Hashable, _Budget] = {}
+    
+    def _threshold(self, budget: _Budget) -> int:
+        """Pacing threshold for a budget: at most 10% of its limit (anonymous limits are only 60)"""
+        if budget.limit:
+            return min(self.pacing_threshold, budget.limit // 10)
+        return self.pacing_threshold
+    
+    def _budget(self, token: Hashable) -> _Budget:
+        budget = self._budgets.get(token)
+        if budget is None:
+            budget = self._budgets[token] = _Budget()
+        return budget
+    
+    def acquire(self, token: Hashable = None) -> float:
+        """Reserve budget for one request, sleeping if pacing requires it
+        
+        Returns the number of seconds slept (at most max_wait). Raises
+        GitHubRateLimitError only when the budget is exhausted or blocked.
+        """
+        wait = self.reserve(token)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def reserve(self, token: Hashable = None) -> float:
+        """Reserve budget for one request and return how long the caller must wait
+        
+        Non-blocking counterpart of acquire() for asyncio callers. The caller
+        settles the reservation with update() or release().
+        """
+        with self._lock:
+            budget = self._budget(token)
+            now = time.time()
+            
+            if budget.blocked_until > now:
+                raise GitHubRateLimitError(budget.blocked_until)
+            
+            if budget.remaining is not None and budget.reset_time <= now:
+                # Window has rolled over; the next response will report the new budget
+                budget.remaining = None
+            
+            if budget.remaining is not None and budget.remaining <= 0:
+                raise GitHubRateLimitError(budget.reset_time)
+            
+            if budget.remaining is None or budget.remaining > self._threshold(budget):
+                wait = 0.0
+            else:
+                # Spread what is left until the reset, but never hold one request
+                # longer than max_wait: the budget can still cover it
+                interval = (budget.reset_time - now) / budget.remaining
+                wait = min(max(0.0, budget.next_slot - now), self.max_wait)
+                budget.next_slot = now + wait + interval
+            
+            if budget.remaining is not None:
+                budget.remaining -= 1
+            budget.in_flight += 1
+        
+        return wait
+    
+    def release(self, token: Hashable = None):
+        """Settle a reservation whose request got no response (e.g. a network error)"""
+        with self._lock:
+            budget = self._budget(token)
+            budget.in_flight = max(0, budget.in_flight - 1)
+    
+    def update(self, token: Hashable, headers: Mapping[str, str], status_code: int = 200,
+               body: bytes = b'', reserved: bool = True) -> Optional[GitHubRateLimitError]:
+        """Learn the budget from response headers
+        
+        Returns a GitHubRateLimitError if the response signals exhaustion
+        (primary or secondary limit), otherwise None. body is only inspected
+        for 403/429 responses that carry neither Retry-After nor a spent budget.
+        reserved is False for responses sent without reserve(), such as the
+        free /rate_limit endpoint.
+        """
+        remaining = _int_header(headers, 'X-RateLimit-Remaining')
+        reset_time = _int_header(headers, 'X-RateLimit-Reset')
+        limit = _int_header(headers, 'X-RateLimit-Limit')
+        retry_after = _int_header(headers, 'Retry-After')
+        
+        with self._lock:
+            budget = self._budget(token)
+            if reserved:
+                budget.in_flight = max(0, budget.in_flight - 1)
+                if status_code == 304 and budget.remaining is not None:
+                    # Not-modified answers do not count against the budget
+                    budget.remaining += 1
+            
+            if remaining is not None and reset_time is not None:
+                budget.updated_at = time.time()
+                if reset_time > budget.reset_time or budget.remaining is None:
+                    # New window: take the server's numbers as they are
+                    budget.remaining = remaining
+                    budget.reset_time = float(reset_time)
+                    budget.reported_low = remaining
+                elif reset_time == budget.reset_time:
+                    # Responses can arrive out of order, so the lowest reported count is the latest
+                    if budget.reported_low is not None:
+                        remaining = min(budget.reported_low, remaining)
+                    if budget.in_flight:
+                        # Our own pending reservations are not in that count yet
+                        budget.remaining = min(budget.remaining, remaining)
+                        budget.reported_low = remaining
+                    else:
+                        # Every reservation is settled: the server's count replaces our
+                        # estimate, even when higher (e.g. after requests that never arrived)
+                        budget.remaining = remaining
+                        budget.reported_low = None
+                if limit is not None:
+                    budget.limit = limit
+            
+            if status_code in (403, 429):
+                if retry_after is not None:
+                    budget.blocked_until = time.time() + retry_after
+                    return GitHubRateLimitError(budget.blocked_until)
+                if remaining == 0 and reset_time is not None:
+                    return GitHubRateLimitError(float(reset_time))
+                if b'rate limit' in (body or b'')[:2048].lower():
+                    # Secondary limit without Retry-After: GitHub asks for at least a minute
+                    budget.blocked_until = time.time() + SECONDARY_LIMIT_BACKOFF
+                    return GitHubRateLimitError(budget.blocked_until)
+        
+        return None
+    
+    def snapshot(self, token: Hashable = None) -> Dict:
+        """Return the last known budget for a token (updated_at is None until a response reports it)"""
+        with self._lock:
+            budget = self._budget(token)
+            return {
+                'limit': budget.limit,
+                'remaining': budget.remaining,
+                'reset_time': int(budget.reset_time),
+                'blocked_until': int(budget.blocked_until),
+                'updated_at': budget.updated_at or None
+            }
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter shared by all fetchers"""
+    global _limiter
+    
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    
+    return _limiter
@@ -0,0 +1,222 @@
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def parse_github_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GitHub ISO timestamp ('Z' suffix allowed) as an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_github_timestamp(moment: Optional[datetime]) -> str:
+    """Inverse of parse_github_timestamp ('' for missing dates)"""
+    if moment is None:
+        return ''
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _intern_languages(languages: Optional[Dict[str, int]]) -> Tuple[Tuple[str, int], ...]:
+    """Languages as (interned name, bytes) pairs; names repeat across thousands of repos"""
+    return tuple((sys.intern(name), amount) for name, amount in (languages or {}).items())
+
+
+class RepoRecord:
+    """One repository as used by analysis and profile generation
+    
+    Slotted and immutable by convention: language and topic names are
+    interned, languages are (name, bytes) pairs and timestamps are parsed
+    once. to_dict() returns the repository dict the API used to pass around.
+    """
+    
+    __slots__ = ('name', 'full_name', 'description', 'html_url', 'language', 'languages', 'stars', 'forks',
+                 'created_at', 'updated_at', 'readme_content', 'topics', 'size', 'open_issues', 'private')
+    
+    def __init__(self, name: str, full_name: str, description: Optional[str], html_url: str,
+                 language: Optional[str], languages: Tuple[Tuple[str, int], ...], stars: int, forks: int,
+                 created_at: Optional[datetime], updated_at: Optional[datetime], readme_content: str,
+                 topics: Tuple[str, ...], size: int, open_issues: int, private: bool):
+        self.name = name
+        self.full_name = full_name
+        self.description = description
+        self.html_url = html_url
+        self.language = sys.intern(language) if language else language
+        self.languages = languages
+        self.stars = stars
+        self.forks = forks
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.readme_content = readme_content
+        self.topics = topics
+        self.size = size
+        self.open_issues = open_issues
+        self.private = private
+    
+    @classmethod
+    def from_github(cls, repo: Dict, languages: Optional[Dict[str, int]] = None,
+                    readme_content: str = '') -> 'RepoRecord':
+        """Build a record from a REST list entry plus its (optional) details"""
+        return cls(
+            name=repo['name'],
+            full_name=repo['full_name'],
+            description=repo.get('description', ''),
+            html_url=repo['html_url'],
+            language=repo.get('language', ''),
+            languages=_intern_languages(languages),
+            stars=repo.get('stargazers_count', 0),
+            forks=repo.get('forks_count', 0),
+            created_at=parse_github_timestamp(repo['created_at']),
+            updated_at=parse_github_timestamp(repo['updated_at']),
+            readme_content=readme_content,
+            topics=tuple(sys.intern(topic) for topic in repo.get('topics', [])),
+            size=repo.get('size', 0),
+            open_issues=repo.get('open_issues_count', 0),
+            private=repo.get('private', False)
+        )
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RepoRecord':
+        """Inverse of to_dict()"""
+        return cls(
+            name=data['name'],
+            full_name=data.get('full_name') or data['name'],
+            description=data.get('description', ''),
+            html_url=data.get('html_url', ''),
+            language=data.get('language', ''),
+            languages=_intern_languages(data.get('languages')),
+            stars=data.get('stars', 0),
+            forks=data.get('forks', 0),
+            created_at=parse_github_timestamp(data.get('created_at')),
+            updated_at=parse_github_timestamp(data.get('updated_at')),
+            readme_content=data.get('readme_content', ''),
+            topics=tuple(sys.intern(topic) for topic in data.get('topics', [])),
+            size=data.get('size', 0),
+            open_issues=data.get('open_issues', 0),
+            private=data.get('private', False)
+        )
+    
+    @property
+    def language_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.languages)
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready repository dict"""
+        return {
+            'name': self.name,
+            'full_name': self.full_name,
+            'description': self.description,
+            'html_url': self.html_url,
+            'language': self.language,
+            'languages': dict(self.languages),
+            'stars': self.stars,
+            'forks': self.forks,
+            'created_at': format_github_timestamp(self.created_at),
+            'updated_at': format_github_timestamp(self.updated_at),
+            'readme_content': self.readme_content,
+            'topics': list(self.topics),
+            'size': self.size,
+            'open_issues': self.open_issues,
+            'private': self.private
+        }
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RepoRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"RepoRecord({self.full_name!r}, stars={self.stars})"
+
+
+class UserRecord:
+    """A GitHub user's profile fields, with created_at parsed once"""
+    
+    __slots__ = ('username', 'name', 'bio', 'location', 'public_repos', 'followers', 'following',
+                 'created_at', 'avatar_url')
+    
+    def __init__(self, username: str, name: Optional[str], bio: Optional[str], location: Optional[str],
+                 public_repos: int, followers: int, following: int, created_at: Optional[datetime],
+                 avatar_url: str):
+        self.username = username
+        self.name = name
+        self.bio = bio
+        self.location = location
+        self.public_repos = public_repos
+        self.followers = followers
+        self.following = following
+        self.created_at = created_at
+        self.avatar_url = avatar_url
+    
+    @classmethod
+    def from_github(cls, user_data: Dict) -> 'UserRecord':
+        """Build a record from a /users/{username} response"""
+        return cls(
+            username=user_data['login'],
+            name=user_data.get('name', ''),
+            bio=user_data.get('bio', ''),
+            location=user_data.get('location', ''),
+            public_repos=user_data.get('public_repos', 0),
+            followers=user_data.get('followers', 0),
+            following=user_data.get('following', 0),
+            created_at=parse_github_timestamp(user_data.get('created_at', '')),
+            avatar_url=user_data.get('avatar_url', '')
+        )
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'UserRecord':
+        """Inverse of to_dict()"""
+        return cls(
+            username=data['username'],
+            name=data.get('name', ''),
+            bio=data.get('bio', ''),
+            location=data.get('location', ''),
+            public_repos=data.get('public_repos', 0),
+            followers=data.get('followers', 0),
+            following=data.get('following', 0),
+            created_at=parse_github_timestamp(data.get('created_at')),
+            avatar_url=data.get('avatar_url', '')
+        )
+    
+    @property
+    def years_on_github(self) -> int:
+        """Whole years since the account was created (0 when unknown)"""
+        if self.created_at is None:
+            return 0
+        return (datetime.now(timezone.utc) - self.created_at).days // 365
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready user info dict"""
+        return {
+            'username': self.username,
+            'name': self.name,
+            'bio': self.bio,
+            'location': self.location,
+            'public_repos': self.public_repos,
+            'followers': self.followers,
+            'following': self.following,
+            'created_at': format_github_timestamp(self.created_at),
+            'avatar_url': self.avatar_url
+        }
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, UserRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"UserRecord({self.username!r})"
+
+
+def to_repo_records(repos: Iterable) -> Iterable[RepoRecord]:
+    """Accept records or legacy repository dicts"""
+    for repo in repos:
+        yield repo if isinstance(repo, RepoRecord) else RepoRecord.from_dict(repo)
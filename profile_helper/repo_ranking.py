@@ -0,0 +1,98 @@
+import math
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from config import Config
+
+# A scoring policy maps one list-endpoint repository dict to a number (higher ranks first)
+ScoringPolicy = Callable[[Dict], float]
+
+
+def _days_since(timestamp: Optional[str]) -> float:
+    """Days since a GitHub ISO timestamp (large when missing or invalid)"""
+    try:
+        moment = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return max(0.0, (datetime.now(timezone.utc) - moment).total_seconds() / 86400)
+    except Exception:
+        return 10000.0
+
+
+def score_balanced(repo: Dict) -> float:
+    """Stars and forks first, then recent activity and how well documented the repo is"""
+    score = 3 * math.log1p(repo.get('stargazers_count', 0))
+    score += 2 * math.log1p(repo.get('forks_count', 0))
+    score += 2 * math.exp(-_days_since(repo.get('pushed_at')) / 180)
+    if repo.get('description'):
+        score += 1
+    score += 0.25 * min(len(repo.get('topics') or []), 4)
+    # Empty repositories rank last among otherwise equal ones
+    score += 0.25 * math.log10(1 + repo.get('size', 0))
+    return score
+
+
+def score_stars(repo: Dict) -> float:
+    """Most starred first, forks as the tie-breaker"""
+    return repo.get('stargazers_count', 0) + repo.get('forks_count', 0) / 1000
+
+
+def score_recent(repo: Dict) -> float:
+    """Most recently pushed first"""
+    return -_days_since(repo.get('pushed_at'))
+
+
+SCORING_POLICIES: Dict[str, ScoringPolicy] = {
+    'balanced': score_balanced,
+    'stars': score_stars,
+    'recent': score_recent
+}
+
+
+def register_scoring_policy(name: str, policy: ScoringPolicy):
+    """Make a scoring policy selectable by name (e.g. through REPO_SCORING_POLICY)"""
+    SCORING_POLICIES[name] = policy
+
+
+def get_scoring_policy(policy: Union[str, ScoringPolicy, None] = None) -> ScoringPolicy:
+    """Resolve a policy name or callable, defaulting to Config.REPO_SCORING_POLICY"""
+    if callable(policy):
+        return policy
+    
+    name = policy or Config.REPO_SCORING_POLICY
+    if name not in SCORING_POLICIES:
+        raise Exception(f"Unknown repository scoring policy '{name}'. Available: {', '.join(sorted(SCORING_POLICIES))}")
+    return SCORING_POLICIES[name]
+
+
+def rank_repos(candidates: List[Dict], max_repos: int, detail_limit: int,
+               policy: Union[str, ScoringPolicy, None] = None) -> Tuple[List[Dict], List[Dict]]:
+    """Pick max_repos candidates by score and split them into (detailed, languages-only)
+    
+    Only list-endpoint fields are read, so ranking costs no extra requests.
+    Every selected repo gets a languages request (analysis needs the byte
+    counts); only the first detail_limit (all when 0) also get a README
+    request. sorted() is stable, so ties keep list order.
+    """
+    score = get_scoring_policy(policy)
+    ranked = sorted(candidates, key=score, reverse=True)[:max_repos]
+    
+    if detail_limit <= 0:
+        return ranked, []
+    return ranked[:detail_limit], ranked[detail_limit:]
+
+
+def selection_stats(candidates: int, detailed: int, languages_only: int, include_readme: bool,
+                    reused: int = 0, reused_languages_only: int = 0) -> Dict:
+    """Summarize one selection, counting the README and languages calls not made
+    
+    detailed repos get README and languages, languages_only repos skip the
+    README. reused and reused_languages_only count repos of each group
+    served from the repository store.
+    """
+    calls_per_repo = 2 if include_readme else 1
+    readme_calls_skipped = languages_only if include_readme else 0
+    return {
+        'candidates': candidates,
+        'selected': detailed + languages_only,
+        'detailed': detailed,
+        'details_reused': reused + reused_languages_only,
+        'detail_calls_saved': readme_calls_skipped + reused * calls_per_repo + reused_languages_only
+    }
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import Config
+from .db import connect_sqlite
+
+
+class RepoStore:
+    """Persistent user and repository records for incremental sync
+    
+    Repositories are keyed by full_name, so an org repository listed for
+    several users is stored and detailed once. Each row keeps the raw list
+    entry plus the languages/README fetched for it. Details are dropped
+    whenever pushed_at or updated_at changes. Which repositories belong to a
+    user is stored per auth scope, so private repositories seen with a
+    caller token are never listed for anonymous requests. A user's list is
+    fully relisted once it is older than max_age, which drops deleted,
+    renamed and transferred repositories.
+    """
+    
+    def __init__(self, database_url: Optional[str] = None, max_age: Optional[float] = None):
+        self.max_age = max_age if max_age is not None else Config.REPO_STORE_MAX_AGE
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(database_url)
+        if self._conn is None:
+            raise ValueError("Repository store requires a sqlite:/// DATABASE_URL")
+        
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS github_repos (
+                full_name TEXT PRIMARY KEY,
+                pushed_at TEXT,
+                updated_at TEXT,
+                listing TEXT NOT NULL,
+                languages TEXT,
+                readme_content TEXT,
+                details_synced_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS github_user_repos (
+                username TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                full_name TEXT NOT NULL,
+                PRIMARY KEY (username, scope, full_name)
+            );
+            CREATE TABLE IF NOT EXISTS github_user_listings (
+                username TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                listed_at REAL NOT NULL,
+                PRIMARY KEY (username, scope)
+            );
+            CREATE TABLE IF NOT EXISTS github_users (
+                username TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+        
+        self.stats = {'listings_stored': 0, 'details_reused': 0, 'details_stored': 0}
+    
+    @staticmethod
+    def make_scope(github_token: Optional[str]) -> str:
+        """Membership scope for an auth context (caller tokens may see private repos)"""
+        return hashlib.sha256(github_token.encode()).hexdigest() if github_token else 'public'
+    
+    def get_user_repo_names(self, username: str, scope: str) -> List[str]:
+        """Return the stored repository full_names for a user, most recently updated first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT full_name FROM github_user_repos WHERE username = ? AND scope = ? ORDER BY position",
+                (username.lower(), scope)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def is_listing_current(self, username: str, scope: str) -> bool:
+        """True when the user's list was fully relisted within max_age"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT listed_at FROM github_user_listings WHERE username = ? AND scope = ?",
+                (username.lower(), scope)
+            ).fetchone()
+        return row is not None and time.time() - row[0] <= self.max_age
+    
+    def set_user_repo_names(self, username: str, scope: str, full_names: List[str], complete: bool = False):
+        """Replace a user's repository list for one scope
+        
+        complete marks a list that was checked against GitHub in full, which
+        restarts its max_age.
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM github_user_repos WHERE username = ? AND scope = ?", (username.lower(), scope)
+            )
+            self._conn.executemany(
+                "INSERT INTO github_user_repos (username, scope, position, full_name) VALUES (?, ?, ?, ?)",
+                [(username.lower(), scope, position, name) for position, name in enumerate(full_names)]
+            )
+            if complete:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO github_user_listings (username, scope, listed_at) VALUES (?, ?, ?)",
+                    (username.lower(), scope, time.time())
+                )
+            self._conn.commit()
+    
+    def forget_repos(self, full_names: Iterable[str]):
+        """Delete repositories GitHub no longer serves, and remove them from every user's list"""
+        names = [(name,) for name in full_names]
+        if not names:
+            return
+        
+        with self._lock:
+            self._conn.executemany("DELETE FROM github_repos WHERE full_name = ?", names)
+            self._conn.executemany("DELETE FROM github_user_repos WHERE full_name = ?", names)
+            self._conn.commit()
+    
+    def is_current(self, repo: Dict) -> bool:
+        """True when the stored list entry has the same pushed_at and updated_at"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pushed_at, updated_at FROM github_repos WHERE full_name = ?", (repo['full_name'],)
+            ).fetchone()
+        return row is not None and row == (repo.get('pushed_at'), repo.get('updated_at'))
+    
+    def save_listings(self, repos: Iterable[Dict]):
+        """Store list entries, dropping details of repositories that changed"""
+        with self._lock:
+            for repo in repos:
+                stamps = (repo.get('pushed_at'), repo.get('updated_at'))
+                row = self._conn.execute(
+                    "SELECT pushed_at, updated_at FROM github_repos WHERE full_name = ?", (repo['full_name'],)
+                ).fetchone()
+                
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO github_repos (full_name, pushed_at, updated_at, listing) VALUES (?, ?, ?, ?)",
+                        (repo['full_name'], *stamps, json.dumps(repo))
+                    )
+                elif row == stamps:
+                    self._conn.execute(
+                        "UPDATE github_repos SET listing = ? WHERE full_name = ?", (json.dumps(repo), repo['full_name'])
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE github_repos SET pushed_at = ?, updated_at = ?, listing = ?, languages = NULL, "
+                        "readme_content = NULL, details_synced_at = NULL WHERE full_name = ?",
+                        (*stamps, json.dumps(repo), repo['full_name'])
+                    )
+                self.stats['listings_stored'] += 1
+            self._conn.commit()
+    
+    def get_listings(self, full_names: List[str]) -> List[Dict]:
+        """Return stored list entries in the given order, skipping unknown names"""
+        if not full_names:
+            return []
+        
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT full_name, listing FROM github_repos WHERE full_name IN ({', '.join('?' * len(full_names))})",
+                full_names
+            ).fetchall()
+        listings = {name: json.loads(listing) for name, listing in rows}
+        return [listings[name] for name in full_names if name in listings]
+    
+    def get_details(self, full_name: str, include_readme: bool) -> Optional[Tuple[Dict[str, int], str]]:
+        """Return stored (languages, readme_content) if still valid for this request"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT languages, readme_content, details_synced_at FROM github_repos WHERE full_name = ?",
+                (full_name,)
+            ).fetchone()
+            
+            if row is None or row[0] is None or time.time() - row[2] > self.max_age:
+                return None
+            # Details stored without a README cannot serve a request that wants one
+            if include_readme and row[1] is None:
+                return None
+            
+            self.stats['details_reused'] += 1
+        readme_content = (row[1] or '') if include_readme else ''
+        return json.loads(row[0]), readme_content
+    
+    def save_details(self, full_name: str, languages: Dict[str, int], readme_content: Optional[str]):
+        """Store languages and README for a repository (readme_content=None when not fetched)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE github_repos SET languages = ?, readme_content = COALESCE(?, readme_content), "
+                "details_synced_at = ? WHERE full_name = ?",
+                (json.dumps(languages), readme_content, time.time(), full_name)
+            )
+            self.stats['details_stored'] += 1
+            self._conn.commit()
+    
+    def get_user(self, username: str) -> Optional[Dict]:
+        """Return the last stored user record"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM github_users WHERE username = ?", (username.lower(),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def save_user(self, username: str, record: Dict):
+        """Store a normalized user record (as returned by get_user_info)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO github_users (username, record, synced_at) VALUES (?, ?, ?)",
+                (username.lower(), json.dumps(record), time.time())
+            )
+            self._conn.commit()
+    
+    def get_stats(self) -> Dict:
+        """Return counters plus row counts"""
+        with self._lock:
+            repos = self._conn.execute("SELECT COUNT(*) FROM github_repos").fetchone()[0]
+            users = self._conn.execute("SELECT COUNT(*) FROM github_users").fetchone()[0]
+            stats = dict(self.stats)
+        
+        stats.update({'repos': repos, 'users': users})
+        return stats
+
+
+_store: Optional[RepoStore] = None
+_store_lock = threading.Lock()
+
+
+def get_repo_store() -> Optional[RepoStore]:
+    """Return the process-wide repository store, or None when disabled"""
+    global _store
+    
+    if not Config.REPO_STORE_ENABLED:
+        return None
+    
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = RepoStore()
+                except Exception as e:
+                    print(f"Repository store disabled: {e}")
+                    Config.REPO_STORE_ENABLED = False
+                    return None
+    
+    return _store
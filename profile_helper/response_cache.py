@@ -0,0 +1,211 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+import requests
+from requests.structures import CaseInsensitiveDict
+from config import Config
+from .db import connect_sqlite
+
+# Response headers worth replaying from a cached entry
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+# Seconds between last_access writes for one entry; LRU order only needs to be roughly right
+ACCESS_UPDATE_INTERVAL = 60
+
+
+class ResponseCache:
+    """Persistent ETag / Last-Modified cache for GitHub API responses"""
+    
+    def __init__(self, database_url: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.GITHUB_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(database_url)
+        if self._conn is None:
+            raise ValueError("Response cache requires a sqlite:/// DATABASE_URL")
+        
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS github_response_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_github_response_cache_access "
+            "ON github_response_cache (last_access)"
+        )
+        self._conn.commit()
+        
+        self.stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'stores': 0, 'evictions': 0}
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict], scope: Optional[str]) -> str:
+        """Build a cache key from the URL, query params and auth scope"""
+        # Different tokens can see different (private) data, so the scope is part of the key
+        scope = hashlib.sha256(scope.encode()).hexdigest() if scope else 'anonymous'
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{scope}|{url}|{query}".encode()).hexdigest()
+    
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a cached entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM github_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row is None:
+            return {}
+        
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+    
+    def handle_response(self, key: str, url: str, response: requests.Response, revalidated: bool,
+                        body: Optional[bytes] = None) -> requests.Response:
+        """Serve a 304 from cache or store a fresh 200, updating counters
+        
+        body overrides response.content, e.g. for a streamed body read up to a cap.
+        """
+        status, headers, body = self.handle_raw(
+            key, url, response.status_code, response.headers,
+            response.content if body is None else body, revalidated
+        )
+        if status == response.status_code:
+            return response
+        
+        cached = requests.Response()
+        cached.status_code = status
+        cached.url = url
+        cached.headers = CaseInsensitiveDict(headers)
+        cached._content = body
+        cached.encoding = 'utf-8'
+        return cached
+    
+    def handle_raw(self, key: str, url: str, status: int, headers: Mapping[str, str], body: bytes,
+                   revalidated: bool) -> Tuple[int, Mapping[str, str], bytes]:
+        """Client-agnostic form of handle_response for (status, headers, body) triples"""
+        with self._lock:
+            if revalidated:
+                self.stats['revalidations'] += 1
+        
+        if status == 304:
+            cached = self._load(key)
+            if cached is not None:
+                with self._lock:
+                    self.stats['hits'] += 1
+                return 200, cached[0], cached[1]
+        
+        with self._lock:
+            self.stats['misses'] += 1
+        
+        if status == 200:
+            self._store(key, url, headers, body)
+        
+        return status, headers, body
+    
+    def _load(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Return the cached headers and body for a key"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, last_access FROM github_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            # Hits are the hot path, so only write when the stamp is noticeably stale
+            if now - row[2] >= ACCESS_UPDATE_INTERVAL:
+                self._conn.execute(
+                    "UPDATE github_response_cache SET last_access = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+        
+        return json.loads(row[0]), bytes(row[1])
+    
+    def _store(self, key: str, url: str, response_headers: Mapping[str, str], body: bytes):
+        """Persist a 200 response that carries a validator"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        if len(body) > self.max_bytes:
+            return
+        
+        headers = {name: response_headers[name] for name in CACHED_HEADERS if name in response_headers}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO github_response_cache "
+                "(key, url, etag, last_modified, headers, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, json.dumps(headers), body, len(body), time.time())
+            )
+            self.stats['stores'] += 1
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes (lock held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM github_response_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = self._conn.execute(
+            "SELECT key, size FROM github_response_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM github_response_cache WHERE key = ?", (key,))
+            total -= size
+            self.stats['evictions'] += 1
+    
+    def get_stats(self) -> Dict:
+        """Return counters plus current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM github_response_cache"
+            ).fetchone()
+            stats = dict(self.stats)
+        
+        stats.update({'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes})
+        return stats
+    
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM github_response_cache")
+            self._conn.commit()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None when disabled"""
+    global _cache
+    
+    if not Config.GITHUB_CACHE_ENABLED:
+        return None
+    
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = ResponseCache()
+                except Exception as e:
+                    print(f"GitHub response cache disabled: {e}")
+                    Config.GITHUB_CACHE_ENABLED = False
+                    return None
+    
+    return _cache
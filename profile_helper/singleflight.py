@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight computation and its outcome"""
+    
+    __slots__ = ('done', 'result', 'error', 'waiters')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution
+    
+    The first caller for a key runs fn; callers arriving while it runs wait
+    and receive the same result, or the same exception re-raised.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {'executions': 0, 'coalesced': 0}
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the identical call already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats['executions'] += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a fresh execution instead of reusing this one
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    def get_stats(self) -> Dict:
+        """Return execution and coalescing counters"""
+        with self._lock:
+            return {**self.stats, 'in_flight': len(self._calls)}
+
+
+# Shared groups: whole profile builds and individual GitHub GETs
+profile_flight = SingleFlight()
+github_request_flight = SingleFlight()
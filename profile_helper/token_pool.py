@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from config import Config
+from .rate_limiter import get_rate_limiter
+
+
+class TokenPool:
+    """Rotates requests across several service GitHub tokens by remaining budget"""
+    
+    def __init__(self, tokens: Iterable[str]):
+        # Keep configuration order but drop duplicates and blanks
+        self.tokens: List[str] = list(dict.fromkeys(token for token in tokens if token))
+        self._invalid = set()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.tokens)
+    
+    def choose(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """Return the usable token with the most remaining budget, or None"""
+        excluded = set(exclude)
+        limiter = get_rate_limiter()
+        now = time.time()
+        best_token = None
+        best_remaining = -1
+        
+        with self._lock:
+            candidates = [token for token in self.tokens if token not in self._invalid and token not in excluded]
+        
+        for token in candidates:
+            budget = limiter.snapshot(token)
+            if budget['blocked_until'] > now:
+                continue
+            
+            remaining = budget['remaining']
+            if remaining is None or budget['reset_time'] <= now:
+                # Unknown or rolled-over budget: assume a full window
+                remaining = budget['limit'] or 5000
+            if remaining <= 0:
+                continue
+            
+            if remaining > best_remaining:
+                best_token = token
+                best_remaining = remaining
+        
+        return best_token
+    
+    def mark_invalid(self, token: str):
+        """Stop using a token that GitHub rejected with 401"""
+        with self._lock:
+            self._invalid.add(token)
+        print(f"Warning: GitHub token {mask_token(token)} was rejected (401) and has been disabled")
+    
+    def status(self) -> List[Dict]:
+        """Return per-token budget for reporting"""
+        limiter = get_rate_limiter()
+        with self._lock:
+            invalid = set(self._invalid)
+        
+        return [
+            {'token': mask_token(token), 'valid': token not in invalid, **limiter.snapshot(token)}
+            for token in self.tokens
+        ]
+
+
+def mask_token(token: str) -> str:
+    """Show only the last four characters of a token"""
+    return f"...{token[-4:]}" if token else ''
+
+
+_pool: Optional[TokenPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_token_pool() -> TokenPool:
+    """Return the process-wide pool of service tokens from Config"""
+    global _pool
+    
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TokenPool(Config.GITHUB_TOKENS + [Config.GITHUB_TOKEN])
+    
+    return _pool
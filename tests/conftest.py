@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from profile_helper import rate_limiter, repo_store, response_cache, token_pool
+
+
+@pytest.fixture
+def isolated_config(monkeypatch, tmp_path):
+    """Point Config at a temporary database with caches off and fresh process-wide singletons"""
+    monkeypatch.setattr(Config, 'DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, 'GITHUB_TOKEN', None)
+    monkeypatch.setattr(Config, 'GITHUB_TOKENS', [])
+    monkeypatch.setattr(Config, 'GITHUB_FETCH_BACKEND', 'rest')
+    monkeypatch.setattr(Config, 'GITHUB_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'REPO_STORE_ENABLED', False)
+    monkeypatch.setattr(rate_limiter, '_limiter', None)
+    monkeypatch.setattr(token_pool, '_pool', None)
+    monkeypatch.setattr(response_cache, '_cache', None)
+    monkeypatch.setattr(repo_store, '_store', None)
+    return tmp_path
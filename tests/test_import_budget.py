@@ -0,0 +1,21 @@
+import os
+import statistics
+
+from benchmarks.import_budget import DEFAULT_LAZY, measure
+
+# Median cold import of the app, in milliseconds (override on slow CI machines)
+BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '500'))
+
+
+def test_app_import_stays_within_budget():
+    # The first run warms the bytecode cache
+    measure('app')
+    runs = [measure('app')[0] for _ in range(3)]
+    
+    assert statistics.median(runs) * 1000 <= BUDGET_MS
+
+
+def test_optional_clients_load_lazily():
+    _, modules, _ = measure('app')
+    
+    assert [name for name in DEFAULT_LAZY if name in modules] == []
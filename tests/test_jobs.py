@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+
+import pytest
+
+from profile_helper import jobs
+from profile_helper.jobs import JobQueue, JobQueueFull
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Replace profile builds with a short sleep and record which jobs ran"""
+    calls = []
+    lock = threading.Lock()
+    
+    def build(username, github_token, max_repos, include_readme, force_refresh, progress=None):
+        with lock:
+            calls.append(username)
+        time.sleep(0.5)
+        return {'username': username}, {'hit': False}
+    
+    monkeypatch.setattr(jobs, 'generate_cached_profile', build)
+    return calls
+
+
+def make_queue(database_url, **kwargs):
+    return JobQueue(workers=1, database_url=database_url, heartbeat_interval=0.1, stale_after=1.0, **kwargs)
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def orphan(queue, job_id, username, has_token=False, heartbeat_age=60.0):
+    """Insert a running job owned by a process that stopped heartbeating"""
+    record = {
+        'job_id': job_id, 'status': 'running', 'stage': 'repo_list', 'progress': {},
+        'params': {'github_username': username, 'max_repos': 5, 'include_readme': True, 'force_refresh': False},
+        'has_token': has_token, 'created_at': time.time(), 'started_at': time.time(), 'finished_at': None,
+        'status_code': None, 'error': None, 'result': None
+    }
+    with queue._lock:
+        queue._conn.execute(
+            "INSERT INTO profile_jobs (job_id, status, record, created_at, finished_at, owner, heartbeat) "
+            "VALUES (?, 'running', ?, ?, NULL, 'gone', ?)",
+            (job_id, json.dumps(record), record['created_at'], time.time() - heartbeat_age)
+        )
+        queue._conn.commit()
+
+
+def test_live_processes_do_not_take_each_others_jobs(tmp_path, builds):
+    database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    first = make_queue(database_url)
+    job_ids = [first.submit(f'user-{i}', None, 5)['job_id'] for i in range(3)]
+    
+    second = make_queue(database_url)
+    assert wait_for(lambda: all(first.get(job_id)['status'] == 'succeeded' for job_id in job_ids))
+    
+    assert second._active == {}
+    assert sorted(builds) == ['user-0', 'user-1', 'user-2']
+
+
+def test_jobs_of_a_stopped_process_run_once(tmp_path, builds):
+    database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    first = make_queue(database_url)
+    second = make_queue(database_url)
+    orphan(first, 'orphan', 'lost-user')
+    
+    assert wait_for(lambda: first.get('orphan')['status'] == 'succeeded')
+    time.sleep(0.5)
+    
+    assert builds == ['lost-user']
+
+
+def test_recent_heartbeat_is_left_alone(tmp_path, builds):
+    queue = make_queue(f"sqlite:///{tmp_path / 'jobs.db'}")
+    orphan(queue, 'busy', 'busy-user', heartbeat_age=0.0)
+    time.sleep(0.5)
+    
+    assert queue.get('busy')['status'] == 'running'
+    assert builds == []
+
+
+def test_orphaned_caller_token_job_fails(tmp_path, builds):
+    queue = make_queue(f"sqlite:///{tmp_path / 'jobs.db'}")
+    orphan(queue, 'private', 'private-user', has_token=True)
+    
+    assert wait_for(lambda: queue.get('private')['status'] == 'failed')
+    assert queue.get('private')['status_code'] == 503
+    assert builds == []
+
+
+def test_jobs_survive_a_restart(tmp_path, builds):
+    database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    queue = make_queue(database_url)
+    job_id = queue.submit('restart-user', None, 5)['job_id']
+    assert wait_for(lambda: queue.get(job_id)['status'] == 'succeeded')
+    
+    restarted = make_queue(database_url)
+    job = restarted.get(job_id)
+    assert job['status'] == 'succeeded'
+    assert job['result']['username'] == 'restart-user'
+    assert 'has_token' not in job
+
+
+def test_submit_applies_backpressure(tmp_path, builds):
+    queue = make_queue(f"sqlite:///{tmp_path / 'jobs.db'}", max_queued=1)
+    first = queue.submit('first', None, 5)['job_id']
+    assert wait_for(lambda: queue.get(first)['status'] == 'running')
+    queue.submit('second', None, 5)
+    
+    # One job is running and one is waiting
+    with pytest.raises(JobQueueFull):
+        queue.submit('third', None, 5)
@@ -0,0 +1,85 @@
+import pytest
+
+from profile_helper.keyword_matcher import KEYWORDS, extract_readme_signals
+
+# Common GitHub topic spellings
+TOPICS = [
+    'html5', 'css3', 'scss', 'tailwindcss', 'tailwind', 'bootstrap4', 'bootstrap5', 'react', 'reactjs',
+    'react-native', 'reactnative', 'vue3', 'vuejs', 'angular2', 'angularjs', 'svelte', 'node', 'nodejs',
+    'node-js', 'node.js', 'nodemon', 'express', 'expressjs', 'django', 'djangorestframework', 'flask',
+    'flask-api', 'springboot', 'spring-boot', 'springframework', 'postgres', 'postgresql', 'mysql', 'mongodb',
+    'mongoose', 'mongodb-atlas', 'redis', 'docker', 'dockerfile', 'dockerhub', 'docker-compose', 'kubernetes',
+    'aws', 'aws-lambda', 'azure', 'azure-functions', 'heroku', 'python', 'python3', 'javascript', 'typescript',
+    'machine-learning', 'pandas', 'webpack', 'graphql', 'rest-api', 'selenium'
+]
+
+
+def substring_category(technology):
+    """The substring rules KeywordMatcher replaced"""
+    technology = technology.lower()
+    if any(tech in technology for tech in ['react', 'vue', 'angular', 'html', 'css', 'bootstrap']):
+        return "Frontend"
+    elif any(tech in technology for tech in ['node', 'express', 'django', 'flask', 'spring']):
+        return "Backend"
+    elif any(tech in technology for tech in ['postgres', 'mysql', 'mongo', 'redis']):
+        return "Database"
+    elif any(tech in technology for tech in ['docker', 'kubernetes', 'aws', 'azure', 'heroku']):
+        return "DevOps"
+    return "Tools"
+
+
+@pytest.mark.parametrize('topic', [topic for topic in TOPICS if substring_category(topic) != 'Tools'])
+def test_categories_match_the_substring_baseline(topic):
+    assert KEYWORDS.categorize_technology(topic) == substring_category(topic)
+
+
+@pytest.mark.parametrize('topic, category', [
+    ('terraform', 'DevOps'), ('fastapi', 'Backend'), ('sqlite', 'Database'), ('k8s', 'DevOps'), ('pandas', 'Tools')
+])
+def test_categories_beyond_the_baseline(topic, category):
+    assert KEYWORDS.categorize_technology(topic) == category
+
+
+@pytest.mark.parametrize('description, expected', [
+    ('A python3 scraper', {'python'}),
+    ('REST API built with expressjs and MongoDB', {'express', 'mongodb'}),
+    ('Dashboard in React.js with a Node.js backend', {'react', 'node.js'}),
+    ('Legacy angularjs admin panel', {'angular'}),
+    ('Deployed on AWS with Docker', {'aws', 'docker'})
+])
+def test_description_technologies(description, expected):
+    technologies, _ = KEYWORDS.match('project', description, [])
+    assert expected <= technologies
+
+
+@pytest.mark.parametrize('description, unexpected', [
+    ('Helps maintain old servers', 'ai'),
+    ('A javascript bundler', 'java'),
+    ('Expressive logging', 'express')
+])
+def test_whole_words_only(description, unexpected):
+    technologies, _ = KEYWORDS.match('project', description, [])
+    assert unexpected not in technologies
+
+
+def test_topics_are_technologies_and_pick_the_project_type():
+    technologies, project_type = KEYWORDS.match('shop', 'Storefront', ['Flutter', 'firebase'])
+    
+    assert {'flutter', 'firebase'} <= technologies
+    assert project_type == 'Mobile Application'
+
+
+def test_project_type_priority_follows_the_keyword_order():
+    # 'web' (Web Application) outranks 'api' (API/Backend)
+    assert KEYWORDS.match('web-api', None, [])[1] == 'Web Application'
+    assert KEYWORDS.match('notes', 'Plain notes', [])[1] == 'Other'
+
+
+def test_readme_prose_is_ignored_but_install_commands_count():
+    readme = "Unlike Django, this is tiny.\n\n```\npip install flask redis\n```\n"
+    
+    technologies, _ = KEYWORDS.match('tiny', None, [], readme)
+    
+    assert {'flask', 'redis'} <= technologies
+    assert 'django' not in technologies
+    assert 'Unlike' not in extract_readme_signals(readme)
@@ -0,0 +1,140 @@
+import time
+
+import pytest
+
+from profile_helper.rate_limiter import SECONDARY_LIMIT_BACKOFF, GitHubRateLimitError, RateLimiter
+
+
+def headers(remaining, reset_time, limit=5000):
+    return {
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(int(reset_time)),
+        'X-RateLimit-Limit': str(limit)
+    }
+
+
+@pytest.fixture
+def reset_time():
+    return time.time() + 3600
+
+
+def test_not_modified_responses_do_not_drain_the_budget(reset_time):
+    limiter = RateLimiter(pacing_threshold=0)
+    limiter.update(None, headers(10, reset_time), reserved=False)
+    
+    # GitHub keeps reporting 10: 304s are free
+    for _ in range(30):
+        limiter.reserve()
+        limiter.update(None, headers(10, reset_time), 304)
+    
+    assert limiter.snapshot()['remaining'] == 10
+
+
+def test_out_of_order_responses_keep_the_lowest_count(reset_time):
+    limiter = RateLimiter(pacing_threshold=0)
+    limiter.update(None, headers(10, reset_time), reserved=False)
+    limiter.reserve()
+    limiter.reserve()
+    
+    limiter.update(None, headers(8, reset_time))
+    # Sent first, answered last: its count is stale
+    limiter.update(None, headers(9, reset_time))
+    
+    assert limiter.snapshot()['remaining'] == 8
+
+
+def test_settled_budget_takes_the_server_count(reset_time):
+    limiter = RateLimiter(pacing_threshold=0)
+    limiter.update(None, headers(10, reset_time), reserved=False)
+    
+    # A request that never got a response may or may not have been counted
+    limiter.reserve()
+    limiter.release()
+    assert limiter.snapshot()['remaining'] == 9
+    
+    limiter.reserve()
+    limiter.update(None, headers(9, reset_time))
+    assert limiter.snapshot()['remaining'] == 9
+
+
+def test_pending_reservations_stay_subtracted(reset_time):
+    limiter = RateLimiter(pacing_threshold=0)
+    limiter.update(None, headers(10, reset_time), reserved=False)
+    for _ in range(3):
+        limiter.reserve()
+    
+    limiter.update(None, headers(9, reset_time))
+    
+    # Two requests are still in flight
+    assert limiter.snapshot()['remaining'] == 7
+
+
+def test_pacing_waits_at_most_max_wait_while_budget_is_left(reset_time):
+    limiter = RateLimiter(pacing_threshold=100, max_wait=0.5)
+    limiter.update(None, headers(10, reset_time), reserved=False)
+    
+    waits = [limiter.reserve() for _ in range(10)]
+    
+    assert waits[0] == 0.0
+    assert all(0.0 <= wait <= 0.5 for wait in waits)
+    assert max(waits) == 0.5
+    with pytest.raises(GitHubRateLimitError):
+        limiter.reserve()
+
+
+def test_pacing_threshold_is_capped_at_a_tenth_of_the_limit(reset_time):
+    limiter = RateLimiter(pacing_threshold=500, max_wait=1.0)
+    limiter.update(None, headers(30, reset_time, limit=60), reserved=False)
+    
+    # 30 is above 60 // 10, so no pacing yet
+    assert limiter.reserve() == 0.0
+
+
+def test_spent_budget_raises_with_the_reset_time(reset_time):
+    limiter = RateLimiter()
+    limiter.reserve()
+    error = limiter.update(None, headers(0, reset_time), 403)
+    
+    assert isinstance(error, GitHubRateLimitError)
+    assert error.reset_time == int(reset_time)
+    with pytest.raises(GitHubRateLimitError):
+        limiter.reserve()
+
+
+def test_secondary_limit_body_blocks_the_bucket():
+    limiter = RateLimiter()
+    limiter.reserve()
+    error = limiter.update(None, {}, 403, b'{"message": "You have exceeded a secondary rate limit"}')
+    
+    assert error is not None
+    assert error.retry_after == pytest.approx(SECONDARY_LIMIT_BACKOFF, abs=2)
+    with pytest.raises(GitHubRateLimitError):
+        limiter.reserve()
+
+
+def test_forbidden_without_rate_limit_signal_is_not_a_rate_limit():
+    limiter = RateLimiter()
+    limiter.reserve()
+    
+    assert limiter.update(None, {}, 403, b'{"message": "Resource not accessible by integration"}') is None
+    assert limiter.reserve() == 0.0
+
+
+def test_new_window_replaces_the_budget(reset_time):
+    limiter = RateLimiter(pacing_threshold=0)
+    limiter.update(None, headers(1, reset_time), reserved=False)
+    limiter.reserve()
+    limiter.update(None, headers(4999, reset_time + 3600))
+    
+    snapshot = limiter.snapshot()
+    assert snapshot['remaining'] == 4999
+    assert snapshot['reset_time'] == int(reset_time + 3600)
+
+
+def test_buckets_are_independent(reset_time):
+    limiter = RateLimiter()
+    limiter.update('a', headers(0, reset_time), reserved=False)
+    
+    with pytest.raises(GitHubRateLimitError):
+        limiter.reserve('a')
+    assert limiter.reserve('b') == 0.0
@@ -0,0 +1,97 @@
+import pytest
+
+from config import Config
+from benchmarks.github_stub import GitHubStubServer, make_fixture
+from profile_helper.github_fetcher import GitHubFetcher
+from profile_helper.repo_store import get_repo_store
+
+
+def own_repos_fixture(username, count):
+    """Synthetic account whose repositories are all non-forks"""
+    fixture = make_fixture(username, count)
+    for key, response in fixture.items():
+        if key.startswith(f'GET /users/{username}/repos'):
+            for repo in response['body']:
+                repo['fork'] = False
+    return fixture
+
+
+def list_key(username, page=1):
+    return f'GET /users/{username}/repos' + (f'?page={page}' if page > 1 else '')
+
+
+@pytest.fixture
+def github(isolated_config, monkeypatch):
+    """Start a stub for a 120-repo account with the repository store enabled"""
+    server = GitHubStubServer(own_repos_fixture('alice', 120)).start()
+    monkeypatch.setattr(Config, 'GITHUB_API_BASE_URL', server.url)
+    monkeypatch.setattr(Config, 'REPO_STORE_ENABLED', True)
+    monkeypatch.setattr(Config, 'REPO_DETAIL_LIMIT', 1)
+    yield server
+    server.stop()
+
+
+def names(listings):
+    return [listing['full_name'] for listing in listings]
+
+
+def test_sync_returns_limit_entries_as_the_limit_grows(github):
+    store = get_repo_store()
+    fetcher = GitHubFetcher()
+    listed = names(github.fixture[list_key('alice')]['body'] + github.fixture[list_key('alice', 2)]['body'])
+    
+    for limit in (10, 80, 80, 120, 10):
+        assert names(fetcher._sync_repo_listings(store, 'alice', limit)) == listed[:limit]
+
+
+def test_unchanged_listing_stops_after_the_first_page(github):
+    store = get_repo_store()
+    fetcher = GitHubFetcher()
+    fetcher._sync_repo_listings(store, 'alice', 30)
+    
+    before = github.request_count
+    assert len(fetcher._sync_repo_listings(store, 'alice', 30)) == 30
+    assert github.request_count - before == 1
+
+
+def test_stale_listing_is_relisted_without_deleted_repos(github):
+    store = get_repo_store()
+    fetcher = GitHubFetcher()
+    victim = fetcher._sync_repo_listings(store, 'alice', 30)[25]['full_name']
+    
+    page = github.fixture[list_key('alice')]
+    page['body'] = [repo for repo in page['body'] if repo['full_name'] != victim]
+    
+    # Within REPO_STORE_MAX_AGE the stored tail is trusted
+    assert victim in names(fetcher._sync_repo_listings(store, 'alice', 30))
+    
+    store.max_age = 0
+    relisted = names(fetcher._sync_repo_listings(store, 'alice', 30))
+    assert victim not in relisted
+    assert len(relisted) == 30
+    assert victim not in store.get_user_repo_names('alice', 'public')
+
+
+def test_repos_whose_languages_404_are_dropped_and_forgotten(github):
+    store = get_repo_store()
+    victim = names(github.fixture[list_key('alice')]['body'])[0]
+    del github.fixture[f'GET /repos/{victim}/languages']
+    
+    repos = GitHubFetcher().get_user_repos('alice', 10)
+    
+    assert victim not in [repo.full_name for repo in repos]
+    assert store.get_listings([victim]) == []
+    assert victim not in store.get_user_repo_names('alice', 'public')
+
+
+def test_stored_details_are_reused_for_unchanged_repos(github):
+    GitHubFetcher().get_user_repos('alice', 10)
+    
+    fetcher = GitHubFetcher()
+    before = github.request_count
+    repos = fetcher.get_user_repos('alice', 10)
+    
+    assert len(repos) == 10
+    # One list page; every detail came from the store
+    assert github.request_count - before == 1
+    assert fetcher.last_selection['detail_calls_saved'] > 0